@@ -1,5 +1,20 @@
-from django.contrib import admin
-from .models import Kargo
+from django.contrib import admin, messages
+from .models import Kargo, KargoDurumGecmisi
+from .transitions import transition_status
+from .matching import assign_backlog
+from .export import export_response
+
+
+class KargoDurumGecmisiInline(admin.TabularInline):
+    """Durum geçmişi - sadece okunur (olay kaydı değiştirilemez)"""
+    model = KargoDurumGecmisi
+    fields = ['tarih', 'eski_durum', 'yeni_durum']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+    
+    def has_add_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(Kargo)
@@ -20,6 +35,7 @@ class KargoAdmin(admin.ModelAdmin):
         'icerik', 'ozel_not'
     ]
     readonly_fields = ['kargo_no', 'olusturulma_tarihi', 'son_degisiklik']
+    inlines = [KargoDurumGecmisiInline]
     
     fieldsets = (
         ('Kargo Bilgileri', {
@@ -85,16 +101,46 @@ class KargoAdmin(admin.ModelAdmin):
         )
     
     # Toplu işlemler
-    actions = ['mark_as_yolda', 'mark_as_teslim_edildi', 'assign_volunteers']
+    actions = ['mark_as_yolda', 'mark_as_teslim_edildi', 'assign_volunteers', 'export_as_csv', 'export_as_ndjson']
     
     def mark_as_yolda(self, request, queryset):
         """Seçili kargoları 'Yolda' olarak işaretle"""
-        updated = queryset.update(durum='yolda')
-        self.message_user(request, f'{updated} kargo "Yolda" olarak işaretlendi.')
+        self._transition(request, queryset, 'yolda', 'Yolda')
     mark_as_yolda.short_description = "Seçili kargoları 'Yolda' olarak işaretle"
     
     def mark_as_teslim_edildi(self, request, queryset):
         """Seçili kargoları 'Teslim Edildi' olarak işaretle"""
-        updated = queryset.update(durum='teslim_edildi')
-        self.message_user(request, f'{updated} kargo "Teslim Edildi" olarak işaretlendi.')
+        self._transition(request, queryset, 'teslim_edildi', 'Teslim Edildi')
     mark_as_teslim_edildi.short_description = "Seçili kargoları 'Teslim Edildi' olarak işaretle"
+    
+    def _transition(self, request, queryset, durum, label):
+        result = transition_status(queryset, durum)
+        self.message_user(request, f'{len(result.updated)} kargo "{label}" olarak işaretlendi.')
+        if result.rejected:
+            self.message_user(
+                request,
+                f'{len(result.rejected)} kargo mevcut durumundan "{label}" durumuna geçirilemediği için atlandı.',
+                level=messages.WARNING
+            )
+    
+    def assign_volunteers(self, request, queryset):
+        """Seçili kargoların boş taşıma/dağıtım rollerine en uygun gönüllüleri ata"""
+        result = assign_backlog(queryset)
+        self.message_user(request, f'{len(result.assigned)} gönüllü ataması yapıldı.')
+        if result.unassigned:
+            self.message_user(
+                request,
+                f'{len(result.unassigned)} rol için yakında uygun gönüllü bulunamadığından atama yapılmadı.',
+                level=messages.WARNING
+            )
+    assign_volunteers.short_description = "Seçili kargolara gönüllü ata"
+    
+    def export_as_csv(self, request, queryset):
+        """Seçili kargoları CSV olarak akış halinde dışa aktar"""
+        return export_response(queryset, 'csv', request=request)
+    export_as_csv.short_description = "Seçili kargoları CSV olarak dışa aktar"
+    
+    def export_as_ndjson(self, request, queryset):
+        """Seçili kargoları NDJSON olarak akış halinde dışa aktar"""
+        return export_response(queryset, 'ndjson', request=request)
+    export_as_ndjson.short_description = "Seçili kargoları NDJSON olarak dışa aktar"
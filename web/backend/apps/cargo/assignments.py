@@ -0,0 +1,74 @@
+"""
+Gönüllü bazlı kargo sorguları
+
+Bir gönüllünün kargoları üç ayrı FK kolonunda (toplama/taşıma/dağıtım) durur.
+Üç kolonun OR'lanması tek bir index ile karşılanamaz; bunun yerine her rol için
+ayrı, kendi `(gonullu, -olusturulma_tarihi)` index'ini kullanan bir dal
+kurulur ve dallar UNION ile birleştirilir.
+"""
+from django.db.models import Count, Value
+
+from .models import Kargo
+
+
+# Rol adı -> Kargo FK kolonu
+VOLUNTEER_ROLES = {
+    'toplama': 'toplama_gonullusu_id',
+    'tasima': 'tasima_gonullusu_id',
+    'dagitim': 'dagitim_gonullusu_id',
+}
+
+
+def role_querysets(volunteer_id, roles=None):
+    """Her rol için gönüllünün kargolarını seçen (sırasız) queryset'ler"""
+    roles = roles or VOLUNTEER_ROLES
+    return [
+        Kargo.objects.filter(**{VOLUNTEER_ROLES[role]: volunteer_id}).order_by()
+        for role in roles
+    ]
+
+
+def role_querysets_in(volunteer_ids, roles=None):
+    """Her rol için verilen gönüllülerden birine atanmış kargoları seçen (sırasız) queryset'ler"""
+    roles = roles or VOLUNTEER_ROLES
+    return [
+        Kargo.objects.filter(**{f'{VOLUNTEER_ROLES[role]}__in': volunteer_ids}).order_by()
+        for role in roles
+    ]
+
+
+def role_counts(volunteer_id):
+    """
+    Rol bazında kargo sayıları - her rolün sayımı kendi FK index'inden okunur,
+    sonuçlar tek bir UNION ALL sorgusuyla döner.
+    """
+    branches = [
+        queryset.values(rol=Value(role)).annotate(adet=Count('id')).values_list('rol', 'adet')
+        for role, queryset in zip(VOLUNTEER_ROLES, role_querysets(volunteer_id))
+    ]
+    counts = dict.fromkeys(VOLUNTEER_ROLES, 0)
+    counts.update(branches[0].union(*branches[1:], all=True))
+    return counts
+
+
+# Gönüllünün iş yükü sayılan (henüz kapanmamış) kargo durumları
+OPEN_STATUSES = ('hazirlaniyor', 'yolda')
+
+
+def open_workloads(volunteer_ids):
+    """
+    Gönüllü başına açık kargo sayısı (tüm rollerde toplam). Her rolün sayımı
+    kendi FK index'inden gruplanır, dallar tek UNION ALL sorgusuyla döner.
+    """
+    volunteer_ids = list(volunteer_ids)
+    workloads = dict.fromkeys(volunteer_ids, 0)
+    if not volunteer_ids:
+        return workloads
+    branches = [
+        Kargo.objects.filter(**{f'{column}__in': volunteer_ids}, durum__in=OPEN_STATUSES).order_by()
+        .values(column).annotate(adet=Count('id')).values_list(column, 'adet')
+        for column in VOLUNTEER_ROLES.values()
+    ]
+    for volunteer_id, count in branches[0].union(*branches[1:], all=True):
+        workloads[volunteer_id] += count
+    return workloads
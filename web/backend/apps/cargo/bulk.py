@@ -0,0 +1,113 @@
+"""
+Toplu kargo oluşturma
+
+Bağış kampanyalarında yüzlerce koli tek istekte kaydedilir. Önce tüm kalemler
+doğrulanır (referans verilen gönüllüler tek sorguyla okunur), ardından geçerli
+kalemler için numaralar tek seferde rezerve edilir ve satırlar tek transaction
+içinde `bulk_create` ile yazılır. `bulk_create` sinyal tetiklemediğinden
+sinyallerin yaptığı işler (anonim gönderici temizliği, durum geçmişi ve olayları,
+özet tablosu, takip önbelleği, gönüllü uygunluk indeksi) burada toplu olarak yapılır.
+"""
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.volunteers.availability import volunteers_changed
+from apps.volunteers.models import Volunteer
+from .cache import invalidate_tracking
+from .events import publish_status_changes, status_event
+from .history import HISTORY_BATCH_SIZE
+from .models import Kargo, KargoDurumGecmisi, KARGO_NO_SEQUENCE
+from .rollups import refresh_buckets, rollup_key
+from .serializers import KargoBulkItemSerializer
+from .signals import clear_sender_info_if_anonymous
+
+
+# Tek INSERT'teki kargo satırı sayısı
+BULK_CREATE_BATCH_SIZE = 500
+
+VOLUNTEER_FIELDS = ('toplama_gonullusu', 'tasima_gonullusu', 'dagitim_gonullusu')
+
+
+def referenced_volunteers(items):
+    """Kalemlerde geçen tüm gönüllüleri tek sorguda okur (id -> Volunteer)"""
+    ids = set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        for field in VOLUNTEER_FIELDS:
+            value = item.get(field)
+            if isinstance(value, bool):
+                continue
+            try:
+                ids.add(int(value))
+            except (TypeError, ValueError):
+                pass
+    return Volunteer.objects.in_bulk(ids) if ids else {}
+
+
+def validate_items(items):
+    """
+    Kalemleri doğrular. `(geçerli, hatalar)` döndürür:
+    geçerli = [(sıra, validated_data)], hatalar = {sıra: serializer hataları}
+    """
+    context = {'volunteers': referenced_volunteers(items)}
+    valid = []
+    errors = {}
+    for index, item in enumerate(items):
+        serializer = KargoBulkItemSerializer(data=item, context=context)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors[index] = serializer.errors
+    return valid, errors
+
+
+def _build(data):
+    kargo = Kargo(**data)
+    clear_sender_info_if_anonymous(sender=Kargo, instance=kargo)
+    return kargo
+
+
+def create_kargolar(validated_data, retries=3):
+    """
+    Doğrulanmış kalemlerden kargoları tek transaction içinde oluşturur.
+    Numara başka bir kayıtta kullanılıyorsa seri hizalanıp yeniden denenir.
+    """
+    kargolar = [_build(data) for data in validated_data]
+    if not kargolar:
+        return kargolar
+
+    for attempt in range(retries):
+        numbers = KARGO_NO_SEQUENCE.allocate(len(kargolar))
+        for kargo, number in zip(kargolar, numbers):
+            kargo.kargo_no = number
+        try:
+            with transaction.atomic():
+                Kargo.objects.bulk_create(kargolar, batch_size=BULK_CREATE_BATCH_SIZE)
+                now = timezone.now()
+                KargoDurumGecmisi.objects.bulk_create(
+                    [
+                        KargoDurumGecmisi(kargo_id=kargo.pk, eski_durum=None, yeni_durum=kargo.durum, tarih=now)
+                        for kargo in kargolar
+                    ],
+                    batch_size=HISTORY_BATCH_SIZE
+                )
+                publish_status_changes([status_event(kargo.kargo_no, None, kargo.durum, now) for kargo in kargolar])
+                refresh_buckets({rollup_key(kargo) for kargo in kargolar})
+                volunteers_changed(
+                    getattr(kargo, f'{field}_id') for kargo in kargolar for field in VOLUNTEER_FIELDS
+                )
+            break
+        except IntegrityError:
+            collided = Kargo.objects.filter(kargo_no__in=numbers).exists()
+            if not collided or attempt == retries - 1:
+                raise
+            KARGO_NO_SEQUENCE.reseed()
+            # Geri alınan batch'lerde atanmış id'ler temizlenir
+            for kargo in kargolar:
+                kargo.pk = None
+                kargo._state.adding = True
+
+    # Bu numaralar için önceden yazılmış "bulunamadı" önbellek kayıtları
+    invalidate_tracking(*(kargo.kargo_no for kargo in kargolar))
+    return kargolar
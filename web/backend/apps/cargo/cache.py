@@ -0,0 +1,67 @@
+"""
+Public kargo takibi için yanıt önbelleği
+
+`kargo_no` anahtarıyla takip verisi (KargoTrackingSerializer çıktısı) saklanır.
+Bilinmeyen numaralar kısa süreli negatif önbelleğe alınır. Kargo kaydı,
+silinmesi ve admin toplu işlemleri ilgili anahtarları geçersiz kılar.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+
+TRACKING_KEY_PREFIX = 'kargo:track:'
+
+# Negatif önbellek işareti (None, "önbellekte yok" ile karışmasın diye)
+NOT_FOUND = '__not_found__'
+
+
+def _key(kargo_no):
+    return f'{TRACKING_KEY_PREFIX}{kargo_no}'
+
+
+def get_tracking(kargo_no):
+    """Önbellekteki takip verisi; yoksa None, bilinmeyen numara ise NOT_FOUND"""
+    return cache.get(_key(kargo_no))
+
+
+def set_tracking(kargo_no, data):
+    cache.set(
+        _key(kargo_no),
+        data,
+        getattr(settings, 'CARGO_TRACKING_CACHE_TIMEOUT', 300)
+    )
+
+
+def get_tracking_many(kargo_nos):
+    """Birden fazla numara için tek önbellek çağrısı; {kargo_no: veri veya NOT_FOUND}"""
+    found = cache.get_many([_key(kargo_no) for kargo_no in kargo_nos])
+    return {key[len(TRACKING_KEY_PREFIX):]: value for key, value in found.items()}
+
+
+def set_tracking_many(data_by_kargo_no, not_found=()):
+    """Toplu takip sonuçlarını önbelleğe yaz (bulunamayanlar negatif önbelleğe)"""
+    if data_by_kargo_no:
+        cache.set_many(
+            {_key(kargo_no): data for kargo_no, data in data_by_kargo_no.items()},
+            getattr(settings, 'CARGO_TRACKING_CACHE_TIMEOUT', 300)
+        )
+    if not_found:
+        cache.set_many(
+            {_key(kargo_no): NOT_FOUND for kargo_no in not_found},
+            getattr(settings, 'CARGO_TRACKING_NEGATIVE_CACHE_TIMEOUT', 30)
+        )
+
+
+def set_tracking_not_found(kargo_no):
+    cache.set(
+        _key(kargo_no),
+        NOT_FOUND,
+        getattr(settings, 'CARGO_TRACKING_NEGATIVE_CACHE_TIMEOUT', 30)
+    )
+
+
+def invalidate_tracking(*kargo_nos):
+    """Verilen kargo numaralarının takip önbelleğini temizle"""
+    keys = [_key(kargo_no) for kargo_no in kargo_nos if kargo_no]
+    if keys:
+        cache.delete_many(keys)
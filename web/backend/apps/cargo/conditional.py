@@ -0,0 +1,45 @@
+"""
+Koşullu GET (ETag / Last-Modified) yardımcıları
+
+Doğrulayıcılar `kargo_no` + `son_degisiklik` (liste için max(son_degisiklik)
++ kayıt sayısı) üzerinden üretilir. İstemcinin elindeki sürüm güncelse
+serileştirme yapılmadan 304 döndürülür.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
+
+
+def make_etag(*parts):
+    """Parçalardan güçlü bir ETag üret"""
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'"{digest}"'
+
+
+def to_timestamp(value):
+    """datetime veya ISO string'i Last-Modified için epoch saniyesine çevir"""
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    return int(value.timestamp()) if value else None
+
+
+def not_modified(request, etag, last_modified=None):
+    """İstemcinin sürümü güncelse 304 yanıtı, değilse None döndürür"""
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        apply_validators(response, etag, last_modified)
+    return response
+
+
+def apply_validators(response, etag, last_modified=None, private=False):
+    """Yanıta ETag/Last-Modified ekle; istemci her seferinde yeniden doğrulasın"""
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    if private:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(response, no_cache=True)
+    return response
@@ -0,0 +1,79 @@
+"""
+Kargo durum olayları
+
+Her durum geçişi (tekil kayıt ya da toplu geçiş) commit edildikten sonra
+`kargo:events:<kargo_no>` kanalına yayınlanır (bkz. apps.core.pubsub).
+`status_stream` bu kanallara abone olup olayları Server-Sent Events
+biçiminde akıtır; istemciler `track` uç noktasını yoklamak zorunda kalmaz.
+"""
+import asyncio
+import json
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.core.choices import KARGO_DURUM
+from apps.core.pubsub import get_broker, publish_many
+
+
+CHANNEL_PREFIX = 'kargo:events:'
+
+
+def channel(kargo_no):
+    return f'{CHANNEL_PREFIX}{kargo_no}'
+
+
+def status_event(kargo_no, eski_durum, yeni_durum, tarih):
+    return {
+        'kargo_no': kargo_no,
+        'eski_durum': eski_durum,
+        'yeni_durum': yeni_durum,
+        'yeni_durum_display': KARGO_DURUM.label(yeni_durum),
+        'tarih': tarih.isoformat(),
+    }
+
+
+def publish_status_changes(events):
+    """Durum olaylarını transaction commit edildikten sonra tek seferde yayınla"""
+    messages = [(channel(event['kargo_no']), event) for event in events]
+    if messages:
+        transaction.on_commit(lambda: publish_many(messages))
+
+
+def get_stream_settings():
+    """(heartbeat saniyesi, en uzun bağlantı süresi saniyesi)"""
+    return (
+        getattr(settings, 'CARGO_EVENTS_HEARTBEAT_SECONDS', 15),
+        getattr(settings, 'CARGO_EVENTS_STREAM_MAX_SECONDS', 600),
+    )
+
+
+def sse(event, data):
+    return f'event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n'
+
+
+async def status_stream(kargo_nos, snapshot):
+    """
+    SSE akışı: önce `snapshot()` (mevcut durumlar), sonra gelen geçişler.
+    Abonelik anlık görüntüden önce açılır, aradaki geçişler kaçmaz. Bağlantı
+    en uzun süreye ulaşınca kapanır; EventSource `retry` süresi sonra yeniden bağlanır.
+    """
+    heartbeat, max_seconds = get_stream_settings()
+    loop_time = asyncio.get_running_loop().time
+    subscription = await get_broker().subscribe([channel(kargo_no) for kargo_no in kargo_nos])
+    try:
+        yield 'retry: 5000\n\n'
+        yield sse('snapshot', await snapshot())
+        deadline = loop_time() + max_seconds
+        while True:
+            remaining = deadline - loop_time()
+            if remaining <= 0:
+                break
+            message = await subscription.get(min(heartbeat, remaining))
+            if message is None:
+                yield ': ping\n\n'
+                continue
+            _, event = message
+            yield sse('status', event)
+    finally:
+        await subscription.close()
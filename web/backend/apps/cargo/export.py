@@ -0,0 +1,145 @@
+"""
+Kargo dışa aktarımı (CSV / NDJSON)
+
+Satırlar `values_list(...).iterator(chunk_size=...)` ile okunur; model örneği
+oluşturulmaz ve PostgreSQL'de server-side cursor kullanılır. Yanıt
+`StreamingHttpResponse` ile parça parça gönderildiğinden bellek kullanımı
+satır sayısından bağımsızdır.
+
+ASGI altında Django senkron bir iteratörü gönderilmeden önce tamamen listeye
+çevirir; bu yüzden ASGI isteklerinde satırlar `EXPORT_CHUNK_SIZE`'lık
+parçalar halinde `sync_to_async` ile okunan asenkron bir iteratörle akıtılır.
+"""
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from apps.core.choices import SEHIR, KARGO_DURUM, KARGO_TIPI
+
+
+# Veritabanından her seferinde okunacak satır sayısı
+EXPORT_CHUNK_SIZE = 2000
+
+# (CSV başlığı, NDJSON anahtarı, values_list alanı)
+EXPORT_COLUMNS = [
+    ('Kargo No', 'kargo_no', 'kargo_no'),
+    ('Durum', 'durum', 'durum'),
+    ('Kargo Tipi', 'kargo_tipi', 'kargo_tipi'),
+    ('İçerik', 'icerik', 'icerik'),
+    ('Çıkış Yeri', 'cikis_yeri', 'cikis_yeri'),
+    ('Ulaşacağı Yer', 'ulasacagi_yer', 'ulasacagi_yer'),
+    ('Ağırlık (kg)', 'agirlik', 'agirlik'),
+    ('Hacim (m³)', 'hacim', 'hacim'),
+    ('Miktar', 'miktar', 'miktar'),
+    ('Anonim Gönderici', 'anonim_gonderici', 'anonim_gonderici'),
+    ('Gönderici Ad', 'gonderici_ad', 'gonderici_ad'),
+    ('Gönderici Soyad', 'gonderici_soyad', 'gonderici_soyad'),
+    ('Gönderici Telefon', 'gonderici_telefon', 'gonderici_telefon'),
+    ('Gönderici E-posta', 'gonderici_email', 'gonderici_email'),
+    ('Toplama Gönüllüsü', 'toplama_gonullusu', 'toplama_gonullusu__gonulluluk_no'),
+    ('Taşıma Gönüllüsü', 'tasima_gonullusu', 'tasima_gonullusu__gonulluluk_no'),
+    ('Dağıtım Gönüllüsü', 'dagitim_gonullusu', 'dagitim_gonullusu__gonulluluk_no'),
+    ('Oluşturulma Tarihi', 'olusturulma_tarihi', 'olusturulma_tarihi'),
+    ('Son Değişiklik', 'son_degisiklik', 'son_degisiklik'),
+]
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+# CSV çıktısında kod yerine görünen ad yazılan alanlar
+_DISPLAY_NAMES = {
+    'durum': KARGO_DURUM.labels,
+    'kargo_tipi': KARGO_TIPI.labels,
+    'cikis_yeri': SEHIR.labels,
+    'ulasacagi_yer': SEHIR.labels,
+}
+
+
+class _Echo:
+    """csv.writer için yazılanı aynen döndüren sahte dosya"""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset):
+    """Queryset'i tuple satırlar halinde, parça parça okur"""
+    return queryset.values_list(
+        *(field for _, _, field in EXPORT_COLUMNS)
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def _csv_value(key, value):
+    if value is None:
+        return ''
+    if key in _DISPLAY_NAMES:
+        return _DISPLAY_NAMES[key].get(value, value)
+    if isinstance(value, bool):
+        return 'Evet' if value else 'Hayır'
+    if hasattr(value, 'strftime'):
+        return timezone.localtime(value).strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+def stream_csv(queryset):
+    """CSV satırları üreten generator (Excel'in UTF-8 tanıması için BOM ile)"""
+    writer = csv.writer(_Echo())
+    keys = [key for _, key, _ in EXPORT_COLUMNS]
+    yield '\ufeff' + writer.writerow([header for header, _, _ in EXPORT_COLUMNS])
+    for row in export_rows(queryset):
+        yield writer.writerow([_csv_value(key, value) for key, value in zip(keys, row)])
+
+
+def stream_ndjson(queryset):
+    """Her satırı ayrı bir JSON nesnesi olarak üreten generator"""
+    keys = [key for _, key, _ in EXPORT_COLUMNS]
+    for row in export_rows(queryset):
+        yield json.dumps(dict(zip(keys, row)), ensure_ascii=False, default=str) + '\n'
+
+
+async def aiter_chunks(stream, chunk_size=None):
+    """
+    Senkron generator'ı asenkron akışa çevirir: her adımda `chunk_size` satır
+    (varsayılan EXPORT_CHUNK_SIZE) veritabanı thread'inde okunup tek parça gönderilir.
+    """
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    # Sunucu taraflı cursor aynı thread'de kalmalı (thread_sensitive)
+    next_chunk = sync_to_async(lambda: ''.join(islice(stream, chunk_size)), thread_sensitive=True)
+    try:
+        while True:
+            chunk = await next_chunk()
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        await sync_to_async(stream.close, thread_sensitive=True)()
+
+
+def _is_asgi(request):
+    # DRF Request asıl HttpRequest'i sarar
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+def export_response(queryset, file_format='csv', filename=None, request=None):
+    """
+    Queryset'i akış halinde indirilebilir dosya olarak döndürür. `request`
+    ASGI isteğiyse akış asenkron iteratörle üretilir.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Geçersiz dosya formatı: {file_format}")
+
+    stream = stream_csv(queryset) if file_format == 'csv' else stream_ndjson(queryset)
+    if request is not None and _is_asgi(request):
+        stream = aiter_chunks(stream)
+    response = StreamingHttpResponse(stream, content_type=EXPORT_FORMATS[file_format])
+    if filename is None:
+        filename = f"kargolar_{timezone.localtime():%Y%m%d_%H%M%S}.{file_format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -1,8 +1,24 @@
+import re
+
 import django_filters
 from django.db.models import Q
+from apps.core.search import contains_any
+from apps.volunteers.models import Volunteer
+from .assignments import role_querysets_in
 from .models import Kargo
 
 
+GONDERICI_SEARCH_FIELDS = ('gonderici_ad', 'gonderici_soyad', 'gonderici_telefon', 'gonderici_email')
+VOLUNTEER_SEARCH_FIELDS = ('ad', 'soyad', 'gonulluluk_no')
+
+# G000000000 formatı; kısmi girişler önek olarak aranır
+VOLUNTEER_NO_PATTERN = re.compile(r'^[Gg]\d+$')
+VOLUNTEER_NO_LENGTH = 10
+
+# Gönüllü aramasında kargo sorgusuna aktarılacak en fazla eşleşen gönüllü
+VOLUNTEER_MATCH_LIMIT = 200
+
+
 class KargoFilter(django_filters.FilterSet):
     """Kargo filtreleme için özel filter sınıfı"""
     
@@ -81,7 +97,7 @@ class KargoFilter(django_filters.FilterSet):
         }
     
     def filter_gonderici(self, queryset, name, value):
-        """Gönderici ad/soyad/telefon/email arama"""
+        """Gönderici ad/soyad/telefon/email arama (PostgreSQL'de trigram index'li)"""
         if not value or not isinstance(value, str):
             return queryset
         
@@ -91,18 +107,18 @@ class KargoFilter(django_filters.FilterSet):
             return queryset
         
         # SQL injection koruması için özel karakterleri temizle
-        import re
         value = re.sub(r'[^\w\s@.-]', '', value)
         
-        return queryset.filter(
-            Q(gonderici_ad__icontains=value) |
-            Q(gonderici_soyad__icontains=value) |
-            Q(gonderici_telefon__icontains=value) |
-            Q(gonderici_email__icontains=value)
-        )
+        return queryset.filter(contains_any(GONDERICI_SEARCH_FIELDS, value))
     
     def filter_gonullu(self, queryset, name, value):
-        """Gönüllü ad/soyad/gonulluluk_no arama"""
+        """
+        Gönüllü ad/soyad/gonulluluk_no arama.
+        Önce eşleşen gönüllü ID'leri bulunur (tek tablo, index'li; en fazla
+        VOLUNTEER_MATCH_LIMIT), ardından kargolar rol başına UNION dallarıyla
+        `(gonullu, -olusturulma_tarihi)` index'leri üzerinden süzülür; üç JOIN
+        üzerinde dokuz LIKE koşulu OR'lanmaz.
+        """
         if not value or not isinstance(value, str):
             return queryset
         
@@ -111,30 +127,33 @@ class KargoFilter(django_filters.FilterSet):
         if len(value) < 2:
             return queryset
         
-        # Gönüllülük numarası formatı kontrolü (G ile başlıyorsa)
-        if value.upper().startswith('G') and len(value) >= 3:
-            # Sadece gönüllülük numarasında ara
-            return queryset.filter(
-                Q(toplama_gonullusu__gonulluluk_no__icontains=value) |
-                Q(tasima_gonullusu__gonulluluk_no__icontains=value) |
-                Q(dagitim_gonullusu__gonulluluk_no__icontains=value)
-            )
+        # Gönüllülük numarası (G + rakam): tam eşleşme veya önek araması
+        if VOLUNTEER_NO_PATTERN.match(value):
+            value = value.upper()
+            if len(value) == VOLUNTEER_NO_LENGTH:
+                volunteers = Volunteer.objects.filter(gonulluluk_no=value)
+            else:
+                volunteers = Volunteer.objects.filter(gonulluluk_no__startswith=value)
+            return self._filter_by_volunteers(queryset, volunteers)
         
         # SQL injection koruması
-        import re
         value = re.sub(r'[^\w\s]', '', value)
         
-        return queryset.filter(
-            Q(toplama_gonullusu__ad__icontains=value) |
-            Q(toplama_gonullusu__soyad__icontains=value) |
-            Q(toplama_gonullusu__gonulluluk_no__icontains=value) |
-            Q(tasima_gonullusu__ad__icontains=value) |
-            Q(tasima_gonullusu__soyad__icontains=value) |
-            Q(tasima_gonullusu__gonulluluk_no__icontains=value) |
-            Q(dagitim_gonullusu__ad__icontains=value) |
-            Q(dagitim_gonullusu__soyad__icontains=value) |
-            Q(dagitim_gonullusu__gonulluluk_no__icontains=value)
-        )
+        volunteers = Volunteer.objects.filter(contains_any(VOLUNTEER_SEARCH_FIELDS, value))
+        return self._filter_by_volunteers(queryset, volunteers)
+    
+    @staticmethod
+    def _filter_by_volunteers(queryset, volunteers):
+        """
+        Herhangi bir görevde verilen gönüllülerden biri atanmış kargolar.
+        Üç FK kolonunun OR'lanması tek index ile karşılanamaz (PostgreSQL'de
+        tam tablo taraması); her rol kendi index'iyle okunup UNION'lanır.
+        """
+        volunteer_ids = list(volunteers.order_by('id').values_list('id', flat=True)[:VOLUNTEER_MATCH_LIMIT])
+        if not volunteer_ids:
+            return queryset.none()
+        branches = [branch.values('id') for branch in role_querysets_in(volunteer_ids)]
+        return queryset.filter(id__in=branches[0].union(*branches[1:]))
     
     def filter_rota(self, queryset, name, value):
         """Rota filtresi: 'istanbul-ankara' formatında"""
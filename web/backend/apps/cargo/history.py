@@ -0,0 +1,33 @@
+"""
+Kargo durum geçmişi (KargoDurumGecmisi) yazımı
+
+Tekil kayıtlarda geçmiş satırı `post_save` sinyalinden, kayıtla aynı
+transaction içinde yazılır. Sinyal tetiklemeyen toplu güncellemeler
+(admin işlemleri, toplu durum API'si) `transitions.transition_status` ile
+tek bir bulk insert yapar. Her iki yol da geçişleri commit sonrası olay
+olarak yayınlar (bkz. events.py).
+"""
+from django.utils import timezone
+
+from .events import publish_status_changes, status_event
+
+
+# Toplu geçmiş yazımında tek INSERT'teki satır sayısı
+HISTORY_BATCH_SIZE = 1000
+
+
+def _history_model():
+    from .models import KargoDurumGecmisi
+    return KargoDurumGecmisi
+
+
+def record_status_change(kargo, eski_durum, tarih=None):
+    """Tek bir durum geçişini kaydet (yeni kargoda eski_durum None)"""
+    entry = _history_model().objects.create(
+        kargo=kargo,
+        eski_durum=eski_durum,
+        yeni_durum=kargo.durum,
+        tarih=tarih or timezone.now()
+    )
+    publish_status_changes([status_event(kargo.kargo_no, eski_durum, kargo.durum, entry.tarih)])
+    return entry
@@ -0,0 +1,34 @@
+"""
+Django management command to fill empty tasima/dagitim roles of open cargo.
+Usage:
+    python manage.py assign_cargo_volunteers
+    python manage.py assign_cargo_volunteers --role tasima --dry-run
+"""
+from django.core.management.base import BaseCommand
+
+from apps.cargo.matching import MATCHING_ROLES, assign_backlog
+
+
+class Command(BaseCommand):
+    help = 'Assign nearby, least loaded volunteers to the unassigned cargo backlog'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--role',
+            action='append',
+            choices=list(MATCHING_ROLES),
+            help='Role to fill (repeatable, default: all roles)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Compute the assignment without saving it'
+        )
+
+    def handle(self, *args, **options):
+        result = assign_backlog(roles=options['role'], dry_run=options['dry_run'])
+
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix}{len(result.assigned)} gönüllü ataması yapıldı, {len(result.unassigned)} rol atanamadı.'
+        ))
@@ -0,0 +1,263 @@
+"""
+Django management command to measure cargo list/filter query latency.
+Usage:
+    python manage.py benchmark_cargo_queries
+    python manage.py benchmark_cargo_queries --seed 1000000 --force
+    python manage.py benchmark_cargo_queries --compare --explain
+    python manage.py benchmark_cargo_queries --compare --drop kargo_rota_olusturulma_idx
+
+--compare drops the kargo access-path indexes inside a transaction, measures,
+rolls the transaction back and measures again with the indexes in place.
+--drop limits the comparison to the named indexes (repeatable), which shows
+the marginal benefit of a single index.
+Dropping indexes takes a table lock; run it only against a development copy.
+
+Besides read latency the command reports insert cost (a bulk batch and single
+row inserts, rolled back), so every index can be weighed against the write
+amplification it adds to the kargo table.
+"""
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.cargo.filters import GONDERICI_SEARCH_FIELDS, KargoFilter
+from apps.cargo.models import Kargo, KARGO_NO_SEQUENCE
+from apps.cargo.rollups import rebuild_rollups
+from apps.core.search import trigram_index_name
+from apps.volunteers.models import Volunteer
+
+
+# Listeleme sayfası boyutu (REST_FRAMEWORK PAGE_SIZE ile aynı)
+PAGE_SIZE = 20
+
+# Yazma ölçümü: toplu insert boyutu ve tekil insert sayısı
+WRITE_BATCH_SIZE = 1000
+WRITE_SINGLE_ROWS = 200
+
+
+class _Rollback(Exception):
+    """Index'siz ölçüm ve yazma ölçümü transaction'larını geri almak için"""
+
+
+class Command(BaseCommand):
+    help = 'Measure cargo list and filter query latency (optionally seeding synthetic rows)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Number of runs per query (default: 20)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Insert this many synthetic cargo rows before measuring'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows per bulk insert while seeding (default: 5000)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Allow seeding when DEBUG is off'
+        )
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help='Also measure with the kargo indexes dropped (rolled back afterwards)'
+        )
+        parser.add_argument(
+            '--drop',
+            action='append',
+            default=[],
+            metavar='INDEX',
+            help='With --compare, drop only this index (repeatable; default: all kargo indexes)'
+        )
+        parser.add_argument(
+            '--explain',
+            action='store_true',
+            help='Print the query plan of each query'
+        )
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            if not settings.DEBUG and not options['force']:
+                raise CommandError('Seeding synthetic data requires DEBUG=True or --force')
+            self._seed(options['seed'], options['batch_size'])
+
+        self.stdout.write(f'Kargo rows: {Kargo.objects.count()}')
+
+        if options['compare']:
+            self.stdout.write(self.style.MIGRATE_HEADING('Without indexes'))
+            try:
+                with transaction.atomic():
+                    self._drop_indexes(options['drop'])
+                    self._run(options['iterations'], options['explain'])
+                    raise _Rollback
+            except _Rollback:
+                pass
+            self.stdout.write(self.style.MIGRATE_HEADING('With indexes'))
+
+        self._run(options['iterations'], options['explain'])
+
+    def _queries(self):
+        """Viewset ve filtrelerin ürettiği temsili sorgular"""
+        now = timezone.now()
+        queries = {
+            'list (default ordering)': Kargo.objects.all(),
+            'durum=yolda': Kargo.objects.filter(durum='yolda'),
+            'active states': Kargo.objects.filter(durum__in=['hazirlaniyor', 'yolda']),
+            'kargo_tipi=ilac': Kargo.objects.filter(kargo_tipi='ilac'),
+            'route istanbul->ankara': Kargo.objects.filter(cikis_yeri='istanbul', ulasacagi_yer='ankara'),
+            'destination=hatay': Kargo.objects.filter(ulasacagi_yer='hatay'),
+            'agirlik 50-60': Kargo.objects.filter(agirlik__gte=50, agirlik__lte=60),
+            'last 7 days': Kargo.objects.filter(olusturulma_tarihi__gte=now - timedelta(days=7)),
+            # PostgreSQL'de pg_trgm index'leri (bkz. 0007_gonderici_trigram_indexes)
+            'gonderici_search=ali': KargoFilter({'gonderici_search': 'ali'}, queryset=Kargo.objects.all()).qs,
+        }
+        # Gönüllü bazlı liste (assignments.role_querysets ile aynı sıralama)
+        for role in ('toplama', 'tasima'):
+            volunteer_id = Kargo.objects.filter(**{f'{role}_gonullusu__isnull': False}).values_list(
+                f'{role}_gonullusu', flat=True
+            ).first()
+            if volunteer_id is not None:
+                queries[f'{role}_gonullusu (by_volunteer)'] = Kargo.objects.filter(
+                    **{f'{role}_gonullusu': volunteer_id}
+                ).order_by('-olusturulma_tarihi', '-id')
+        return queries
+
+    def _run(self, iterations, explain):
+        self.stdout.write(f'{"query":<34} {"page median ms":>15} {"page p95 ms":>12} {"count ms":>10}')
+        for name, queryset in self._queries().items():
+            page_times = []
+            count_times = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                list(queryset.values_list('id', flat=True)[:PAGE_SIZE])
+                page_times.append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                queryset.count()
+                count_times.append((time.perf_counter() - start) * 1000)
+
+            page_times.sort()
+            p95 = page_times[min(len(page_times) - 1, int(len(page_times) * 0.95))]
+            self.stdout.write(
+                f'{name:<34} {statistics.median(page_times):>15.2f} {p95:>12.2f} '
+                f'{statistics.median(count_times):>10.2f}'
+            )
+            if explain:
+                self.stdout.write(queryset[:PAGE_SIZE].explain())
+
+        self._measure_writes(iterations)
+
+    def _measure_writes(self, iterations):
+        volunteer_id = Kargo.objects.values_list('toplama_gonullusu', flat=True).first()
+        if volunteer_id is None:
+            return
+        bulk_times = []
+        single_times = []
+        for _ in range(max(1, iterations // 4)):
+            try:
+                with transaction.atomic():
+                    rows = self._build_rows(WRITE_BATCH_SIZE + WRITE_SINGLE_ROWS, [volunteer_id], [], timezone.now())
+                    start = time.perf_counter()
+                    Kargo.objects.bulk_create(rows[:WRITE_BATCH_SIZE])
+                    bulk_times.append((time.perf_counter() - start) * 1000)
+
+                    start = time.perf_counter()
+                    for row in rows[WRITE_BATCH_SIZE:]:
+                        Kargo.objects.bulk_create([row])
+                    single_times.append((time.perf_counter() - start) * 1000 / WRITE_SINGLE_ROWS)
+                    raise _Rollback
+            except _Rollback:
+                pass
+        self.stdout.write(
+            f'insert: {WRITE_BATCH_SIZE} rows bulk median {statistics.median(bulk_times):.2f} ms, '
+            f'single row median {statistics.median(single_times):.3f} ms'
+        )
+
+    def _drop_indexes(self, names):
+        known = [index.name for index in Kargo._meta.indexes]
+        if connection.vendor == 'postgresql':
+            known += [trigram_index_name(Kargo._meta.db_table, field) for field in GONDERICI_SEARCH_FIELDS]
+        unknown = set(names) - set(known)
+        if unknown:
+            raise CommandError(f'Unknown kargo indexes: {", ".join(sorted(unknown))}')
+        # SQLite schema editor transaction içinde açılamaz; DROP INDEX doğrudan çalıştırılır
+        with connection.cursor() as cursor:
+            for name in names or known:
+                cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+
+    def _seed(self, count, batch_size):
+        volunteers = list(
+            Volunteer.objects.filter(
+                gonullu_tipi__in=['toplama', 'karma'], is_active=True
+            ).values_list('id', flat=True)
+        )
+        if not volunteers:
+            raise CommandError('At least one active toplama/karma volunteer is required to seed cargo')
+
+        carriers = list(
+            Volunteer.objects.filter(
+                gonullu_tipi__in=['tasima', 'karma'], is_active=True
+            ).values_list('id', flat=True)
+        )
+        now = timezone.now()
+
+        self.stdout.write(f'Seeding {count} cargo rows...')
+        created_field = Kargo._meta.get_field('olusturulma_tarihi')
+        created = 0
+        # auto_now_add bulk_create'te de uygulanır; tarihleri son bir yıla yaymak için kapatılır
+        created_field.auto_now_add = False
+        try:
+            while created < count:
+                size = min(batch_size, count - created)
+                batch = self._build_rows(size, volunteers, carriers, now)
+                for kargo, number in zip(batch, KARGO_NO_SEQUENCE.allocate(size)):
+                    kargo.kargo_no = number
+                    kargo.olusturulma_tarihi = now - timedelta(minutes=random.randint(0, 525600))
+                Kargo.objects.bulk_create(batch)
+                created += size
+                self.stdout.write(f'  {created}/{count}')
+        finally:
+            created_field.auto_now_add = True
+
+        # bulk_create sinyal tetiklemez; özet tablosunu tazele
+        rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f'Seeded {count} cargo rows.'))
+
+    def _build_rows(self, size, volunteers, carriers, now):
+        """Sentetik kargolar (numaralar çağıran tarafından verilir); taşıma gönüllüsü varsa kabaca yarısına atanır"""
+        cities = [code for code, _ in Kargo.SEHIR_CHOICES]
+        statuses = [code for code, _ in Kargo.DURUM_CHOICES]
+        types = [code for code, _ in Kargo.KARGO_TIPI_CHOICES]
+        return [
+            Kargo(
+                kargo_no=f'BNC{i:09d}',
+                anonim_gonderici=True,
+                cikis_yeri=random.choice(cities),
+                ulasacagi_yer=random.choice(cities),
+                agirlik=Decimal(random.randint(1, 10000)) / 100,
+                hacim=Decimal(random.randint(1, 500)) / 100,
+                miktar=random.randint(1, 50),
+                kargo_tipi=random.choice(types),
+                icerik='Benchmark',
+                durum=random.choice(statuses),
+                toplama_gonullusu_id=random.choice(volunteers),
+                tasima_gonullusu_id=random.choice(carriers) if carriers and random.random() < 0.5 else None,
+            )
+            for i in range(size)
+        ]
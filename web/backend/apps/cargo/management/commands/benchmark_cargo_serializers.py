@@ -0,0 +1,77 @@
+"""
+Django management command to compare KargoSerializer with KargoFlatSerializer.
+Usage:
+    python manage.py benchmark_cargo_serializers
+    python manage.py benchmark_cargo_serializers --sizes 20,100,1000 --iterations 50
+
+Both paths include the database read (select_related objects vs .values() rows)
+so the numbers reflect what a list response actually costs. Seed data first
+with `benchmark_cargo_queries --seed N` if the table is small.
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.cargo.models import Kargo
+from apps.cargo.serializers import KargoSerializer, KargoFlatSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compare KargoSerializer and KargoFlatSerializer list serialization latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='20,100,1000',
+            help='Comma separated page sizes (default: 20,100,1000)'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Number of runs per page size (default: 20)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        except ValueError:
+            raise CommandError('--sizes must be a comma separated list of integers')
+        if not sizes or min(sizes) < 1:
+            raise CommandError('--sizes must contain positive integers')
+
+        total = Kargo.objects.count()
+        self.stdout.write(f'Kargo rows: {total}')
+
+        queryset = Kargo.objects.order_by('-olusturulma_tarihi', '-id')
+        self.stdout.write(f'{"size":>6} {"serializer":>16} {"flat":>10} {"speedup":>8}')
+        for size in sizes:
+            if size > total:
+                self.stdout.write(self.style.WARNING(f'{size:>6} skipped: only {total} rows'))
+                continue
+
+            model_page = queryset.select_related(
+                'toplama_gonullusu', 'tasima_gonullusu', 'dagitim_gonullusu'
+            )[:size]
+            flat_page = KargoFlatSerializer.values(queryset)[:size]
+
+            serializer_ms = self._measure(
+                lambda: KargoSerializer(list(model_page.all()), many=True).data,
+                options['iterations']
+            )
+            flat_ms = self._measure(
+                lambda: KargoFlatSerializer(list(flat_page.all()), many=True).data,
+                options['iterations']
+            )
+            self.stdout.write(
+                f'{size:>6} {serializer_ms:>13.2f} ms {flat_ms:>7.2f} ms {serializer_ms / max(flat_ms, 1e-6):>7.1f}x'
+            )
+
+    def _measure(self, func, iterations):
+        times = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            times.append((time.perf_counter() - start) * 1000)
+        return statistics.median(times)
@@ -0,0 +1,153 @@
+"""
+Django management command to (re)build the province road graph data file.
+Usage:
+    python manage.py build_road_graph
+    python manage.py build_road_graph --graph-version 2 --factor 1.3
+
+The graph has one node per province and an edge between provinces that share
+a land border. Edge weights are the straight-line distance between the two
+province centres multiplied by a road circuity factor; measured road
+distances can be written into the generated file by hand and the version
+bumped. The running application only reads the file (apps.cargo.routing).
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.cargo.routing import IL_KOORDINATLARI, ROAD_GRAPH_PATH, haversine
+from apps.core.choices import SEHIR
+
+
+# Kara sınırı olan il çiftleri (her çift bir kez)
+KOMSU_ILLER = {
+    'adana': ('mersin', 'nigde', 'kayseri', 'kahramanmaras', 'osmaniye', 'hatay'),
+    'adiyaman': ('malatya', 'kahramanmaras', 'gaziantep', 'sanliurfa', 'diyarbakir'),
+    'afyonkarahisar': ('kutahya', 'eskisehir', 'konya', 'isparta', 'burdur', 'denizli', 'usak'),
+    'agri': ('kars', 'igdir', 'van', 'bitlis', 'mus', 'erzurum'),
+    'amasya': ('samsun', 'tokat', 'corum'),
+    'ankara': ('cankiri', 'bolu', 'eskisehir', 'konya', 'aksaray', 'kirsehir', 'kirikkale'),
+    'antalya': ('mugla', 'burdur', 'isparta', 'konya', 'karaman', 'mersin'),
+    'artvin': ('rize', 'erzurum', 'ardahan'),
+    'aydin': ('izmir', 'manisa', 'denizli', 'mugla'),
+    'balikesir': ('canakkale', 'bursa', 'kutahya', 'manisa', 'izmir'),
+    'bilecik': ('bursa', 'kutahya', 'eskisehir', 'bolu', 'sakarya'),
+    'bingol': ('mus', 'erzurum', 'erzincan', 'tunceli', 'elazig', 'diyarbakir'),
+    'bitlis': ('mus', 'van', 'siirt', 'batman'),
+    'bolu': ('duzce', 'zonguldak', 'karabuk', 'cankiri', 'eskisehir', 'sakarya'),
+    'burdur': ('denizli', 'isparta', 'mugla'),
+    'bursa': ('kutahya', 'sakarya', 'kocaeli', 'yalova'),
+    'canakkale': ('edirne', 'tekirdag'),
+    'cankiri': ('kastamonu', 'karabuk', 'kirikkale', 'corum'),
+    'corum': ('samsun', 'yozgat', 'kirikkale', 'kastamonu', 'sinop', 'tokat'),
+    'denizli': ('manisa', 'usak', 'mugla'),
+    'diyarbakir': ('mus', 'batman', 'mardin', 'sanliurfa', 'malatya', 'elazig'),
+    'edirne': ('kirklareli', 'tekirdag'),
+    'elazig': ('malatya', 'tunceli'),
+    'erzincan': ('erzurum', 'bayburt', 'gumushane', 'giresun', 'sivas', 'malatya', 'tunceli'),
+    'erzurum': ('ardahan', 'kars', 'mus', 'bayburt', 'rize'),
+    'eskisehir': ('kutahya', 'konya'),
+    'gaziantep': ('kahramanmaras', 'sanliurfa', 'kilis', 'hatay', 'osmaniye'),
+    'giresun': ('ordu', 'trabzon', 'gumushane', 'sivas'),
+    'gumushane': ('trabzon', 'bayburt'),
+    'hakkari': ('van', 'sirnak'),
+    'hatay': ('osmaniye', 'kilis'),
+    'isparta': ('konya',),
+    'mersin': ('karaman', 'konya', 'nigde'),
+    'istanbul': ('tekirdag', 'kocaeli', 'kirklareli'),
+    'izmir': ('manisa',),
+    'kars': ('ardahan', 'igdir'),
+    'kastamonu': ('sinop', 'karabuk', 'bartin'),
+    'kayseri': ('nevsehir', 'nigde', 'kahramanmaras', 'malatya', 'sivas', 'yozgat'),
+    'kirklareli': ('tekirdag',),
+    'kirsehir': ('kirikkale', 'yozgat', 'nevsehir', 'aksaray'),
+    'kocaeli': ('sakarya', 'yalova'),
+    'konya': ('karaman', 'nigde', 'aksaray'),
+    'kutahya': ('usak', 'manisa'),
+    'malatya': ('kahramanmaras', 'sivas', 'tunceli'),
+    'manisa': ('usak',),
+    'kahramanmaras': ('sivas', 'osmaniye'),
+    'mardin': ('sanliurfa', 'batman', 'siirt', 'sirnak'),
+    'mus': ('batman',),
+    'nevsehir': ('yozgat', 'nigde', 'aksaray'),
+    'nigde': ('aksaray',),
+    'ordu': ('samsun', 'tokat', 'sivas'),
+    'rize': ('trabzon',),
+    'sakarya': ('duzce',),
+    'samsun': ('sinop', 'tokat'),
+    'siirt': ('batman', 'sirnak', 'van'),
+    'sivas': ('yozgat', 'tokat'),
+    'tokat': ('yozgat',),
+    'trabzon': ('bayburt',),
+    'van': ('sirnak',),
+    'yozgat': ('kirikkale',),
+    'zonguldak': ('bartin', 'karabuk', 'duzce'),
+    'karabuk': ('bartin',),
+}
+
+# Kuş uçuşu mesafeden karayolu mesafesine geçiş katsayısı
+ROAD_FACTOR = 1.3
+
+
+def build_edges(factor=ROAD_FACTOR):
+    """Sıralı (il, il, km) kenar listesi"""
+    coordinates = {code: (lat, lon) for code, lat, lon in IL_KOORDINATLARI}
+    edges = set()
+    for city, neighbours in KOMSU_ILLER.items():
+        for neighbour in neighbours:
+            edges.add(tuple(sorted((city, neighbour))))
+    return [
+        [a, b, round(haversine(*coordinates[a], *coordinates[b]) * factor)]
+        for a, b in sorted(edges, key=lambda edge: (SEHIR.index[edge[0]], SEHIR.index[edge[1]]))
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Build the province road graph data file used by route queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--graph-version',
+            type=int,
+            default=1,
+            help='Version number written into the data file (default: 1)'
+        )
+        parser.add_argument(
+            '--factor',
+            type=float,
+            default=ROAD_FACTOR,
+            help=f'Road circuity factor applied to straight-line distances (default: {ROAD_FACTOR})'
+        )
+        parser.add_argument(
+            '--output',
+            default=str(ROAD_GRAPH_PATH),
+            help='Output path (default: the file read by apps.cargo.routing)'
+        )
+
+    def handle(self, *args, **options):
+        if options['factor'] < 1:
+            raise CommandError('--factor must be at least 1')
+
+        unknown = {
+            code for city, neighbours in KOMSU_ILLER.items() for code in (city, *neighbours)
+        } - set(SEHIR.labels)
+        if unknown:
+            raise CommandError(f'Unknown province codes: {", ".join(sorted(unknown))}')
+
+        edges = build_edges(options['factor'])
+        source = f'Komşu il merkezleri arası kuş uçuşu mesafe x {options["factor"]} yol katsayısı'
+        # Her kenar ayrı satırda: elle düzeltmeler ve diff'ler okunaklı kalsın
+        lines = [
+            '{',
+            f'  "version": {json.dumps(options["graph_version"])},',
+            f'  "kaynak": {json.dumps(source, ensure_ascii=False)},',
+            '  "edges": [',
+            ',\n'.join(f'    {json.dumps(edge, ensure_ascii=False)}' for edge in edges),
+            '  ]',
+            '}',
+        ]
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            output.write('\n'.join(lines) + '\n')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(edges)} kenarlı yol ağı yazıldı (sürüm {options["graph_version"]}): {options["output"]}'
+        ))
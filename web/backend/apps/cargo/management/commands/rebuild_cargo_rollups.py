@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from apps.cargo.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily cargo rollup table (KargoDailyRollup) from raw cargo rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rollup rows inserted per batch'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        
+        if batch_size < 1:
+            self.stdout.write(self.style.ERROR('Batch size must be at least 1'))
+            return
+        
+        created = rebuild_rollups(batch_size=batch_size)
+        self.stdout.write(
+            self.style.SUCCESS(f'{created} adet günlük özet satırı oluşturuldu.')
+        )
@@ -0,0 +1,266 @@
+"""
+Gönüllü - kargo eşleştirme
+
+Atanmamış taşıma/dağıtım rolleri toplu olarak doldurulur: taşıma için çıkış
+iline, dağıtım için varış iline yakın aktif gönüllüler aday olur
+(`tasima`/`dagitim` ve `karma` tipliler). Bir gönüllünün bir kargoya
+maliyeti il arası karayolu mesafesi ile açık iş yükünün (bkz.
+`assignments.open_workloads`) ağırlıklı toplamıdır.
+
+Kargolar parçalar halinde Hungarian (Kuhn-Munkres) algoritmasıyla en düşük
+toplam maliyetle eşleştirilir. Bir gönüllü aynı parçada birden fazla kargo
+alabilir; her ek kargo için artan iş yükü maliyetli ayrı bir "yuva" sütunu
+açılır. Aday bulunamayan kargolar atanmamış bırakılır.
+"""
+import logging
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.core.choices import SEHIR
+from apps.volunteers.availability import volunteers_changed
+from apps.volunteers.models import Volunteer
+from .assignments import OPEN_STATUSES, open_workloads
+from .cache import invalidate_tracking
+from .models import Kargo
+from .routing import get_road_network
+
+logger = logging.getLogger(__name__)
+
+
+# Rol -> (uygun gönüllü tipleri, gönüllünün yakın olması gereken kargo alanı)
+MATCHING_ROLES = {
+    'tasima': (('tasima', 'karma'), 'cikis_yeri'),
+    'dagitim': (('dagitim', 'karma'), 'ulasacagi_yer'),
+}
+
+# Her kargo için matrise alınan en ucuz aday sayısı (matris boyutunu sınırlar)
+CANDIDATES_PER_CARGO = 5
+
+# Atanmamış kalma ve uygun olmayan eşleşme maliyetleri (her gerçek maliyetten büyük)
+_UNASSIGNED_COST = 10 ** 9
+_INFEASIBLE_COST = 10 ** 12
+
+# assigned: [(kargo_id, rol, gonullu_id)], unassigned: [(kargo_id, rol)]
+MatchResult = namedtuple('MatchResult', ('assigned', 'unassigned'))
+
+
+def get_matching_settings():
+    """(en uzak mesafe km, açık kargo başına maliyet km, parça boyutu, gönüllü başına en fazla yeni kargo)"""
+    return (
+        getattr(settings, 'CARGO_MATCHING_MAX_DISTANCE_KM', 400),
+        getattr(settings, 'CARGO_MATCHING_WORKLOAD_KM', 50),
+        getattr(settings, 'CARGO_MATCHING_BATCH_SIZE', 50),
+        getattr(settings, 'CARGO_MATCHING_MAX_PER_VOLUNTEER', 10),
+    )
+
+
+def min_cost_assignment(cost):
+    """
+    Dikdörtgen maliyet matrisi (satır sayısı <= sütun sayısı) için her satıra
+    farklı bir sütun atayan en düşük toplam maliyetli eşleşme. Satır başına
+    atanan sütun indeksleri döner. O(n^2 * m) - potansiyelli Hungarian algoritması.
+    """
+    n = len(cost)
+    if not n:
+        return []
+    m = len(cost[0])
+    if n > m:
+        raise ValueError("Satır sayısı sütun sayısından fazla olamaz")
+
+    inf = float('inf')
+    u = [0] * (n + 1)
+    v = [0] * (m + 1)
+    owner = [0] * (m + 1)   # sütun -> satır (1 tabanlı, 0 = boş)
+    way = [0] * (m + 1)
+    for row in range(1, n + 1):
+        owner[0] = row
+        column = 0
+        min_values = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[column] = True
+            current_row = owner[column]
+            current_cost = cost[current_row - 1]
+            u_row = u[current_row]
+            delta = inf
+            next_column = 0
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                reduced = current_cost[j - 1] - u_row - v[j]
+                if reduced < min_values[j]:
+                    min_values[j] = reduced
+                    way[j] = column
+                if min_values[j] < delta:
+                    delta = min_values[j]
+                    next_column = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[owner[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_values[j] -= delta
+            column = next_column
+            if owner[column] == 0:
+                break
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+
+    assignment = [0] * n
+    for j in range(1, m + 1):
+        if owner[j]:
+            assignment[owner[j] - 1] = j - 1
+    return assignment
+
+
+def _match_chunk(chunk, city_field, volunteers, workloads, assigned_counts, options):
+    """Bir parça kargoyu gönüllülere eşleştirir: [(satır, gönüllü id | None)]"""
+    max_distance, workload_km, _, max_per_volunteer = options
+    network = get_road_network()
+
+    # Her kargo için en ucuz adaylar (ilk yuva maliyetine göre)
+    shortlists = []
+    for row in chunk:
+        options_for_row = []
+        for volunteer_id, sehir in volunteers:
+            if assigned_counts.get(volunteer_id, 0) >= max_per_volunteer:
+                continue
+            km = network.distance(row[city_field], sehir)
+            if km is None or km > max_distance:
+                continue
+            options_for_row.append((km + workload_km * workloads[volunteer_id], km, volunteer_id))
+        options_for_row.sort()
+        shortlists.append({volunteer_id: km for _, km, volunteer_id in options_for_row[:CANDIDATES_PER_CARGO]})
+
+    # Sütunlar: gönüllü başına kalan kapasite kadar yuva + satır başına bir "atanmamış" sütunu
+    slots = []
+    demand = {}
+    for shortlist in shortlists:
+        for volunteer_id in shortlist:
+            demand[volunteer_id] = demand.get(volunteer_id, 0) + 1
+    for volunteer_id, count in demand.items():
+        capacity = max_per_volunteer - assigned_counts.get(volunteer_id, 0)
+        slots.extend((volunteer_id, slot) for slot in range(min(count, capacity)))
+
+    cost = []
+    for index, shortlist in enumerate(shortlists):
+        row_cost = []
+        for volunteer_id, slot in slots:
+            km = shortlist.get(volunteer_id)
+            if km is None:
+                row_cost.append(_INFEASIBLE_COST)
+            else:
+                row_cost.append(km + workload_km * (workloads[volunteer_id] + slot))
+        row_cost.extend(_UNASSIGNED_COST if i == index else _INFEASIBLE_COST for i in range(len(chunk)))
+        cost.append(row_cost)
+
+    matches = []
+    for row, column in zip(chunk, min_cost_assignment(cost)):
+        matches.append((row, slots[column][0] if column < len(slots) else None))
+    return matches
+
+
+def _candidates(gonullu_tipleri, cities, max_distance):
+    """Kargo illerinden `max_distance` içindeki aktif gönüllüler: [(id, sehir)]"""
+    network = get_road_network()
+    reachable = set()
+    for code, _ in SEHIR.choices:
+        for city in cities:
+            km = network.distance(city, code)
+            if km is not None and km <= max_distance:
+                reachable.add(code)
+                break
+    return list(
+        Volunteer.objects.filter(is_active=True, gonullu_tipi__in=gonullu_tipleri, sehir__in=reachable)
+        .order_by('id').values_list('id', 'sehir')
+    )
+
+
+def _write_chunk(role, matches, now):
+    """
+    Parçanın eşleşmelerini kısa bir transaction'da yazar. Satırlar kilitlenip
+    yeniden kontrol edilir: eşleştirme sırasında rolü dolan ya da kapanan
+    kargolar atlanır. Yazılan [(kargo id, gönüllü id)] döner.
+    """
+    field = f'{role}_gonullusu'
+    with transaction.atomic():
+        still_open = set(
+            Kargo.objects.select_for_update()
+            .filter(id__in=[kargo_id for kargo_id, _ in matches], durum__in=OPEN_STATUSES, **{f'{field}__isnull': True})
+            .order_by('id').values_list('id', flat=True)
+        )
+        written = [(kargo_id, volunteer_id) for kargo_id, volunteer_id in matches if kargo_id in still_open]
+        if written:
+            Kargo.objects.bulk_update(
+                [Kargo(id=kargo_id, son_degisiklik=now, **{f'{field}_id': volunteer_id}) for kargo_id, volunteer_id in written],
+                [field, 'son_degisiklik']
+            )
+            volunteers_changed(volunteer_id for _, volunteer_id in written)
+    return written
+
+
+def assign_backlog(queryset=None, roles=None, dry_run=False):
+    """
+    Queryset'teki (varsayılan: tüm) açık kargoların boş taşıma/dağıtım rollerini
+    doldurur. Eşleştirme kilitsiz okunan satırlarla hesaplanır; her parça ayrı
+    bir kısa transaction'da kilitlenip yazılır (bkz. `_write_chunk`). `dry_run`
+    kilit almaz ve yazmaz.
+    """
+    queryset = Kargo.objects.all() if queryset is None else queryset
+    roles = roles or tuple(MATCHING_ROLES)
+    options = get_matching_settings()
+    max_distance, _, batch_size, _ = options
+
+    empty_role = Q()
+    for role in roles:
+        empty_role |= Q(**{f'{role}_gonullusu__isnull': True})
+    rows = list(
+        queryset.filter(empty_role, durum__in=OPEN_STATUSES)
+        .order_by('olusturulma_tarihi', 'id')
+        .values('id', 'kargo_no', 'cikis_yeri', 'ulasacagi_yer', *(f'{role}_gonullusu_id' for role in roles))
+    )
+
+    assigned, unassigned = [], []
+    skipped = 0
+    now = timezone.now()
+    workloads = {}
+    assigned_counts = {}
+    for role in roles:
+        gonullu_tipleri, city_field = MATCHING_ROLES[role]
+        backlog = [row for row in rows if row[f'{role}_gonullusu_id'] is None]
+        if not backlog:
+            continue
+        volunteers = _candidates(gonullu_tipleri, {row[city_field] for row in backlog}, max_distance)
+        workloads.update(open_workloads(v_id for v_id, _ in volunteers if v_id not in workloads))
+
+        for start in range(0, len(backlog), batch_size):
+            chunk = backlog[start:start + batch_size]
+            matches = []
+            for row, volunteer_id in _match_chunk(chunk, city_field, volunteers, workloads, assigned_counts, options):
+                if volunteer_id is None:
+                    unassigned.append((row['id'], role))
+                else:
+                    matches.append((row['id'], volunteer_id))
+            if matches and not dry_run:
+                written = _write_chunk(role, matches, now)
+                skipped += len(matches) - len(written)
+                matches = written
+            for kargo_id, volunteer_id in matches:
+                assigned.append((kargo_id, role, volunteer_id))
+                workloads[volunteer_id] += 1
+                assigned_counts[volunteer_id] = assigned_counts.get(volunteer_id, 0) + 1
+
+    if assigned and not dry_run:
+        kargo_nos = {row['id']: row['kargo_no'] for row in rows}
+        invalidate_tracking(*{kargo_nos[kargo_id] for kargo_id, _, _ in assigned})
+        logger.info(
+            f"{len(assigned)} gönüllü ataması yapıldı, {len(unassigned)} rol atanamadı, "
+            f"{skipped} rol eşleştirme sırasında doldu"
+        )
+    return MatchResult(assigned, unassigned)
@@ -0,0 +1,332 @@
+# Generated by Django 5.1.1 on 2026-10-18 11:09
+
+from django.db import migrations, models
+
+
+def build_initial_rollups(apps, schema_editor):
+    """Mevcut kargolardan özet tablosunu doldur"""
+    from apps.cargo.rollups import rebuild_rollups
+
+    rebuild_rollups(
+        kargo_model=apps.get_model("cargo", "Kargo"),
+        rollup_model=apps.get_model("cargo", "KargoDailyRollup"),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cargo", "0003_alter_kargo_kargo_no"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="KargoDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("tarih", models.DateField(verbose_name="Tarih")),
+                (
+                    "cikis_yeri",
+                    models.CharField(
+                        choices=[
+                            ("adana", "Adana"),
+                            ("adiyaman", "Adıyaman"),
+                            ("afyonkarahisar", "Afyonkarahisar"),
+                            ("agri", "Ağrı"),
+                            ("aksaray", "Aksaray"),
+                            ("amasya", "Amasya"),
+                            ("ankara", "Ankara"),
+                            ("antalya", "Antalya"),
+                            ("ardahan", "Ardahan"),
+                            ("artvin", "Artvin"),
+                            ("aydin", "Aydın"),
+                            ("balikesir", "Balıkesir"),
+                            ("bartin", "Bartın"),
+                            ("batman", "Batman"),
+                            ("bayburt", "Bayburt"),
+                            ("bilecik", "Bilecik"),
+                            ("bingol", "Bingöl"),
+                            ("bitlis", "Bitlis"),
+                            ("bolu", "Bolu"),
+                            ("burdur", "Burdur"),
+                            ("bursa", "Bursa"),
+                            ("canakkale", "Çanakkale"),
+                            ("cankiri", "Çankırı"),
+                            ("corum", "Çorum"),
+                            ("denizli", "Denizli"),
+                            ("diyarbakir", "Diyarbakır"),
+                            ("duzce", "Düzce"),
+                            ("edirne", "Edirne"),
+                            ("elazig", "Elazığ"),
+                            ("erzincan", "Erzincan"),
+                            ("erzurum", "Erzurum"),
+                            ("eskisehir", "Eskişehir"),
+                            ("gaziantep", "Gaziantep"),
+                            ("giresun", "Giresun"),
+                            ("gumushane", "Gümüşhane"),
+                            ("hakkari", "Hakkâri"),
+                            ("hatay", "Hatay"),
+                            ("igdir", "Iğdır"),
+                            ("isparta", "Isparta"),
+                            ("istanbul", "İstanbul"),
+                            ("izmir", "İzmir"),
+                            ("kahramanmaras", "Kahramanmaraş"),
+                            ("karabuk", "Karabük"),
+                            ("karaman", "Karaman"),
+                            ("kars", "Kars"),
+                            ("kastamonu", "Kastamonu"),
+                            ("kayseri", "Kayseri"),
+                            ("kilis", "Kilis"),
+                            ("kirikkale", "Kırıkkale"),
+                            ("kirklareli", "Kırklareli"),
+                            ("kirsehir", "Kırşehir"),
+                            ("kocaeli", "Kocaeli"),
+                            ("konya", "Konya"),
+                            ("kutahya", "Kütahya"),
+                            ("malatya", "Malatya"),
+                            ("manisa", "Manisa"),
+                            ("mardin", "Mardin"),
+                            ("mersin", "Mersin"),
+                            ("mugla", "Muğla"),
+                            ("mus", "Muş"),
+                            ("nevsehir", "Nevşehir"),
+                            ("nigde", "Niğde"),
+                            ("ordu", "Ordu"),
+                            ("osmaniye", "Osmaniye"),
+                            ("rize", "Rize"),
+                            ("sakarya", "Sakarya"),
+                            ("samsun", "Samsun"),
+                            ("sanliurfa", "Şanlıurfa"),
+                            ("siirt", "Siirt"),
+                            ("sinop", "Sinop"),
+                            ("sirnak", "Şırnak"),
+                            ("sivas", "Sivas"),
+                            ("tekirdag", "Tekirdağ"),
+                            ("tokat", "Tokat"),
+                            ("trabzon", "Trabzon"),
+                            ("tunceli", "Tunceli"),
+                            ("usak", "Uşak"),
+                            ("van", "Van"),
+                            ("yalova", "Yalova"),
+                            ("yozgat", "Yozgat"),
+                            ("zonguldak", "Zonguldak"),
+                        ],
+                        max_length=20,
+                        verbose_name="Çıkış Yeri",
+                    ),
+                ),
+                (
+                    "ulasacagi_yer",
+                    models.CharField(
+                        choices=[
+                            ("adana", "Adana"),
+                            ("adiyaman", "Adıyaman"),
+                            ("afyonkarahisar", "Afyonkarahisar"),
+                            ("agri", "Ağrı"),
+                            ("aksaray", "Aksaray"),
+                            ("amasya", "Amasya"),
+                            ("ankara", "Ankara"),
+                            ("antalya", "Antalya"),
+                            ("ardahan", "Ardahan"),
+                            ("artvin", "Artvin"),
+                            ("aydin", "Aydın"),
+                            ("balikesir", "Balıkesir"),
+                            ("bartin", "Bartın"),
+                            ("batman", "Batman"),
+                            ("bayburt", "Bayburt"),
+                            ("bilecik", "Bilecik"),
+                            ("bingol", "Bingöl"),
+                            ("bitlis", "Bitlis"),
+                            ("bolu", "Bolu"),
+                            ("burdur", "Burdur"),
+                            ("bursa", "Bursa"),
+                            ("canakkale", "Çanakkale"),
+                            ("cankiri", "Çankırı"),
+                            ("corum", "Çorum"),
+                            ("denizli", "Denizli"),
+                            ("diyarbakir", "Diyarbakır"),
+                            ("duzce", "Düzce"),
+                            ("edirne", "Edirne"),
+                            ("elazig", "Elazığ"),
+                            ("erzincan", "Erzincan"),
+                            ("erzurum", "Erzurum"),
+                            ("eskisehir", "Eskişehir"),
+                            ("gaziantep", "Gaziantep"),
+                            ("giresun", "Giresun"),
+                            ("gumushane", "Gümüşhane"),
+                            ("hakkari", "Hakkâri"),
+                            ("hatay", "Hatay"),
+                            ("igdir", "Iğdır"),
+                            ("isparta", "Isparta"),
+                            ("istanbul", "İstanbul"),
+                            ("izmir", "İzmir"),
+                            ("kahramanmaras", "Kahramanmaraş"),
+                            ("karabuk", "Karabük"),
+                            ("karaman", "Karaman"),
+                            ("kars", "Kars"),
+                            ("kastamonu", "Kastamonu"),
+                            ("kayseri", "Kayseri"),
+                            ("kilis", "Kilis"),
+                            ("kirikkale", "Kırıkkale"),
+                            ("kirklareli", "Kırklareli"),
+                            ("kirsehir", "Kırşehir"),
+                            ("kocaeli", "Kocaeli"),
+                            ("konya", "Konya"),
+                            ("kutahya", "Kütahya"),
+                            ("malatya", "Malatya"),
+                            ("manisa", "Manisa"),
+                            ("mardin", "Mardin"),
+                            ("mersin", "Mersin"),
+                            ("mugla", "Muğla"),
+                            ("mus", "Muş"),
+                            ("nevsehir", "Nevşehir"),
+                            ("nigde", "Niğde"),
+                            ("ordu", "Ordu"),
+                            ("osmaniye", "Osmaniye"),
+                            ("rize", "Rize"),
+                            ("sakarya", "Sakarya"),
+                            ("samsun", "Samsun"),
+                            ("sanliurfa", "Şanlıurfa"),
+                            ("siirt", "Siirt"),
+                            ("sinop", "Sinop"),
+                            ("sirnak", "Şırnak"),
+                            ("sivas", "Sivas"),
+                            ("tekirdag", "Tekirdağ"),
+                            ("tokat", "Tokat"),
+                            ("trabzon", "Trabzon"),
+                            ("tunceli", "Tunceli"),
+                            ("usak", "Uşak"),
+                            ("van", "Van"),
+                            ("yalova", "Yalova"),
+                            ("yozgat", "Yozgat"),
+                            ("zonguldak", "Zonguldak"),
+                        ],
+                        max_length=20,
+                        verbose_name="Ulaşacağı Yer",
+                    ),
+                ),
+                (
+                    "kargo_tipi",
+                    models.CharField(
+                        choices=[
+                            ("gida", "Gıda"),
+                            ("ilac", "İlaç"),
+                            ("giyim", "Giyim"),
+                            ("karisik", "Karışık"),
+                            ("diger", "Diğer"),
+                        ],
+                        max_length=10,
+                        verbose_name="Kargo Tipi",
+                    ),
+                ),
+                (
+                    "durum",
+                    models.CharField(
+                        choices=[
+                            ("hazirlaniyor", "Hazırlanıyor"),
+                            ("yolda", "Yolda"),
+                            ("teslim_edildi", "Teslim Edildi"),
+                            ("iptal_edildi", "İptal Edildi"),
+                        ],
+                        max_length=15,
+                        verbose_name="Durum",
+                    ),
+                ),
+                (
+                    "kargo_sayisi",
+                    models.PositiveIntegerField(default=0, verbose_name="Kargo Sayısı"),
+                ),
+                (
+                    "anonim_sayisi",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Anonim Gönderici Sayısı"
+                    ),
+                ),
+                (
+                    "toplam_agirlik",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=16,
+                        verbose_name="Toplam Ağırlık (kg)",
+                    ),
+                ),
+                (
+                    "toplam_hacim",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=16,
+                        verbose_name="Toplam Hacim (m³)",
+                    ),
+                ),
+                (
+                    "toplam_miktar",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Toplam Miktar"
+                    ),
+                ),
+                (
+                    "min_agirlik",
+                    models.DecimalField(
+                        decimal_places=2,
+                        max_digits=8,
+                        null=True,
+                        verbose_name="Minimum Ağırlık",
+                    ),
+                ),
+                (
+                    "max_agirlik",
+                    models.DecimalField(
+                        decimal_places=2,
+                        max_digits=8,
+                        null=True,
+                        verbose_name="Maksimum Ağırlık",
+                    ),
+                ),
+                (
+                    "min_hacim",
+                    models.DecimalField(
+                        decimal_places=2,
+                        max_digits=8,
+                        null=True,
+                        verbose_name="Minimum Hacim",
+                    ),
+                ),
+                (
+                    "max_hacim",
+                    models.DecimalField(
+                        decimal_places=2,
+                        max_digits=8,
+                        null=True,
+                        verbose_name="Maksimum Hacim",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Günlük Kargo Özeti",
+                "verbose_name_plural": "Günlük Kargo Özetleri",
+                "db_table": "kargo_daily_rollup",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "tarih",
+                            "cikis_yeri",
+                            "ulasacagi_yer",
+                            "kargo_tipi",
+                            "durum",
+                        ),
+                        name="kargo_daily_rollup_unique_bucket",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_initial_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.1.1 on 2026-10-18 11:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cargo", "0004_kargo_daily_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="KargoDurumGecmisi",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "eski_durum",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("hazirlaniyor", "Hazırlanıyor"),
+                            ("yolda", "Yolda"),
+                            ("teslim_edildi", "Teslim Edildi"),
+                            ("iptal_edildi", "İptal Edildi"),
+                        ],
+                        max_length=15,
+                        null=True,
+                        verbose_name="Eski Durum",
+                    ),
+                ),
+                (
+                    "yeni_durum",
+                    models.CharField(
+                        choices=[
+                            ("hazirlaniyor", "Hazırlanıyor"),
+                            ("yolda", "Yolda"),
+                            ("teslim_edildi", "Teslim Edildi"),
+                            ("iptal_edildi", "İptal Edildi"),
+                        ],
+                        max_length=15,
+                        verbose_name="Yeni Durum",
+                    ),
+                ),
+                (
+                    "tarih",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Tarih"
+                    ),
+                ),
+                (
+                    "kargo",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="durum_gecmisi",
+                        to="cargo.kargo",
+                        verbose_name="Kargo",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Kargo Durum Geçmişi",
+                "verbose_name_plural": "Kargo Durum Geçmişi",
+                "db_table": "kargo_durum_gecmisi",
+                "ordering": ["tarih", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["kargo", "tarih"], name="kargo_gecmis_kargo_tarih_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.1.1 on 2026-10-18 11:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cargo", "0005_kargo_durum_gecmisi"),
+        ("volunteers", "0004_alter_volunteer_gonulluluk_no"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="kargo",
+            index=models.Index(
+                fields=["-olusturulma_tarihi"], name="kargo_olusturulma_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="kargo",
+            index=models.Index(
+                fields=["durum", "-olusturulma_tarihi"],
+                name="kargo_durum_olusturulma_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="kargo",
+            index=models.Index(
+                fields=["kargo_tipi", "-olusturulma_tarihi"],
+                name="kargo_tipi_olusturulma_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="kargo",
+            index=models.Index(
+                fields=["cikis_yeri", "ulasacagi_yer", "-olusturulma_tarihi"],
+                name="kargo_rota_olusturulma_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="kargo",
+            index=models.Index(
+                fields=["ulasacagi_yer", "-olusturulma_tarihi"],
+                name="kargo_varis_olusturulma_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="kargo",
+            index=models.Index(fields=["agirlik"], name="kargo_agirlik_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="kargo",
+            index=models.Index(
+                condition=models.Q(("durum__in", ["hazirlaniyor", "yolda"])),
+                fields=["-olusturulma_tarihi"],
+                name="kargo_aktif_olusturulma_idx",
+            ),
+        ),
+    ]
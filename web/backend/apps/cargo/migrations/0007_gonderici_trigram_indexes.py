@@ -0,0 +1,17 @@
+from django.db import migrations
+
+from apps.core.search import trigram_indexes
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cargo", "0006_kargo_access_path_indexes"),
+    ]
+
+    # PostgreSQL: KargoFilter.filter_gonderici icontains aramaları için pg_trgm index'leri
+    operations = [
+        trigram_indexes(
+            "kargo",
+            ["gonderici_ad", "gonderici_soyad", "gonderici_telefon", "gonderici_email"],
+        ),
+    ]
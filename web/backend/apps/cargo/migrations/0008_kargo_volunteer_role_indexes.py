@@ -0,0 +1,34 @@
+# Generated by Django 5.1.1 on 2026-10-18 11:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cargo", "0007_gonderici_trigram_indexes"),
+        ("volunteers", "0006_volunteer_arama_metni"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="kargo",
+            index=models.Index(
+                fields=["toplama_gonullusu", "-olusturulma_tarihi", "-id"],
+                name="kargo_toplama_olusturulma_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="kargo",
+            index=models.Index(
+                fields=["tasima_gonullusu", "-olusturulma_tarihi", "-id"],
+                name="kargo_tasima_olusturulma_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="kargo",
+            index=models.Index(
+                fields=["dagitim_gonullusu", "-olusturulma_tarihi", "-id"],
+                name="kargo_dagitim_olusturulma_idx",
+            ),
+        ),
+    ]
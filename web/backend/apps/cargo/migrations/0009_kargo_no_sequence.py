@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from apps.core.sequences import sequence_migration
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cargo", "0008_kargo_volunteer_role_indexes"),
+    ]
+
+    # PostgreSQL: KARGO_NO_SEQUENCE için native SEQUENCE (mevcut en büyük numaradan devam eder)
+    operations = [
+        sequence_migration("kargo_no", "kargo", "kargo_no", "AYK"),
+    ]
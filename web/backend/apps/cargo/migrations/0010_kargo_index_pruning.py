@@ -0,0 +1,76 @@
+# Generated by Django 5.1.1 on 2026-10-18 12:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cargo", "0009_kargo_no_sequence"),
+        ("volunteers", "0008_gonulluluk_no_sequence"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="kargo",
+            name="kargo_varis_olusturulma_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="kargo",
+            name="kargo_agirlik_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="kargo",
+            name="kargo_aktif_olusturulma_idx",
+        ),
+        migrations.AlterField(
+            model_name="kargo",
+            name="dagitim_gonullusu",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                limit_choices_to={
+                    "gonullu_tipi__in": ["dagitim", "karma"],
+                    "is_active": True,
+                },
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="dagitim_kargolari",
+                to="volunteers.volunteer",
+                verbose_name="Dağıtım Gönüllüsü",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="kargo",
+            name="tasima_gonullusu",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                limit_choices_to={
+                    "gonullu_tipi__in": ["tasima", "karma"],
+                    "is_active": True,
+                },
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="tasima_kargolari",
+                to="volunteers.volunteer",
+                verbose_name="Taşıma Gönüllüsü",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="kargo",
+            name="toplama_gonullusu",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="Toplama gönüllüsü seçimi zorunludur",
+                limit_choices_to={
+                    "gonullu_tipi__in": ["toplama", "karma"],
+                    "is_active": True,
+                },
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="toplama_kargolari",
+                to="volunteers.volunteer",
+                verbose_name="Toplama Gönüllüsü",
+            ),
+        ),
+    ]
@@ -1,8 +1,19 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.core.validators import RegexValidator, MinValueValidator
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from apps.core.choices import SEHIR, KARGO_DURUM, KARGO_TIPI, KARGO_ICERIK
+from apps.core.sequences import SequenceAllocator
+
+
+# Kargo numarası serisi (AYK000000000) - blok halinde, taramasız dağıtılır
+KARGO_NO_SEQUENCE = SequenceAllocator(
+    name='kargo_no',
+    model='cargo.Kargo',
+    field='kargo_no',
+    prefix='AYK',
+)
 
 
 class Kargo(models.Model):
@@ -44,30 +55,8 @@ class Kargo(models.Model):
         verbose_name="Gönderici E-posta"
     )
     
-    # Konum Bilgileri - Volunteers app ile uyumlu şehir listesi
-    SEHIR_CHOICES = [
-        ('adana', 'Adana'), ('adiyaman', 'Adıyaman'), ('afyonkarahisar', 'Afyonkarahisar'),
-        ('agri', 'Ağrı'), ('aksaray', 'Aksaray'), ('amasya', 'Amasya'), ('ankara', 'Ankara'),
-        ('antalya', 'Antalya'), ('ardahan', 'Ardahan'), ('artvin', 'Artvin'), ('aydin', 'Aydın'),
-        ('balikesir', 'Balıkesir'), ('bartin', 'Bartın'), ('batman', 'Batman'), ('bayburt', 'Bayburt'),
-        ('bilecik', 'Bilecik'), ('bingol', 'Bingöl'), ('bitlis', 'Bitlis'), ('bolu', 'Bolu'),
-        ('burdur', 'Burdur'), ('bursa', 'Bursa'), ('canakkale', 'Çanakkale'), ('cankiri', 'Çankırı'),
-        ('corum', 'Çorum'), ('denizli', 'Denizli'), ('diyarbakir', 'Diyarbakır'), ('duzce', 'Düzce'),
-        ('edirne', 'Edirne'), ('elazig', 'Elazığ'), ('erzincan', 'Erzincan'), ('erzurum', 'Erzurum'),
-        ('eskisehir', 'Eskişehir'), ('gaziantep', 'Gaziantep'), ('giresun', 'Giresun'), ('gumushane', 'Gümüşhane'),
-        ('hakkari', 'Hakkâri'), ('hatay', 'Hatay'), ('igdir', 'Iğdır'), ('isparta', 'Isparta'),
-        ('istanbul', 'İstanbul'), ('izmir', 'İzmir'), ('kahramanmaras', 'Kahramanmaraş'), ('karabuk', 'Karabük'),
-        ('karaman', 'Karaman'), ('kars', 'Kars'), ('kastamonu', 'Kastamonu'), ('kayseri', 'Kayseri'),
-        ('kilis', 'Kilis'), ('kirikkale', 'Kırıkkale'), ('kirklareli', 'Kırklareli'), ('kirsehir', 'Kırşehir'),
-        ('kocaeli', 'Kocaeli'), ('konya', 'Konya'), ('kutahya', 'Kütahya'), ('malatya', 'Malatya'),
-        ('manisa', 'Manisa'), ('mardin', 'Mardin'), ('mersin', 'Mersin'), ('mugla', 'Muğla'),
-        ('mus', 'Muş'), ('nevsehir', 'Nevşehir'), ('nigde', 'Niğde'), ('ordu', 'Ordu'),
-        ('osmaniye', 'Osmaniye'), ('rize', 'Rize'), ('sakarya', 'Sakarya'), ('samsun', 'Samsun'),
-        ('sanliurfa', 'Şanlıurfa'), ('siirt', 'Siirt'), ('sinop', 'Sinop'), ('sirnak', 'Şırnak'),
-        ('sivas', 'Sivas'), ('tekirdag', 'Tekirdağ'), ('tokat', 'Tokat'), ('trabzon', 'Trabzon'),
-        ('tunceli', 'Tunceli'), ('usak', 'Uşak'), ('van', 'Van'), ('yalova', 'Yalova'),
-        ('yozgat', 'Yozgat'), ('zonguldak', 'Zonguldak')
-    ]
+    # Konum Bilgileri - Volunteers app ile ortak şehir listesi (apps.core.choices)
+    SEHIR_CHOICES = SEHIR.sorted_choices
     
     cikis_yeri = models.CharField(
         max_length=20,
@@ -102,12 +91,7 @@ class Kargo(models.Model):
     )
     
     # Durum
-    DURUM_CHOICES = [
-        ('hazirlaniyor', 'Hazırlanıyor'),
-        ('yolda', 'Yolda'),
-        ('teslim_edildi', 'Teslim Edildi'),
-        ('iptal_edildi', 'İptal Edildi'),
-    ]
+    DURUM_CHOICES = KARGO_DURUM.choices
     durum = models.CharField(
         max_length=15,
         choices=DURUM_CHOICES,
@@ -116,13 +100,7 @@ class Kargo(models.Model):
     )
     
     # Kargo Tipi ve İçerik
-    KARGO_TIPI_CHOICES = [
-        ('gida', 'Gıda'),
-        ('ilac', 'İlaç'),
-        ('giyim', 'Giyim'),
-        ('karisik', 'Karışık'),
-        ('diger', 'Diğer'),
-    ]
+    KARGO_TIPI_CHOICES = KARGO_TIPI.choices
     kargo_tipi = models.CharField(
         max_length=10,
         choices=KARGO_TIPI_CHOICES,
@@ -130,60 +108,11 @@ class Kargo(models.Model):
     )
     
     # İçerik Seçenekleri
-    GIDA_CHOICES = [
-        "Su (5L, 10L, 19L)", "Konserve Gıda (Et, Sebze, Meyve)", "Kuru Gıda Paketi",
-        "Bebek Maması ve Besini", "Taze Meyve ve Sebze", "Ekmek ve Unlu Mamuller",
-        "Pirinç (1kg, 5kg, 25kg)", "Makarna ve Bulgur", "Bakliyat (Mercimek, Fasulye, Nohut)",
-        "Yağ ve Tereyağı", "Süt ve Süt Ürünleri", "Hazır Yemek Paketi",
-        "Çay ve Kahve", "Şeker ve Bal", "Tuz ve Baharat",
-        "Bisküvi ve Kraker", "Kuruyemiş ve Çekirdek", "Reçel ve Pekmez",
-        "Çikolata ve Şeker", "Mama Biberon ve Emzik"
-    ]
-    
-    ILAC_CHOICES = [
-        "Reçeteli İlaç Paketi", "Ağrı Kesici (Parol, Aspirin)", "Ateş Düşürücü",
-        "Soğuk Algınlığı İlacı", "Vitamin ve Mineral Takviyesi", "İlk Yardım Çantası",
-        "Bandaj ve Sargı Malzemesi", "Antiseptik ve Dezenfektan", "Termometre",
-        "Kan Basıncı Aleti", "Diyabet Test Kiti", "Maske ve Eldiven",
-        "Serum Fizyolojik", "Pamuk ve Gazlı Bez", "Yara Bandı ve Flaster",
-        "Öksürük Şurubu", "Mide İlacı", "Göz Damlası",
-        "Kulak Damlası", "Merhem ve Krem", "Enjektör ve İğne",
-        "Tansiyon İlacı", "Kalp İlacı", "Nefes Açıcı (Astım)",
-        "İnsülin ve Diyabet Malzemeleri"
-    ]
-    
-    GIYIM_CHOICES = [
-        "Yetişkin Kış Kıyafeti", "Yetişkin Yaz Kıyafeti", "Çocuk Kıyafeti (0-2 Yaş)",
-        "Çocuk Kıyafeti (3-12 Yaş)", "Genç Kıyafeti (13-18 Yaş)", "Ayakkabı (Erkek/Kadın/Çocuk)",
-        "İç Çamaşırı Seti", "Battaniye ve Yorgan", "Uyku Tulumu",
-        "Yastık ve Kılıf", "Çadır ve Kamp Malzemesi", "Mont ve Kaban",
-        "Çorap ve Külotlu Çorap", "Eldiven ve Bere", "Atkı ve Şal",
-        "Pijama ve Gecelik", "Hamile Kıyafeti", "Bebek Kıyafeti ve Zıbın",
-        "İş Kıyafeti ve Önlük", "Spor Kıyafeti", "Terlik ve Sandalet",
-        "Çizme ve Bot", "Kemer ve Aksesuar"
-    ]
-    
-    KARISIK_CHOICES = [
-        "Aile Yardım Paketi", "Acil Durum Paketi", "Bebek Bakım Paketi",
-        "Okul Malzemeleri Paketi", "Hijyen Paketi", "Temizlik Malzemeleri Paketi",
-        "Kışlık Hazırlık Paketi", "Yenidoğan Paketi", "Yaşlı Bakım Paketi",
-        "Engelli Bakım Paketi", "Kadın Hijyen Paketi", "Erkek Bakım Paketi",
-        "Çocuk Oyun Paketi", "Eğitim Destek Paketi", "Mutfak Eşyası Paketi",
-        "Banyo Malzemeleri Paketi", "Kamp ve Barınma Paketi", "İletişim Paketi"
-    ]
-    
-    DIGER_CHOICES = [
-        "Elektronik Eşya (Telefon, Tablet)", "Ev Eşyası (Tencere, Tabak)", "Eğitim Malzemeleri",
-        "Kitap ve Dergi", "Çocuk Oyuncakları", "Spor Malzemeleri",
-        "Müzik Aletleri", "Bahçe ve Tarım Malzemeleri", "İnşaat Malzemeleri",
-        "Araç Yedek Parça", "Yakıt ve Enerji", "Haberleşme Cihazları",
-        "Temizlik Malzemeleri", "Kırtasiye Malzemeleri", "Mobilya ve Dekorasyon",
-        "Mutfak Gereçleri", "Banyo Malzemeleri", "Aydınlatma Malzemeleri",
-        "Güvenlik Malzemeleri", "Yangın Söndürme Malzemeleri", "Jeneratör ve Güç Kaynağı",
-        "Su Arıtma Cihazları", "Isıtma ve Soğutma Cihazları", "Çanta ve Bavul",
-        "Saatler ve Takılar", "Optik Malzemeler (Gözlük)", "Pet Malzemeleri",
-        "Hobi Malzemeleri", "Sanat Malzemeleri", "Fotoğraf ve Video Ekipmanları"
-    ]
+    GIDA_CHOICES = KARGO_ICERIK['gida']
+    ILAC_CHOICES = KARGO_ICERIK['ilac']
+    GIYIM_CHOICES = KARGO_ICERIK['giyim']
+    KARISIK_CHOICES = KARGO_ICERIK['karisik']
+    DIGER_CHOICES = KARGO_ICERIK['diger']
     
     icerik = models.TextField(
         verbose_name="İçerik",
@@ -193,6 +122,7 @@ class Kargo(models.Model):
     # Gönüllü Bilgileri - Volunteer modeli ile ForeignKey ilişkisi
     toplama_gonullusu = models.ForeignKey(
         'volunteers.Volunteer',
+        db_index=False,  # kargo_toplama_olusturulma_idx
         on_delete=models.PROTECT,
         related_name='toplama_kargolari',
         limit_choices_to={'gonullu_tipi__in': ['toplama', 'karma'], 'is_active': True},
@@ -202,6 +132,7 @@ class Kargo(models.Model):
     
     tasima_gonullusu = models.ForeignKey(
         'volunteers.Volunteer',
+        db_index=False,  # kargo_tasima_olusturulma_idx
         on_delete=models.SET_NULL,
         blank=True,
         null=True,
@@ -212,6 +143,7 @@ class Kargo(models.Model):
     
     dagitim_gonullusu = models.ForeignKey(
         'volunteers.Volunteer',
+        db_index=False,  # kargo_dagitim_olusturulma_idx
         on_delete=models.SET_NULL,
         blank=True,
         null=True,
@@ -237,29 +169,77 @@ class Kargo(models.Model):
         verbose_name="Son Değişiklik"
     )
     
+    # Numara çakışmasında (eski blok, elle girilmiş numara) yeniden deneme sayısı
+    KARGO_NO_MAX_RETRIES = 3
+    
+    # Değişiklik takibi için yüklenme anındaki değeri saklanan alanlar
+    # (durum/anonimlik geçişleri, günlük özet kovası ve gönüllü iş yükü)
+    TRACKED_FIELDS = (
+        'durum', 'anonim_gonderici', 'olusturulma_tarihi',
+        'cikis_yeri', 'ulasacagi_yer', 'kargo_tipi',
+        'toplama_gonullusu_id', 'tasima_gonullusu_id', 'dagitim_gonullusu_id',
+    )
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values)
+            if name in cls.TRACKED_FIELDS
+        }
+        return instance
+    
+    def _tracked_values(self):
+        deferred = self.get_deferred_fields()
+        return {
+            name: getattr(self, name) for name in self.TRACKED_FIELDS
+            if name not in deferred
+        }
+    
+    def get_loaded_values(self):
+        """
+        Takip edilen alanların veritabanındaki (son okunan/kaydedilen) değerleri.
+        Yeni kayıtta None; yüklenmemiş alanlar varsa sadece onlar okunur.
+        """
+        if self.pk is None:
+            return None
+        loaded = dict(getattr(self, '_loaded_values', None) or {})
+        missing = [name for name in self.TRACKED_FIELDS if name not in loaded]
+        if missing:
+            row = type(self)._default_manager.filter(pk=self.pk).values(*missing).first()
+            if row is None:
+                return None
+            loaded.update(row)
+        return loaded
+    
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        current = self._tracked_values()
+        if fields is None:
+            self._loaded_values = current
+        else:
+            # Ertelenmiş alan erişimi: sadece yeniden okunan alanların görüntüsü güncellenir
+            loaded = getattr(self, '_loaded_values', None) or {}
+            loaded.update({name: current[name] for name in fields if name in current})
+            self._loaded_values = loaded
+    
     def save(self, *args, **kwargs):
-        if not self.kargo_no:
-            self.kargo_no = self.generate_kargo_no()
-        super().save(*args, **kwargs)
+        if self.kargo_no:
+            # Durum geçmişi (post_save) kayıtla aynı transaction'da yazılsın
+            with transaction.atomic(using=kwargs.get('using')):
+                super().save(*args, **kwargs)
+        else:
+            KARGO_NO_SEQUENCE.save_with_number(
+                self,
+                lambda: super(Kargo, self).save(*args, **kwargs),
+                using=kwargs.get('using'),
+                retries=self.KARGO_NO_MAX_RETRIES
+            )
+        self._loaded_values = self._tracked_values()
     
     def generate_kargo_no(self):
         """AYK000000000 formatında sequential kargo numarası oluşturur"""
-        with transaction.atomic():
-            # Son kargo numarasını bul
-            last_kargo = Kargo.objects.filter(
-                kargo_no__startswith='AYK'
-            ).order_by('kargo_no').last()
-            
-            if last_kargo and last_kargo.kargo_no:
-                # Son numaradan sonraki numarayı al
-                last_number = int(last_kargo.kargo_no[3:])  # AYK'yı çıkar
-                next_number = last_number + 1
-            else:
-                # İlk kargo
-                next_number = 0
-            
-            # AYK000000000 formatında oluştur (9 haneli, sıfırlarla doldur)
-            return f"AYK{next_number:09d}"
+        return KARGO_NO_SEQUENCE.next_number()
     
     def clean(self):
         """Model validation"""
@@ -293,6 +273,20 @@ class Kargo(models.Model):
                     'icerik': 'İçerik açıklaması 500 karakterden uzun olamaz.'
                 })
     
+    # Django'nun üretilen get_FOO_display'i her çağrıda choices'tan sözlük kurar;
+    # etiketler ortak kayıt defterinden okunur
+    def get_durum_display(self):
+        return KARGO_DURUM.label(self.durum)
+    
+    def get_kargo_tipi_display(self):
+        return KARGO_TIPI.label(self.kargo_tipi)
+    
+    def get_cikis_yeri_display(self):
+        return SEHIR.label(self.cikis_yeri)
+    
+    def get_ulasacagi_yer_display(self):
+        return SEHIR.label(self.ulasacagi_yer)
+    
     def __str__(self):
         return f"{self.kargo_no} - {self.get_durum_display()}"
     
@@ -301,3 +295,127 @@ class Kargo(models.Model):
         verbose_name_plural = "Kargolar"
         ordering = ['-olusturulma_tarihi']
         db_table = 'kargo'
+        # Liste/filtre erişim yolları: filtre kolonu + varsayılan sıralama
+        # (bkz. `manage.py benchmark_cargo_queries`)
+        indexes = [
+            models.Index(fields=['-olusturulma_tarihi'], name='kargo_olusturulma_idx'),
+            models.Index(fields=['durum', '-olusturulma_tarihi'], name='kargo_durum_olusturulma_idx'),
+            models.Index(fields=['kargo_tipi', '-olusturulma_tarihi'], name='kargo_tipi_olusturulma_idx'),
+            models.Index(
+                fields=['cikis_yeri', 'ulasacagi_yer', '-olusturulma_tarihi'],
+                name='kargo_rota_olusturulma_idx'
+            ),
+            # Gönüllü bazlı liste: rol başına UNION dalları (bkz. assignments.py).
+            # FK kolonuyla başladıkları için FK'ların tek kolonluk index'lerinin yerini tutar.
+            models.Index(
+                fields=['toplama_gonullusu', '-olusturulma_tarihi', '-id'],
+                name='kargo_toplama_olusturulma_idx'
+            ),
+            models.Index(
+                fields=['tasima_gonullusu', '-olusturulma_tarihi', '-id'],
+                name='kargo_tasima_olusturulma_idx'
+            ),
+            models.Index(
+                fields=['dagitim_gonullusu', '-olusturulma_tarihi', '-id'],
+                name='kargo_dagitim_olusturulma_idx'
+            ),
+        ]
+
+
+class KargoDailyRollup(models.Model):
+    """
+    Günlük kargo özet tablosu - dashboard istatistikleri ham `kargo` tablosu
+    yerine buradan okunur. Kargo kayıt/silme sinyalleri ve admin toplu
+    işlemleri sadece etkilenen satırları yeniden hesaplar (bkz. rollups.py).
+    """
+    tarih = models.DateField(verbose_name="Tarih")
+    cikis_yeri = models.CharField(
+        max_length=20,
+        choices=Kargo.SEHIR_CHOICES,
+        verbose_name="Çıkış Yeri"
+    )
+    ulasacagi_yer = models.CharField(
+        max_length=20,
+        choices=Kargo.SEHIR_CHOICES,
+        verbose_name="Ulaşacağı Yer"
+    )
+    kargo_tipi = models.CharField(
+        max_length=10,
+        choices=Kargo.KARGO_TIPI_CHOICES,
+        verbose_name="Kargo Tipi"
+    )
+    durum = models.CharField(
+        max_length=15,
+        choices=Kargo.DURUM_CHOICES,
+        verbose_name="Durum"
+    )
+    
+    # Metrikler
+    kargo_sayisi = models.PositiveIntegerField(default=0, verbose_name="Kargo Sayısı")
+    anonim_sayisi = models.PositiveIntegerField(default=0, verbose_name="Anonim Gönderici Sayısı")
+    toplam_agirlik = models.DecimalField(max_digits=16, decimal_places=2, default=0, verbose_name="Toplam Ağırlık (kg)")
+    toplam_hacim = models.DecimalField(max_digits=16, decimal_places=2, default=0, verbose_name="Toplam Hacim (m³)")
+    toplam_miktar = models.PositiveBigIntegerField(default=0, verbose_name="Toplam Miktar")
+    min_agirlik = models.DecimalField(max_digits=8, decimal_places=2, null=True, verbose_name="Minimum Ağırlık")
+    max_agirlik = models.DecimalField(max_digits=8, decimal_places=2, null=True, verbose_name="Maksimum Ağırlık")
+    min_hacim = models.DecimalField(max_digits=8, decimal_places=2, null=True, verbose_name="Minimum Hacim")
+    max_hacim = models.DecimalField(max_digits=8, decimal_places=2, null=True, verbose_name="Maksimum Hacim")
+    
+    def __str__(self):
+        return f"{self.tarih} {self.cikis_yeri}->{self.ulasacagi_yer} {self.kargo_tipi}/{self.durum}: {self.kargo_sayisi}"
+    
+    class Meta:
+        verbose_name = "Günlük Kargo Özeti"
+        verbose_name_plural = "Günlük Kargo Özetleri"
+        db_table = 'kargo_daily_rollup'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tarih', 'cikis_yeri', 'ulasacagi_yer', 'kargo_tipi', 'durum'],
+                name='kargo_daily_rollup_unique_bucket'
+            )
+        ]
+
+
+class KargoDurumGecmisi(models.Model):
+    """
+    Kargo durum geçmişi - yalnızca ekleme yapılan olay kaydı.
+    Durum değişikliğiyle aynı transaction içinde yazılır; takip sayfasındaki
+    zaman çizelgesi buradan üretilir.
+    """
+    kargo = models.ForeignKey(
+        Kargo,
+        on_delete=models.CASCADE,
+        related_name='durum_gecmisi',
+        verbose_name="Kargo"
+    )
+    eski_durum = models.CharField(
+        max_length=15,
+        choices=Kargo.DURUM_CHOICES,
+        blank=True,
+        null=True,
+        verbose_name="Eski Durum"
+    )
+    yeni_durum = models.CharField(
+        max_length=15,
+        choices=Kargo.DURUM_CHOICES,
+        verbose_name="Yeni Durum"
+    )
+    tarih = models.DateTimeField(default=timezone.now, verbose_name="Tarih")
+    
+    def get_eski_durum_display(self):
+        return KARGO_DURUM.label(self.eski_durum)
+    
+    def get_yeni_durum_display(self):
+        return KARGO_DURUM.label(self.yeni_durum)
+    
+    def __str__(self):
+        return f"{self.kargo_id}: {self.eski_durum or '-'} -> {self.yeni_durum} ({self.tarih})"
+    
+    class Meta:
+        verbose_name = "Kargo Durum Geçmişi"
+        verbose_name_plural = "Kargo Durum Geçmişi"
+        ordering = ['tarih', 'id']
+        db_table = 'kargo_durum_gecmisi'
+        indexes = [
+            models.Index(fields=['kargo', 'tarih'], name='kargo_gecmis_kargo_tarih_idx'),
+        ]
@@ -0,0 +1,153 @@
+"""
+Günlük kargo özet tablosu (KargoDailyRollup) bakımı
+
+Her özet satırı (tarih, çıkış, varış, tip, durum) kovasına düşen kargoların
+sayı/toplam/min/max değerlerini tutar. Bir kargo değiştiğinde sadece eski ve
+yeni kovası ham veriden yeniden hesaplanır; tüm tablo taranmaz.
+
+Min/max değerleri fark (delta) uygulanarak korunamadığından kovalar yeniden
+hesaplanır; eşzamanlı yazanların birbirinin sonucunu ezmemesi için kova
+satırları önce kilitlenir (bkz. `refresh_buckets`).
+"""
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+ROLLUP_DIMENSIONS = ('cikis_yeri', 'ulasacagi_yer', 'kargo_tipi', 'durum')
+ROLLUP_METRICS = (
+    'kargo_sayisi', 'anonim_sayisi', 'toplam_agirlik', 'toplam_hacim', 'toplam_miktar',
+    'min_agirlik', 'max_agirlik', 'min_hacim', 'max_hacim',
+)
+
+RollupKey = namedtuple('RollupKey', ('tarih',) + ROLLUP_DIMENSIONS)
+
+# Tek sorguda birleştirilecek en fazla kova (SQLite ifade derinliği sınırı)
+KEY_CHUNK_SIZE = 200
+
+
+def _models():
+    from .models import Kargo, KargoDailyRollup
+    return Kargo, KargoDailyRollup
+
+
+def rollup_key(kargo):
+    """Kargonun düştüğü özet kovası"""
+    return rollup_key_from_values(
+        {field: getattr(kargo, field) for field in ('olusturulma_tarihi',) + ROLLUP_DIMENSIONS}
+    )
+
+
+def rollup_key_from_values(values):
+    """Alan değerleri sözlüğünden (ör. `Kargo.get_loaded_values()`) özet kovası"""
+    return RollupKey(
+        timezone.localdate(values['olusturulma_tarihi']),
+        *(values[field] for field in ROLLUP_DIMENSIONS)
+    )
+
+
+def _day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    end = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+    return start, end
+
+
+def _kargo_condition(keys):
+    condition = Q()
+    for key in keys:
+        start, end = _day_bounds(key.tarih)
+        condition |= Q(
+            olusturulma_tarihi__gte=start,
+            olusturulma_tarihi__lt=end,
+            **{field: getattr(key, field) for field in ROLLUP_DIMENSIONS}
+        )
+    return condition
+
+
+def _rollup_condition(keys):
+    condition = Q()
+    for key in keys:
+        condition |= Q(**key._asdict())
+    return condition
+
+
+def aggregate_rows(queryset):
+    """Kargo queryset'ini kova bazında gruplayan tek sorgu"""
+    return queryset.order_by().annotate(
+        tarih=TruncDate('olusturulma_tarihi')
+    ).values('tarih', *ROLLUP_DIMENSIONS).annotate(
+        kargo_sayisi=Count('id'),
+        anonim_sayisi=Count('id', filter=Q(anonim_gonderici=True)),
+        toplam_agirlik=Sum('agirlik'),
+        toplam_hacim=Sum('hacim'),
+        toplam_miktar=Sum('miktar'),
+        min_agirlik=Min('agirlik'),
+        max_agirlik=Max('agirlik'),
+        min_hacim=Min('hacim'),
+        max_hacim=Max('hacim'),
+    )
+
+
+def refresh_buckets(keys):
+    """
+    Verilen kovaları ham veriden yeniden hesaplar; boşalan kovaları siler.
+
+    READ COMMITTED altında aynı kovaya eşzamanlı yazan iki transaction
+    birbirinin commit edilmemiş satırını göremez; ikisi de kendi hesabını
+    yazarsa son yazan kazanır. Bu yüzden önce kova satırları (yoksa boş olarak
+    eklenip) `select_for_update` ile kilitlenir, toplamlar kilit alındıktan
+    sonra okunur: diğer transaction commit edene kadar beklenir ve yeni sorgu
+    onun satırlarını da görür. Kilitler kova sırasıyla alınır (deadlock olmaz).
+    """
+    Kargo, KargoDailyRollup = _models()
+    keys = sorted(set(keys))
+
+    for i in range(0, len(keys), KEY_CHUNK_SIZE):
+        chunk = keys[i:i + KEY_CHUNK_SIZE]
+        with transaction.atomic():
+            KargoDailyRollup.objects.bulk_create(
+                [KargoDailyRollup(**key._asdict()) for key in chunk],
+                ignore_conflicts=True,
+            )
+            list(
+                KargoDailyRollup.objects.filter(_rollup_condition(chunk))
+                .select_for_update().order_by(*RollupKey._fields).values_list('id', flat=True)
+            )
+
+            rows = list(aggregate_rows(Kargo.objects.filter(_kargo_condition(chunk))))
+            found = {RollupKey(*(row[field] for field in RollupKey._fields)) for row in rows}
+            stale = [key for key in chunk if key not in found]
+            if rows:
+                KargoDailyRollup.objects.bulk_create(
+                    [KargoDailyRollup(**row) for row in rows],
+                    update_conflicts=True,
+                    unique_fields=RollupKey._fields,
+                    update_fields=ROLLUP_METRICS,
+                )
+            if stale:
+                KargoDailyRollup.objects.filter(_rollup_condition(stale)).delete()
+
+
+def rebuild_rollups(batch_size=1000, kargo_model=None, rollup_model=None):
+    """Özet tablosunu tamamen yeniden oluşturur; oluşturulan satır sayısını döndürür"""
+    if kargo_model is None or rollup_model is None:
+        kargo_model, rollup_model = _models()
+
+    created = 0
+    with transaction.atomic():
+        rollup_model.objects.all().delete()
+        batch = []
+        for row in aggregate_rows(kargo_model.objects.all()).iterator(chunk_size=batch_size):
+            batch.append(rollup_model(**row))
+            if len(batch) >= batch_size:
+                rollup_model.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            rollup_model.objects.bulk_create(batch)
+            created += len(batch)
+    return created
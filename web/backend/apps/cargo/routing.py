@@ -0,0 +1,293 @@
+"""
+İller arası mesafe matrisi ve karayolu ağı
+
+81 ilin koordinatları (mobil/iller.json ile aynı veri) modül import edilirken
+bir kez okunur ve 81x81 haversine (kuş uçuşu) mesafe matrisi önceden
+hesaplanır. NumPy kuruluysa matris vektörel olarak hesaplanır; değilse aynı
+değerler saf Python ile düz bir `array('d')` içine yazılır. Aramalar
+il kodu -> sıra eşlemesi üzerinden O(1)'dir, istek başına hesaplama yapılmaz.
+
+Kuş uçuşu mesafe dağlık/kıyı rotalarda (ör. Hakkari -> Edirne) gerçek yolu
+fazlasıyla küçük gösterir. Bunun için komşu iller arası yol mesafelerini
+içeren sürümlü veri dosyası (data/il_yol_agi.json, `build_road_graph`
+komutuyla üretilir) ilk kullanımda okunur, tüm il çiftleri için en kısa yollar
+Floyd–Warshall ile bir kez hesaplanır ve süreç boyunca bellekte tutulur.
+"""
+import json
+import math
+import threading
+from array import array
+from pathlib import Path
+
+from apps.core.choices import SEHIR
+
+try:
+    import numpy as np
+except ImportError:  # NumPy opsiyonel
+    np = None
+
+
+EARTH_RADIUS_KM = 6371
+
+# (il kodu, enlem, boylam) - plaka sırasıyla, SEHIR ile aynı sıra
+IL_KOORDINATLARI = (
+    ('adana', 36.9914, 35.3308),
+    ('adiyaman', 37.7636, 38.2773),
+    ('afyonkarahisar', 38.7569, 30.5387),
+    ('agri', 39.7191, 43.0506),
+    ('amasya', 40.6565, 35.8373),
+    ('ankara', 39.9334, 32.8597),
+    ('antalya', 36.8969, 30.7133),
+    ('artvin', 41.1809, 41.8208),
+    ('aydin', 37.8380, 27.8456),
+    ('balikesir', 39.6533, 27.8903),
+    ('bilecik', 40.1426, 29.9793),
+    ('bingol', 38.8855, 40.4966),
+    ('bitlis', 38.4006, 42.1095),
+    ('bolu', 40.7325, 31.6082),
+    ('burdur', 37.7183, 30.2823),
+    ('bursa', 40.1885, 29.0610),
+    ('canakkale', 40.1467, 26.4086),
+    ('cankiri', 40.6002, 33.6162),
+    ('corum', 40.5499, 34.9537),
+    ('denizli', 37.7830, 29.0963),
+    ('diyarbakir', 37.9250, 40.2110),
+    ('edirne', 41.6771, 26.5557),
+    ('elazig', 38.6748, 39.2225),
+    ('erzincan', 39.7468, 39.4911),
+    ('erzurum', 39.9055, 41.2658),
+    ('eskisehir', 39.7667, 30.5256),
+    ('gaziantep', 37.0660, 37.3781),
+    ('giresun', 40.9175, 38.3927),
+    ('gumushane', 40.4608, 39.4803),
+    ('hakkari', 37.5774, 43.7368),
+    ('hatay', 36.2023, 36.1613),
+    ('isparta', 37.7626, 30.5537),
+    ('mersin', 36.8121, 34.6415),
+    ('istanbul', 41.0082, 28.9784),
+    ('izmir', 38.4237, 27.1428),
+    ('kars', 40.6013, 43.0975),
+    ('kastamonu', 41.3766, 33.7765),
+    ('kayseri', 38.7205, 35.4826),
+    ('kirklareli', 41.7355, 27.2244),
+    ('kirsehir', 39.1461, 34.1595),
+    ('kocaeli', 40.7654, 29.9408),
+    ('konya', 37.8746, 32.4932),
+    ('kutahya', 39.4200, 29.9857),
+    ('malatya', 38.3554, 38.3335),
+    ('manisa', 38.6140, 27.4296),
+    ('kahramanmaras', 37.5753, 36.9228),
+    ('mardin', 37.3129, 40.7340),
+    ('mugla', 37.2154, 28.3634),
+    ('mus', 38.7346, 41.4910),
+    ('nevsehir', 38.6247, 34.7142),
+    ('nigde', 37.9698, 34.6766),
+    ('ordu', 40.9862, 37.8797),
+    ('rize', 41.0255, 40.5177),
+    ('sakarya', 40.7889, 30.4060),
+    ('samsun', 41.2797, 36.3361),
+    ('siirt', 37.9274, 41.9420),
+    ('sinop', 42.0280, 35.1517),
+    ('sivas', 39.7505, 37.0150),
+    ('tekirdag', 40.9781, 27.5117),
+    ('tokat', 40.3235, 36.5522),
+    ('trabzon', 41.0027, 39.7168),
+    ('tunceli', 39.1062, 39.5483),
+    ('sanliurfa', 37.1674, 38.7955),
+    ('usak', 38.6742, 29.4059),
+    ('van', 38.5012, 43.3730),
+    ('yozgat', 39.8210, 34.8086),
+    ('zonguldak', 41.4535, 31.7894),
+    ('aksaray', 38.3686, 34.0297),
+    ('bayburt', 40.2603, 40.2280),
+    ('karaman', 37.1810, 33.2222),
+    ('kirikkale', 39.8398, 33.5089),
+    ('batman', 37.8895, 41.1293),
+    ('sirnak', 37.5190, 42.4537),
+    ('bartin', 41.6376, 32.3338),
+    ('ardahan', 41.1130, 42.7023),
+    ('igdir', 39.9201, 44.0436),
+    ('yalova', 40.6549, 29.2842),
+    ('karabuk', 41.1956, 32.6227),
+    ('kilis', 36.7165, 37.1147),
+    ('osmaniye', 37.0746, 36.2464),
+    ('duzce', 40.8387, 31.1626),
+)
+
+# Sonuçların yuvarlandığı basamak sayısı
+DISTANCE_PRECISION = 2
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """İki koordinat arasındaki kuş uçuşu mesafe (km)"""
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def _build_matrix_numpy(coordinates):
+    lat = np.radians(np.array([lat for _, lat, _ in coordinates]))
+    lon = np.radians(np.array([lon for _, _, lon in coordinates]))
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    matrix = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    return array('d', np.round(matrix, DISTANCE_PRECISION).ravel().tolist())
+
+
+def _build_matrix_python(coordinates):
+    size = len(coordinates)
+    matrix = array('d', bytes(8 * size * size))
+    for i, (_, lat1, lon1) in enumerate(coordinates):
+        for j in range(i + 1, size):
+            _, lat2, lon2 = coordinates[j]
+            distance = round(haversine(lat1, lon1, lat2, lon2), DISTANCE_PRECISION)
+            matrix[i * size + j] = matrix[j * size + i] = distance
+    return matrix
+
+
+def build_matrix(coordinates=IL_KOORDINATLARI, use_numpy=None):
+    """Satır-öncelikli düz mesafe matrisi (`size * size` eleman)"""
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        return _build_matrix_numpy(coordinates)
+    return _build_matrix_python(coordinates)
+
+
+if tuple(code for code, _, _ in IL_KOORDINATLARI) != tuple(code for code, _ in SEHIR.choices):
+    raise ValueError("IL_KOORDINATLARI SEHIR seçenekleriyle aynı sırada olmalıdır")
+
+SIZE = len(IL_KOORDINATLARI)
+INDEX = SEHIR.index
+MATRIX = build_matrix()
+
+
+def distance(cikis_yeri, ulasacagi_yer):
+    """İki il arasındaki mesafe (km); bilinmeyen il kodu için None"""
+    i = INDEX.get(cikis_yeri)
+    j = INDEX.get(ulasacagi_yer)
+    if i is None or j is None:
+        return None
+    return MATRIX[i * SIZE + j]
+
+
+def distances(pairs):
+    """(çıkış, varış) çiftleri için mesafe listesi - toplu sorgulama"""
+    index = INDEX
+    matrix = MATRIX
+    result = []
+    for cikis_yeri, ulasacagi_yer in pairs:
+        i = index.get(cikis_yeri)
+        j = index.get(ulasacagi_yer)
+        result.append(None if i is None or j is None else matrix[i * SIZE + j])
+    return result
+
+
+# Karayolu ağı veri dosyası
+ROAD_GRAPH_PATH = Path(__file__).resolve().parent / 'data' / 'il_yol_agi.json'
+
+# Yol bulunamayan çiftler için
+_NO_NEXT = -1
+
+
+class RoadNetwork:
+    """
+    Tüm il çiftleri için en kısa yol mesafeleri (`dist`) ve yol kurulumu için
+    sonraki düğüm tablosu (`next`); ikisi de satır-öncelikli düz dizilerdir.
+    """
+
+    __slots__ = ('version', 'dist', 'next')
+
+    def __init__(self, edges, version=None, size=SIZE, index=INDEX):
+        self.version = version
+        self.dist, self.next = self.floyd_warshall(edges, size, index)
+
+    @staticmethod
+    def floyd_warshall(edges, size=SIZE, index=INDEX):
+        inf = math.inf
+        dist = [[inf] * size for _ in range(size)]
+        nxt = [[_NO_NEXT] * size for _ in range(size)]
+        for i in range(size):
+            dist[i][i] = 0
+            nxt[i][i] = i
+        for a, b, km in edges:
+            i, j = index[a], index[b]
+            if km < dist[i][j]:
+                dist[i][j] = dist[j][i] = km
+                nxt[i][j] = j
+                nxt[j][i] = i
+
+        for k in range(size):
+            dist_k = dist[k]
+            for i in range(size):
+                dist_ik = dist[i][k]
+                if dist_ik == inf:
+                    continue
+                dist_i = dist[i]
+                nxt_i = nxt[i]
+                nxt_ik = nxt_i[k]
+                for j in range(size):
+                    candidate = dist_ik + dist_k[j]
+                    if candidate < dist_i[j]:
+                        dist_i[j] = candidate
+                        nxt_i[j] = nxt_ik
+
+        return (
+            array('d', (value for row in dist for value in row)),
+            array('h', (value for row in nxt for value in row)),
+        )
+
+    @classmethod
+    def from_file(cls, path=ROAD_GRAPH_PATH):
+        with open(path, encoding='utf-8') as data_file:
+            data = json.load(data_file)
+        unknown = {code for a, b, _ in data['edges'] for code in (a, b)} - set(INDEX)
+        if unknown:
+            raise ValueError(f"Yol ağında bilinmeyen il kodu: {', '.join(sorted(unknown))}")
+        return cls(data['edges'], version=data.get('version'))
+
+    def distance(self, cikis_yeri, ulasacagi_yer):
+        """En kısa yol mesafesi (km); bilinmeyen il ya da bağlantısız çift için None"""
+        i = INDEX.get(cikis_yeri)
+        j = INDEX.get(ulasacagi_yer)
+        if i is None or j is None:
+            return None
+        value = self.dist[i * SIZE + j]
+        return None if value == math.inf else round(value, DISTANCE_PRECISION)
+
+    def path(self, cikis_yeri, ulasacagi_yer):
+        """Çıkıştan varışa uğranan il kodları (uçlar dahil); yol yoksa None"""
+        i = INDEX.get(cikis_yeri)
+        j = INDEX.get(ulasacagi_yer)
+        if i is None or j is None or self.next[i * SIZE + j] == _NO_NEXT:
+            return None
+        codes = SEHIR.choices
+        path = [codes[i][0]]
+        while i != j:
+            i = self.next[i * SIZE + j]
+            path.append(codes[i][0])
+        return path
+
+
+_road_network = None
+_road_network_lock = threading.Lock()
+
+
+def get_road_network():
+    """Karayolu ağını ilk çağrıda yükler; sonraki çağrılar bellekteki örneği döndürür"""
+    global _road_network
+    if _road_network is None:
+        with _road_network_lock:
+            if _road_network is None:
+                _road_network = RoadNetwork.from_file()
+    return _road_network
+
+
+def road_distance(cikis_yeri, ulasacagi_yer):
+    return get_road_network().distance(cikis_yeri, ulasacagi_yer)
+
+
+def road_path(cikis_yeri, ulasacagi_yer):
+    return get_road_network().path(cikis_yeri, ulasacagi_yer)
@@ -1,5 +1,8 @@
 from rest_framework import serializers
-from .models import Kargo
+from apps.core.choices import SEHIR, KARGO_DURUM, KARGO_TIPI
+from apps.volunteers.models import Volunteer
+from .models import Kargo, KargoDurumGecmisi
+from .routing import distance
 
 
 class KargoSerializer(serializers.ModelSerializer):
@@ -7,6 +10,8 @@ class KargoSerializer(serializers.ModelSerializer):
     kargo_tipi_display = serializers.CharField(source='get_kargo_tipi_display', read_only=True)
     cikis_yeri_display = serializers.CharField(source='get_cikis_yeri_display', read_only=True)
     ulasacagi_yer_display = serializers.CharField(source='get_ulasacagi_yer_display', read_only=True)
+    # Çıkış ve varış ili arasındaki kuş uçuşu mesafe (km)
+    mesafe_km = serializers.SerializerMethodField()
     
     # Gönüllü bilgilerini nested olarak göster
     toplama_gonullusu_detail = serializers.SerializerMethodField()
@@ -18,6 +23,9 @@ class KargoSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['kargo_no', 'olusturulma_tarihi', 'son_degisiklik']
     
+    def get_mesafe_km(self, obj):
+        return distance(obj.cikis_yeri, obj.ulasacagi_yer)
+    
     def get_toplama_gonullusu_detail(self, obj):
         if obj.toplama_gonullusu:
             return {
@@ -52,6 +60,95 @@ class KargoSerializer(serializers.ModelSerializer):
         return None
 
 
+class KargoFlatSerializer:
+    """
+    `KargoSerializer` ile birebir aynı JSON'u `.values()` satırlarından üreten
+    hızlı okuma yolu (liste yanıtları için; doğrulama/yazma yok).
+    Model örneği ve DRF alan ağacı kurulmaz; seçenek etiketleri önceden
+    hesaplanmış kayıt defterinden (apps.core.choices) okunur.
+    """
+    VOLUNTEER_ROLES = ('toplama_gonullusu', 'tasima_gonullusu', 'dagitim_gonullusu')
+    VOLUNTEER_COLUMNS = ('id', 'gonulluluk_no', 'ad', 'soyad', 'telefon', 'sehir')
+    MODEL_COLUMNS = (
+        'id', 'kargo_no', 'anonim_gonderici', 'gonderici_ad', 'gonderici_soyad',
+        'gonderici_telefon', 'gonderici_email', 'cikis_yeri', 'ulasacagi_yer',
+        'agirlik', 'hacim', 'miktar', 'durum', 'kargo_tipi', 'icerik', 'ozel_not',
+        'olusturulma_tarihi', 'son_degisiklik',
+    )
+    
+    # Biçimlendirme DRF alanlarıyla aynı olsun diye sadece bu iki alan tipi yeniden kullanılır
+    _decimal = serializers.DecimalField(max_digits=8, decimal_places=2)
+    _datetime = serializers.DateTimeField()
+    
+    def __init__(self, rows, many=True, context=None):
+        self.rows = rows
+        self.context = context or {}
+    
+    @classmethod
+    def columns(cls):
+        return cls.MODEL_COLUMNS + tuple(cls.VOLUNTEER_ROLES) + tuple(
+            f'{role}__{column}' for role in cls.VOLUNTEER_ROLES for column in cls.VOLUNTEER_COLUMNS
+        )
+    
+    @classmethod
+    def values(cls, queryset):
+        """Queryset'i bu serializer'ın beklediği `.values()` satırlarına çevirir"""
+        return queryset.values(*cls.columns())
+    
+    @classmethod
+    def _volunteer(cls, row, role):
+        volunteer_id = row[f'{role}__id']
+        if volunteer_id is None:
+            return None
+        return {
+            'id': volunteer_id,
+            'gonulluluk_no': row[f'{role}__gonulluluk_no'],
+            'full_name': f"{row[f'{role}__ad']} {row[f'{role}__soyad']}",
+            'telefon': row[f'{role}__telefon'],
+            'sehir': SEHIR.label(row[f'{role}__sehir']),
+        }
+    
+    @classmethod
+    def to_representation(cls, row):
+        decimal = cls._decimal.to_representation
+        datetime = cls._datetime.to_representation
+        return {
+            'id': row['id'],
+            'durum_display': KARGO_DURUM.label(row['durum']),
+            'kargo_tipi_display': KARGO_TIPI.label(row['kargo_tipi']),
+            'cikis_yeri_display': SEHIR.label(row['cikis_yeri']),
+            'ulasacagi_yer_display': SEHIR.label(row['ulasacagi_yer']),
+            'mesafe_km': distance(row['cikis_yeri'], row['ulasacagi_yer']),
+            'toplama_gonullusu_detail': cls._volunteer(row, 'toplama_gonullusu'),
+            'tasima_gonullusu_detail': cls._volunteer(row, 'tasima_gonullusu'),
+            'dagitim_gonullusu_detail': cls._volunteer(row, 'dagitim_gonullusu'),
+            'kargo_no': row['kargo_no'],
+            'anonim_gonderici': row['anonim_gonderici'],
+            'gonderici_ad': row['gonderici_ad'],
+            'gonderici_soyad': row['gonderici_soyad'],
+            'gonderici_telefon': row['gonderici_telefon'],
+            'gonderici_email': row['gonderici_email'],
+            'cikis_yeri': row['cikis_yeri'],
+            'ulasacagi_yer': row['ulasacagi_yer'],
+            'agirlik': decimal(row['agirlik']) if row['agirlik'] is not None else None,
+            'hacim': decimal(row['hacim']) if row['hacim'] is not None else None,
+            'miktar': row['miktar'],
+            'durum': row['durum'],
+            'kargo_tipi': row['kargo_tipi'],
+            'icerik': row['icerik'],
+            'ozel_not': row['ozel_not'],
+            'olusturulma_tarihi': datetime(row['olusturulma_tarihi']) if row['olusturulma_tarihi'] else None,
+            'son_degisiklik': datetime(row['son_degisiklik']) if row['son_degisiklik'] else None,
+            'toplama_gonullusu': row['toplama_gonullusu'],
+            'tasima_gonullusu': row['tasima_gonullusu'],
+            'dagitim_gonullusu': row['dagitim_gonullusu'],
+        }
+    
+    @property
+    def data(self):
+        return [self.to_representation(row) for row in self.rows]
+
+
 class KargoCreateSerializer(serializers.ModelSerializer):
     """Kargo oluşturma için özel serializer"""
     
@@ -139,12 +236,55 @@ class KargoCreateSerializer(serializers.ModelSerializer):
                 })
 
 
+class PreloadedVolunteerField(serializers.PrimaryKeyRelatedField):
+    """
+    Gönüllüyü `context['volunteers']` (id -> Volunteer) sözlüğünden çözer;
+    toplu işlemlerde kalem başına sorgu atılmaz. Context yoksa normal çalışır.
+    """
+    
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', Volunteer.objects.all())
+        super().__init__(**kwargs)
+    
+    def to_internal_value(self, data):
+        volunteers = self.context.get('volunteers')
+        if volunteers is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        volunteer = volunteers.get(pk)
+        if volunteer is None:
+            self.fail('does_not_exist', pk_value=data)
+        return volunteer
+
+
+class KargoBulkItemSerializer(KargoCreateSerializer):
+    """Toplu oluşturmada tek kalemin doğrulaması (gönüllüler önceden okunmuş olarak)"""
+    toplama_gonullusu = PreloadedVolunteerField()
+    tasima_gonullusu = PreloadedVolunteerField(required=False, allow_null=True)
+    dagitim_gonullusu = PreloadedVolunteerField(required=False, allow_null=True)
+
+
+class KargoDurumGecmisiSerializer(serializers.ModelSerializer):
+    """Takip zaman çizelgesi kalemi"""
+    yeni_durum_display = serializers.CharField(source='get_yeni_durum_display', read_only=True)
+    
+    class Meta:
+        model = KargoDurumGecmisi
+        fields = ['eski_durum', 'yeni_durum', 'yeni_durum_display', 'tarih']
+
+
 class KargoTrackingSerializer(serializers.ModelSerializer):
     """Kargo takibi için genişletilmiş serializer - tüm gerekli bilgiler"""
     durum_display = serializers.CharField(source='get_durum_display', read_only=True)
     kargo_tipi_display = serializers.CharField(source='get_kargo_tipi_display', read_only=True)
     cikis_yeri_display = serializers.CharField(source='get_cikis_yeri_display', read_only=True)
     ulasacagi_yer_display = serializers.CharField(source='get_ulasacagi_yer_display', read_only=True)
+    durum_gecmisi = KargoDurumGecmisiSerializer(many=True, read_only=True)
     
     class Meta:
         model = Kargo
@@ -154,5 +294,5 @@ class KargoTrackingSerializer(serializers.ModelSerializer):
             'cikis_yeri', 'cikis_yeri_display', 
             'ulasacagi_yer', 'ulasacagi_yer_display',
             'icerik', 'kargo_tipi', 'kargo_tipi_display',
-            'olusturulma_tarihi', 'son_degisiklik'
+            'olusturulma_tarihi', 'son_degisiklik', 'durum_gecmisi'
         ]
@@ -1,6 +1,15 @@
-from django.db.models.signals import pre_save, post_save
+import logging
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from .models import Kargo
+from .rollups import rollup_key, rollup_key_from_values, refresh_buckets
+from .cache import invalidate_tracking
+from .history import record_status_change
+from .assignments import OPEN_STATUSES, VOLUNTEER_ROLES
+from apps.volunteers.availability import volunteers_changed
+
+logger = logging.getLogger(__name__)
 
 
 @receiver(pre_save, sender=Kargo)
@@ -15,31 +24,89 @@ def clear_sender_info_if_anonymous(sender, instance, **kwargs):
 
 @receiver(pre_save, sender=Kargo)
 def store_old_status(sender, instance, **kwargs):
-    """Eski durumu sakla (durum değişikliği takibi için)"""
-    if instance.pk:
-        try:
-            old_instance = Kargo.objects.get(pk=instance.pk)
-            instance._old_durum = old_instance.durum
-            instance._old_anonim_gonderici = old_instance.anonim_gonderici
-        except Kargo.DoesNotExist:
-            instance._old_durum = None
-            instance._old_anonim_gonderici = None
+    """
+    Eski durumu sakla (durum değişikliği takibi için).
+    Değerler `Kargo.from_db` anındaki anlık görüntüden gelir; satır yeniden okunmaz.
+    """
+    old_values = instance.get_loaded_values()
+    if old_values:
+        instance._old_durum = old_values['durum']
+        instance._old_anonim_gonderici = old_values['anonim_gonderici']
+        instance._old_rollup_key = rollup_key_from_values(old_values)
+        instance._old_volunteer_ids = {old_values[column] for column in VOLUNTEER_ROLES.values()}
+    elif instance.pk:
+        instance._old_durum = None
+        instance._old_anonim_gonderici = None
+        instance._old_rollup_key = None
+        instance._old_volunteer_ids = set()
 
 
 @receiver(post_save, sender=Kargo)
 def log_status_change(sender, instance, created, **kwargs):
-    """Durum değişikliklerini logla"""
-    if not created and hasattr(instance, '_old_durum'):
+    """Durum değişikliklerini geçmiş tablosuna yaz ve logla"""
+    if created:
+        record_status_change(instance, None)
+        logger.info(f"Yeni kargo oluşturuldu: {instance.kargo_no} - {instance.get_durum_display()}")
+    elif hasattr(instance, '_old_durum'):
         # Durum değişikliği kontrolü
         if instance._old_durum and instance._old_durum != instance.durum:
-            print(f"Kargo {instance.kargo_no} durumu değişti: {instance._old_durum} -> {instance.durum}")
+            record_status_change(instance, instance._old_durum)
+            logger.info(f"Kargo {instance.kargo_no} durumu değişti: {instance._old_durum} -> {instance.durum}")
         
         # Anonim gönderici değişikliği kontrolü
         if hasattr(instance, '_old_anonim_gonderici') and instance._old_anonim_gonderici != instance.anonim_gonderici:
             status = "anonim" if instance.anonim_gonderici else "gönderici bilgili"
-            print(f"Kargo {instance.kargo_no} gönderici durumu değişti: {status}")
-    elif created:
-        print(f"Yeni kargo oluşturuldu: {instance.kargo_no} - {instance.get_durum_display()}")
+            logger.info(f"Kargo {instance.kargo_no} gönderici durumu değişti: {status}")
+
+
+@receiver(post_save, sender=Kargo)
+def refresh_rollup_on_save(sender, instance, **kwargs):
+    """Günlük özet tablosunda kargonun eski ve yeni kovasını tazele"""
+    keys = {rollup_key(instance)}
+    old_key = getattr(instance, '_old_rollup_key', None)
+    if old_key:
+        keys.add(old_key)
+    refresh_buckets(keys)
+
+
+@receiver(post_delete, sender=Kargo)
+def refresh_rollup_on_delete(sender, instance, **kwargs):
+    """Silinen kargonun özet kovasını tazele"""
+    refresh_buckets({rollup_key(instance)})
+
+
+@receiver(post_save, sender=Kargo)
+@receiver(post_delete, sender=Kargo)
+def invalidate_tracking_cache(sender, instance, **kwargs):
+    """
+    Takip önbelleğini commit sonrası temizle (yeni kargo için negatif önbellek
+    kaydı da silinir). Commit'ten önce silinirse eşzamanlı bir `track` isteği
+    eski satırı okuyup TTL boyunca yeniden önbelleğe yazabilir.
+    """
+    kargo_no = instance.kargo_no
+    transaction.on_commit(lambda: invalidate_tracking(kargo_no))
+
+
+def _volunteer_ids(instance):
+    return {getattr(instance, column) for column in VOLUNTEER_ROLES.values()}
+
+
+@receiver(post_save, sender=Kargo)
+def refresh_volunteer_availability(sender, instance, created, **kwargs):
+    """Atanmış gönüllülerin açık kargo sayısı değiştiyse uygunluk indeksini güncelle"""
+    current = _volunteer_ids(instance)
+    old = getattr(instance, '_old_volunteer_ids', set())
+    old_open = getattr(instance, '_old_durum', None) in OPEN_STATUSES
+    if not created and old == current and old_open == (instance.durum in OPEN_STATUSES):
+        return
+    volunteers_changed(current | old)
+
+
+@receiver(post_delete, sender=Kargo)
+def refresh_volunteer_availability_on_delete(sender, instance, **kwargs):
+    """Silinen kargonun gönüllülerinin iş yükünü güncelle"""
+    if instance.durum in OPEN_STATUSES:
+        volunteers_changed(_volunteer_ids(instance))
 
 
 @receiver(pre_save, sender=Kargo)
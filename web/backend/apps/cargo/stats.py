@@ -0,0 +1,256 @@
+"""
+Kargo istatistik sorguları
+
+Dashboard istatistikleri tek bir koşullu aggregate sorgusuyla
+(`Count(filter=Q(...))`) hesaplanır; her durum/tip için ayrı COUNT atılmaz.
+Zaman serileri tek bir gruplu sorgu + Python tarafında boşluk doldurma ile üretilir.
+
+Queryset verilmediğinde sorgular ham `kargo` tablosu yerine günlük özet
+tablosunu (KargoDailyRollup) okur; maliyet satır sayısına değil
+gün × boyut sayısına bağlıdır.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db.models import Count, F, Max, Min, Q, Sum
+from django.db.models.functions import TruncDate, TruncHour, TruncMonth, TruncWeek
+from django.utils import timezone
+from apps.core.choices import KARGO_DURUM, KARGO_TIPI
+from .models import Kargo, KargoDailyRollup
+from .routing import distances
+
+
+# Zaman serisi çözünürlükleri: (gruplama fonksiyonu, etiket formatı)
+TIME_SERIES_GRANULARITIES = {
+    'hour': (TruncHour, '%Y-%m-%dT%H:00'),
+    'day': (TruncDate, '%Y-%m-%d'),
+    'week': (TruncWeek, '%Y-%m-%d'),
+    'month': (TruncMonth, '%Y-%m'),
+}
+
+# Saatlik seri çok sayıda kova üreteceği için ayrıca sınırlandırılır
+MAX_HOURLY_SERIES_DAYS = 7
+
+
+def _share(count, total, name):
+    """Sayı, yüzde ve görünen ad içeren istatistik kalemi"""
+    percentage = (count / total * 100) if total > 0 else 0
+    return {
+        'count': count,
+        'percentage': round(percentage, 2),
+        'name': name
+    }
+
+
+def get_general_stats(queryset=None):
+    """
+    Toplam, anonim, durum ve kargo tipi dağılımı - tek sorgu.
+    Yanıt yapısı `KargoViewSet.statistics` ile aynıdır.
+    """
+    if queryset is None:
+        # Günlük özet tablosu üzerinden
+        queryset = KargoDailyRollup.objects.all()
+        count = lambda condition=None: Sum('kargo_sayisi', filter=condition, default=0)
+        anonymous = Sum('anonim_sayisi', default=0)
+    else:
+        count = lambda condition=None: Count('id', filter=condition)
+        anonymous = count(Q(anonim_gonderici=True))
+
+    aggregates = {
+        'toplam_kargo': count(),
+        'anonim_gonderici': anonymous,
+    }
+    for status_code in KARGO_DURUM.labels:
+        aggregates[f'durum_{status_code}'] = count(Q(durum=status_code))
+    for type_code in KARGO_TIPI.labels:
+        aggregates[f'tip_{type_code}'] = count(Q(kargo_tipi=type_code))
+
+    counts = queryset.order_by().aggregate(**aggregates)
+    total_cargo = counts['toplam_kargo']
+
+    stats = {
+        'toplam_kargo': total_cargo,
+        'anonim_gonderici': counts['anonim_gonderici'],
+        'gonderici_bilgili': total_cargo - counts['anonim_gonderici'],
+    }
+
+    # Durum bazlı istatistikler
+    for status_code, status_name in KARGO_DURUM:
+        key = f'durum_{status_code}'
+        stats[key] = _share(counts[key], total_cargo, status_name)
+
+    # Kargo tipi bazlı istatistikler
+    for type_code, type_name in KARGO_TIPI:
+        key = f'tip_{type_code}'
+        stats[key] = _share(counts[key], total_cargo, type_name)
+
+    return stats
+
+
+def _average(total, count):
+    return round(total / count, 2) if total is not None and count else 0
+
+
+def get_weight_volume_stats():
+    """Ağırlık, hacim ve miktar toplam/ortalama/min/max değerleri (özet tablosundan)"""
+    totals = KargoDailyRollup.objects.aggregate(
+        kargo_sayisi=Sum('kargo_sayisi'),
+        toplam_agirlik=Sum('toplam_agirlik'),
+        min_agirlik=Min('min_agirlik'),
+        max_agirlik=Max('max_agirlik'),
+        toplam_hacim=Sum('toplam_hacim'),
+        min_hacim=Min('min_hacim'),
+        max_hacim=Max('max_hacim'),
+        toplam_miktar=Sum('toplam_miktar'),
+    )
+    count = totals['kargo_sayisi'] or 0
+
+    stats = {
+        'toplam_agirlik': totals['toplam_agirlik'],
+        'ortalama_agirlik': _average(totals['toplam_agirlik'], count),
+        'min_agirlik': totals['min_agirlik'],
+        'max_agirlik': totals['max_agirlik'],
+        'toplam_hacim': totals['toplam_hacim'],
+        'ortalama_hacim': _average(totals['toplam_hacim'], count),
+        'min_hacim': totals['min_hacim'],
+        'max_hacim': totals['max_hacim'],
+        'toplam_miktar': totals['toplam_miktar'],
+        'ortalama_miktar': _average(totals['toplam_miktar'], count),
+    }
+
+    # None değerleri 0 ile değiştir
+    for key, value in stats.items():
+        if value is None:
+            stats[key] = 0
+        elif isinstance(value, float):
+            stats[key] = round(value, 2)
+
+    return stats
+
+
+def get_top_cities(limit=10):
+    """En çok çıkış ve varış yapılan şehirler: (top_origins, top_destinations)"""
+    top_origins = KargoDailyRollup.objects.values('cikis_yeri').annotate(
+        count=Sum('kargo_sayisi')
+    ).order_by('-count', 'cikis_yeri')[:limit]
+
+    top_destinations = KargoDailyRollup.objects.values('ulasacagi_yer').annotate(
+        count=Sum('kargo_sayisi')
+    ).order_by('-count', 'ulasacagi_yer')[:limit]
+
+    return list(top_origins), list(top_destinations)
+
+
+def get_distance_stats(limit=10):
+    """
+    Rota bazlı mesafe istatistikleri (özet tablosundan): kargo sayısıyla
+    ağırlıklandırılmış toplam/ortalama mesafe ve en yoğun rotalar.
+    Mesafeler önceden hesaplanmış il matrisinden toplu okunur.
+    """
+    routes = list(
+        KargoDailyRollup.objects.values('cikis_yeri', 'ulasacagi_yer').annotate(
+            count=Sum('kargo_sayisi')
+        ).order_by('-count', 'cikis_yeri', 'ulasacagi_yer')
+    )
+    route_distances = distances((route['cikis_yeri'], route['ulasacagi_yer']) for route in routes)
+
+    total_km = 0
+    cargo_count = 0
+    for route, mesafe_km in zip(routes, route_distances):
+        route['mesafe_km'] = mesafe_km
+        if mesafe_km is not None:
+            total_km += mesafe_km * route['count']
+            cargo_count += route['count']
+
+    return {
+        'toplam_mesafe_km': round(total_km, 2),
+        'ortalama_mesafe_km': _average(total_km, cargo_count),
+        'top_routes': routes[:limit],
+    }
+
+
+def get_max_time_series_days():
+    """İzin verilen en uzun zaman penceresi (gün)"""
+    return getattr(settings, 'CARGO_STATS_MAX_DAYS', 366)
+
+
+def _bucket_starts(start, end, granularity):
+    """[start, end] aralığındaki tüm kova başlangıçları (boş günleri doldurmak için)"""
+    if granularity == 'hour':
+        current = start.replace(minute=0, second=0, microsecond=0)
+        step = timedelta(hours=1)
+    else:
+        current = start.date()
+        end = end.date()
+        if granularity == 'week':
+            current -= timedelta(days=current.weekday())
+        elif granularity == 'month':
+            current = current.replace(day=1)
+        step = timedelta(days=1 if granularity == 'day' else 7)
+
+    while current <= end:
+        yield current
+        if granularity == 'month':
+            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            current += step
+
+
+def get_time_series(days=30, granularity='day', queryset=None):
+    """
+    Son `days` gündeki kargo sayılarını tek bir gruplu sorguyla döndürür.
+    Kargo olmayan kovalar Python tarafında sıfırla doldurulur.
+    """
+    if granularity not in TIME_SERIES_GRANULARITIES:
+        raise ValueError(f"Geçersiz çözünürlük: {granularity}")
+    max_days = MAX_HOURLY_SERIES_DAYS if granularity == 'hour' else get_max_time_series_days()
+    if days < 1 or days > max_days:
+        raise ValueError(f"Gün sayısı 1 ile {max_days} arasında olmalıdır")
+
+    trunc, label_format = TIME_SERIES_GRANULARITIES[granularity]
+    now = timezone.localtime()
+    start_date = now.date() - timedelta(days=days)
+    start = timezone.make_aware(datetime.combine(start_date, time.min))
+
+    if queryset is None and granularity != 'hour':
+        # Gün ve üstü çözünürlükler özet tablosundan okunur
+        rows = KargoDailyRollup.objects.filter(
+            tarih__gte=start_date,
+            tarih__lte=now.date()
+        ).annotate(
+            bucket=F('tarih') if granularity == 'day' else trunc('tarih')
+        ).values('bucket').annotate(
+            count=Sum('kargo_sayisi')
+        ).order_by('bucket')
+    else:
+        if queryset is None:
+            queryset = Kargo.objects.all()
+        rows = queryset.filter(
+            olusturulma_tarihi__gte=start,
+            olusturulma_tarihi__lte=now
+        ).annotate(
+            bucket=trunc('olusturulma_tarihi')
+        ).values('bucket').annotate(
+            count=Count('id')
+        ).order_by('bucket')
+
+    counts = {}
+    for row in rows:
+        bucket = row['bucket']
+        if isinstance(bucket, datetime):
+            bucket = timezone.localtime(bucket) if granularity == 'hour' else timezone.localtime(bucket).date()
+        counts[bucket.strftime(label_format)] = row['count']
+
+    distribution = []
+    for bucket in _bucket_starts(start, now, granularity):
+        label = bucket.strftime(label_format)
+        distribution.append({'date': label, 'count': counts.get(label, 0)})
+
+    total_in_period = sum(counts.values())
+    return {
+        'period_days': days,
+        'granularity': granularity,
+        'total_in_period': total_in_period,
+        'daily_average': round(total_in_period / days, 2),
+        'daily_distribution': distribution
+    }
@@ -1,12 +1,32 @@
-from django.test import TestCase
+import csv
+import json
+from collections import Counter
+from io import StringIO
+from unittest.mock import patch
+from datetime import timedelta
+from django.db import connection, transaction
+from django.db.models import Q, Sum
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.core.cache import cache
+from django.utils import timezone
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from rest_framework.test import APITestCase
 from rest_framework import status
+from apps.core.choices import SEHIR
+from apps.core.models import NumberSequence
 from apps.volunteers.models import Volunteer
-from .models import Kargo
-from .serializers import KargoSerializer, KargoCreateSerializer
+from .models import Kargo, KargoDailyRollup, KargoDurumGecmisi, KARGO_NO_SEQUENCE
+from .serializers import KargoSerializer, KargoCreateSerializer, KargoFlatSerializer
 from .utils import KargoStats, KargoUtils
+from .filters import KargoFilter
+from .stats import get_general_stats, get_time_series
+from .rollups import rebuild_rollups, refresh_buckets, rollup_key
+from . import events, matching, routing
+from .assignments import open_workloads
 
 
 class KargoModelTest(TestCase):
@@ -474,3 +494,1584 @@ class KargoFiltersTest(TestCase):
         
         # Tüm kayıtları döndürmeli
         self.assertEqual(filtered_qs.count(), 2)
+
+
+class CargoTestMixin:
+    """Toplama gönüllüsü zorunlu olduğundan ortak test verisi yardımcıları"""
+    
+    def _create_volunteer(self, username='seqtest', gonullu_tipi='toplama', sehir='istanbul', **kwargs):
+        user = User.objects.create_user(
+            username=username,
+            email=f'{username}@example.com',
+            password='testpass123'
+        )
+        data = {
+            'ad': 'Test',
+            'soyad': 'Gönüllü',
+            'telefon': '5551234567',
+        }
+        data.update(kwargs)
+        return Volunteer.objects.create(
+            user=user,
+            sehir=sehir,
+            gonullu_tipi=gonullu_tipi,
+            **data
+        )
+    
+    def _create_kargo(self, **kwargs):
+        data = {
+            'anonim_gonderici': True,
+            'cikis_yeri': 'istanbul',
+            'ulasacagi_yer': 'ankara',
+            'agirlik': 5.0,
+            'hacim': 0.1,
+            'miktar': 1,
+            'kargo_tipi': 'gida',
+            'icerik': 'Su (5L, 10L, 19L)',
+            'toplama_gonullusu': self.volunteer,
+        }
+        data.update(kwargs)
+        return Kargo.objects.create(**data)
+    
+    def _create_admin(self, username='admin'):
+        return User.objects.create_user(
+            username=username,
+            email=f'{username}@example.com',
+            password='testpass123',
+            is_staff=True
+        )
+
+
+class KargoNumberSequenceTest(CargoTestMixin, TransactionTestCase):
+    """Kargo numarası serisi testleri (havuz sadece transaction dışında dolar)"""
+    
+    def setUp(self):
+        """Test için gerekli veriler"""
+        KARGO_NO_SEQUENCE.reset()
+        self.volunteer = self._create_volunteer()
+    
+    def tearDown(self):
+        KARGO_NO_SEQUENCE.reset()
+    
+    def test_sequential_numbers(self):
+        """Numaralar sıralı ve benzersiz verilir"""
+        numbers = [self._create_kargo().kargo_no for _ in range(3)]
+        self.assertEqual(numbers, ['AYK000000000', 'AYK000000001', 'AYK000000002'])
+    
+    def test_seeded_from_existing_data(self):
+        """Sayaç ilk kullanımda mevcut en büyük numaradan başlar"""
+        self._create_kargo(kargo_no='AYK000000041')
+        self.assertEqual(self._create_kargo().kargo_no, 'AYK000000042')
+    
+    def test_block_reservation(self):
+        """Numaralar blok halinde rezerve edilir, her kayıtta sayaç güncellenmez"""
+        self._create_kargo()
+        counter = NumberSequence.objects.get(name='kargo_no')
+        self.assertEqual(counter.last_value, KARGO_NO_SEQUENCE.block_size - 1)
+        
+        self._create_kargo()
+        counter.refresh_from_db()
+        self.assertEqual(counter.last_value, KARGO_NO_SEQUENCE.block_size - 1)
+    
+    def test_no_block_pooled_inside_transaction(self):
+        """Dış transaction içinde sayaçtan sadece gereken numara alınır, havuz doldurulmaz"""
+        with transaction.atomic():
+            numbers = [self._create_kargo().kargo_no for _ in range(2)]
+            self.assertEqual(NumberSequence.objects.get(name='kargo_no').last_value, 1)
+        
+        self.assertEqual(numbers, ['AYK000000000', 'AYK000000001'])
+    
+    def test_rolled_back_reservation_not_reused(self):
+        """Dış transaction geri alınınca sayaçla birlikte havuz da tutarlı kalır"""
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self._create_kargo()
+                raise RuntimeError
+        
+        self.assertEqual(self._create_kargo().kargo_no, 'AYK000000000')
+        self.assertEqual(
+            NumberSequence.objects.get(name='kargo_no').last_value, KARGO_NO_SEQUENCE.block_size - 1
+        )
+    
+    def test_collision_retry(self):
+        """Seri gerideyse çakışmada sayaç hizalanır ve yeni numara alınır"""
+        self._create_kargo()  # AYK000000000, havuzda 1..19 kalır
+        self._create_kargo(kargo_no='AYK000000100')
+        self._create_kargo(kargo_no='AYK000000001')
+        
+        kargo = self._create_kargo()
+        self.assertEqual(kargo.kargo_no, 'AYK000000101')
+    
+    def test_bulk_allocate(self):
+        """Toplu rezervasyon ardışık numara aralığı döndürür"""
+        numbers = KARGO_NO_SEQUENCE.allocate(5)
+        self.assertEqual(numbers, [f'AYK00000000{i}' for i in range(5)])
+        self.assertEqual(self._create_kargo().kargo_no, 'AYK000000005')
+    
+    def test_reseed_command(self):
+        """reseed_sequences komutu sayacı mevcut veriye hizalar"""
+        self._create_kargo(kargo_no='AYK000000500')
+        call_command('reseed_sequences', 'kargo_no', stdout=StringIO())
+        
+        self.assertEqual(NumberSequence.objects.get(name='kargo_no').last_value, 500)
+        self.assertEqual(self._create_kargo().kargo_no, 'AYK000000501')
+
+
+class KargoStatisticsQueryTest(CargoTestMixin, APITestCase):
+    """Tek sorguluk istatistik testleri"""
+    
+    def setUp(self):
+        self.volunteer = self._create_volunteer()
+        self.admin = self._create_admin()
+        for i, (durum, tip) in enumerate([
+            ('hazirlaniyor', 'gida'), ('yolda', 'gida'), ('yolda', 'ilac'), ('teslim_edildi', 'giyim')
+        ]):
+            self._create_kargo(
+                durum=durum,
+                kargo_tipi=tip,
+                anonim_gonderici=i % 2 == 0,
+                gonderici_ad='Ali', gonderici_soyad='Veli', gonderici_telefon='5551112233'
+            )
+    
+    def test_general_stats_single_query(self):
+        """Genel istatistikler tek sorguda hesaplanır"""
+        with self.assertNumQueries(1):
+            stats = get_general_stats()
+        
+        self.assertEqual(stats['toplam_kargo'], 4)
+        self.assertEqual(stats['anonim_gonderici'], 2)
+        self.assertEqual(stats['gonderici_bilgili'], 2)
+        self.assertEqual(stats['durum_yolda'], {'count': 2, 'percentage': 50.0, 'name': 'Yolda'})
+        self.assertEqual(stats['tip_gida']['count'], 2)
+        self.assertEqual(stats['tip_diger'], {'count': 0, 'percentage': 0, 'name': 'Diğer'})
+    
+    def test_statistics_endpoint(self):
+        """statistics endpoint aynı yanıt yapısını döndürür"""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get('/api/v1/kargo/statistics/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data'], KargoStats.get_general_stats())
+    
+    def test_statistics_empty(self):
+        """Kargo yokken tüm sayılar sıfırdır"""
+        Kargo.objects.all().delete()
+        stats = get_general_stats()
+        
+        self.assertEqual(stats['toplam_kargo'], 0)
+        self.assertEqual(stats['durum_iptal_edildi'], {'count': 0, 'percentage': 0, 'name': 'İptal Edildi'})
+
+
+class KargoTimeSeriesTest(CargoTestMixin, APITestCase):
+    """Zaman serisi istatistik testleri"""
+    
+    def setUp(self):
+        self.volunteer = self._create_volunteer()
+        self.admin = self._create_admin()
+        now = timezone.now()
+        for days_ago in [0, 0, 2, 40]:
+            kargo = self._create_kargo()
+            Kargo.objects.filter(pk=kargo.pk).update(olusturulma_tarihi=now - timedelta(days=days_ago))
+        # update() sinyal tetiklemez, özet tablosunu yeniden kur
+        rebuild_rollups()
+    
+    def test_daily_series_single_query(self):
+        """Günlük seri tek sorguyla üretilir, boş günler sıfırla doldurulur"""
+        with self.assertNumQueries(1):
+            data = get_time_series(days=7)
+        
+        distribution = data['daily_distribution']
+        self.assertEqual(len(distribution), 8)
+        self.assertEqual(distribution[-1]['count'], 2)
+        self.assertEqual(distribution[-3]['count'], 1)
+        self.assertEqual(distribution[0]['count'], 0)
+        self.assertEqual(data['total_in_period'], 3)
+    
+    def test_monthly_series(self):
+        """Aylık çözünürlük tüm dönemi kapsar"""
+        data = get_time_series(days=60, granularity='month')
+        
+        self.assertEqual(data['total_in_period'], 4)
+        self.assertEqual(sum(item['count'] for item in data['daily_distribution']), 4)
+        self.assertTrue(all(len(item['date']) == 7 for item in data['daily_distribution']))
+    
+    def test_window_limit(self):
+        """Pencere sınırı aşılırsa 400 döner"""
+        self.client.force_authenticate(user=self.admin)
+        
+        response = self.client.get('/api/v1/kargo/time-based-stats/?days=100000')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        response = self.client.get('/api/v1/kargo/time-based-stats/?days=30&granularity=week')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['total_in_period'], 3)
+
+
+class KargoDailyRollupTest(CargoTestMixin, APITestCase):
+    """Günlük özet tablosu testleri"""
+    
+    def setUp(self):
+        self.volunteer = self._create_volunteer()
+        self.admin = self._create_admin()
+        self.kargo1 = self._create_kargo(agirlik=10.0, hacim=0.5, miktar=2)
+        self.kargo2 = self._create_kargo(agirlik=4.0, hacim=0.25, miktar=1, cikis_yeri='izmir')
+    
+    def _rollup_snapshot(self):
+        return sorted(
+            KargoDailyRollup.objects.values_list(
+                'tarih', 'cikis_yeri', 'ulasacagi_yer', 'kargo_tipi', 'durum',
+                'kargo_sayisi', 'anonim_sayisi', 'toplam_agirlik', 'toplam_miktar'
+            )
+        )
+    
+    def test_rollup_maintained_on_save(self):
+        """Kayıt ve durum değişikliği özet satırlarını günceller"""
+        self.assertEqual(KargoDailyRollup.objects.get(cikis_yeri='istanbul').kargo_sayisi, 1)
+        
+        self.kargo1.durum = 'yolda'
+        self.kargo1.save()
+        
+        self.assertFalse(KargoDailyRollup.objects.filter(cikis_yeri='istanbul', durum='hazirlaniyor').exists())
+        rollup = KargoDailyRollup.objects.get(cikis_yeri='istanbul', durum='yolda')
+        self.assertEqual(rollup.kargo_sayisi, 1)
+        self.assertEqual(float(rollup.toplam_agirlik), 10.0)
+    
+    def test_rollup_maintained_on_delete(self):
+        """Silinen kargo özetten düşer"""
+        self.kargo2.delete()
+        self.assertFalse(KargoDailyRollup.objects.filter(cikis_yeri='izmir').exists())
+    
+    def test_bulk_update_refreshes_rollup(self):
+        """Toplu durum geçişi etkilenen kovaları tazeler"""
+        from .transitions import transition_status
+        transition_status(Kargo.objects.all(), 'teslim_edildi')
+        
+        self.assertEqual(
+            set(KargoDailyRollup.objects.values_list('durum', flat=True)),
+            {'teslim_edildi'}
+        )
+    
+    def test_refresh_recomputes_locked_bucket(self):
+        """Kova her tazelemede ham veriden hesaplanır; eski değer üzerine yazılır, boş kova kalmaz"""
+        key = rollup_key(self.kargo1)
+        KargoDailyRollup.objects.filter(**key._asdict()).update(kargo_sayisi=99)
+        empty_key = key._replace(cikis_yeri='van')
+        
+        refresh_buckets({key, empty_key})
+        
+        self.assertEqual(KargoDailyRollup.objects.get(**key._asdict()).kargo_sayisi, 1)
+        self.assertFalse(KargoDailyRollup.objects.filter(**empty_key._asdict()).exists())
+    
+    def test_rebuild_matches_incremental(self):
+        """rebuild_cargo_rollups komutu artımlı bakımla aynı sonucu üretir"""
+        before = self._rollup_snapshot()
+        call_command('rebuild_cargo_rollups', stdout=StringIO())
+        self.assertEqual(self._rollup_snapshot(), before)
+    
+    def test_weight_volume_stats_from_rollup(self):
+        """Ağırlık/hacim istatistikleri özet tablosundan okunur"""
+        self.client.force_authenticate(user=self.admin)
+        with self.assertNumQueries(1):
+            stats = KargoStats.get_weight_volume_stats()
+        
+        self.assertEqual(stats['toplam_agirlik'], 14.0)
+        self.assertEqual(stats['ortalama_agirlik'], 7.0)
+        self.assertEqual(stats['min_agirlik'], 4.0)
+        self.assertEqual(stats['max_agirlik'], 10.0)
+        self.assertEqual(stats['toplam_miktar'], 3)
+        self.assertEqual(stats['ortalama_miktar'], 1.5)
+        
+        response = self.client.get('/api/v1/kargo/weight-volume-stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_city_stats_from_rollup(self):
+        """Şehir istatistikleri özet tablosundan okunur"""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get('/api/v1/kargo/city-stats/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        origins = {item['cikis_yeri']: item['count'] for item in response.data['data']['top_origins']}
+        self.assertEqual(origins, {'istanbul': 1, 'izmir': 1})
+        self.assertEqual(response.data['data']['top_destinations'][0]['count'], 2)
+        names = {item['cikis_yeri']: item['display_name'] for item in response.data['data']['top_origins']}
+        self.assertEqual(names, {'istanbul': 'İstanbul', 'izmir': 'İzmir'})
+
+
+class KargoTrackingCacheTest(CargoTestMixin, APITestCase):
+    """Kargo takip önbelleği testleri"""
+    
+    def setUp(self):
+        cache.clear()
+        self.volunteer = self._create_volunteer()
+        self.kargo = self._create_kargo()
+        self.url = f'/api/v1/kargo/track/?kargo_no={self.kargo.kargo_no}'
+    
+    def tearDown(self):
+        cache.clear()
+    
+    def test_tracking_served_from_cache(self):
+        """İkinci takip isteği veritabanına gitmez"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(self.url)
+        self.assertEqual(cached_response.data, response.data)
+    
+    def test_status_change_invalidates_cache(self):
+        """Durum değişikliği takip önbelleğini temizler"""
+        self.client.get(self.url)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.kargo.durum = 'yolda'
+            self.kargo.save()
+        
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['data']['durum'], 'yolda')
+    
+    def test_cache_invalidated_after_commit(self):
+        """Önbellek commit'ten önce değil, sonra temizlenir"""
+        self.client.get(self.url)
+        
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.kargo.durum = 'yolda'
+            self.kargo.save()
+            # Commit öncesi önbellekteki kayıt yerinde kalır
+            with self.assertNumQueries(0):
+                self.client.get(self.url)
+        
+        for callback in callbacks:
+            callback()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['data']['durum'], 'yolda')
+    
+    def test_negative_cache(self):
+        """Bilinmeyen numara negatif önbelleğe alınır, kargo oluşunca temizlenir"""
+        url = '/api/v1/kargo/track/?kargo_no=AYK000000777'
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_kargo(kargo_no='AYK000000777')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+    
+    def test_admin_action_invalidates_cache(self):
+        """Admin toplu işlemi takip önbelleğini temizler"""
+        self.client.get(self.url)
+        
+        admin_user = User.objects.create_superuser('superadmin', 'super@example.com', 'testpass123')
+        self.client.force_login(admin_user)
+        self.client.post('/admin/cargo/kargo/', {
+            'action': 'mark_as_yolda',
+            '_selected_action': [self.kargo.pk],
+        })
+        self.client.logout()
+        
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['data']['durum'], 'yolda')
+
+
+class KargoConditionalGetTest(CargoTestMixin, APITestCase):
+    """ETag / Last-Modified ile koşullu GET testleri"""
+    
+    def setUp(self):
+        cache.clear()
+        self.volunteer = self._create_volunteer()
+        self.kargo = self._create_kargo()
+        self.track_url = f'/api/v1/kargo/track/?kargo_no={self.kargo.kargo_no}'
+        self.detail_url = f'/api/v1/kargo/{self.kargo.pk}/'
+    
+    def tearDown(self):
+        cache.clear()
+    
+    def test_tracking_not_modified(self):
+        """Aynı ETag ile takip isteği 304 döner, değişiklikten sonra 200"""
+        response = self.client.get(self.track_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', response)
+        etag = response['ETag']
+        
+        response = self.client.get(self.track_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.kargo.durum = 'yolda'
+            self.kargo.save()
+        
+        response = self.client.get(self.track_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+    
+    def test_tracking_etag_same_for_cache_and_database(self):
+        """Önbellekten ve veritabanından gelen yanıtın ETag'i aynıdır"""
+        first = self.client.get(self.track_url)
+        second = self.client.get(self.track_url)
+        self.assertEqual(first['ETag'], second['ETag'])
+    
+    def test_detail_not_modified_skips_full_fetch(self):
+        """Detay 304 yanıtı sadece doğrulayıcı sorgusunu çalıştırır"""
+        self.client.force_authenticate(user=self._create_admin())
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_detail_if_modified_since(self):
+        """If-Modified-Since son değişiklikten sonraysa 304 döner"""
+        self.client.force_authenticate(user=self._create_admin())
+        response = self.client.get(self.detail_url)
+        
+        response = self.client.get(
+            self.detail_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_list_validator_changes_on_create_and_delete(self):
+        """Liste ETag'i yeni kayıt ve silme ile değişir"""
+        self.client.force_authenticate(user=self._create_admin())
+        etag = self.client.get('/api/v1/kargo/')['ETag']
+        
+        response = self.client.get('/api/v1/kargo/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        other = self._create_kargo()
+        response = self.client.get('/api/v1/kargo/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        etag = response['ETag']
+        other.delete()
+        response = self.client.get('/api/v1/kargo/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_list_etag_depends_on_filters(self):
+        """Farklı filtreler farklı ETag üretir"""
+        self.client.force_authenticate(user=self._create_admin())
+        first = self.client.get('/api/v1/kargo/')
+        second = self.client.get('/api/v1/kargo/?durum=yolda')
+        self.assertNotEqual(first['ETag'], second['ETag'])
+
+
+class KargoBatchTrackingTest(CargoTestMixin, APITestCase):
+    """Toplu kargo takibi testleri"""
+    
+    url = '/api/v1/kargo/track/batch/'
+    
+    def setUp(self):
+        cache.clear()
+        self.volunteer = self._create_volunteer()
+        self.kargos = [self._create_kargo() for _ in range(3)]
+    
+    def tearDown(self):
+        cache.clear()
+    
+    def test_batch_tracking_single_query(self):
+        """Tüm numaralar tek sorguyla (+ geçmiş prefetch) getirilir, sıra korunur"""
+        kargo_nos = [kargo.kargo_no for kargo in reversed(self.kargos)]
+        with self.assertNumQueries(2):
+            response = self.client.post(self.url, {'kargo_nos': kargo_nos}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        results = response.data['data']['results']
+        self.assertEqual([result['kargo_no'] for result in results], kargo_nos)
+        self.assertTrue(all(result['found'] for result in results))
+        self.assertEqual(response.data['data']['found'], 3)
+        
+        # Tekil takip ile aynı veri yapısı
+        single = self.client.get(f'/api/v1/kargo/track/?kargo_no={kargo_nos[0]}')
+        self.assertEqual(results[0]['data'], single.data['data'])
+    
+    def test_batch_tracking_uses_cache(self):
+        """Önbellekteki numaralar için veritabanına gidilmez"""
+        kargo_nos = [kargo.kargo_no for kargo in self.kargos]
+        self.client.post(self.url, {'kargo_nos': kargo_nos}, format='json')
+        
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url, {'kargo_nos': kargo_nos}, format='json')
+        self.assertEqual(response.data['data']['found'], 3)
+    
+    def test_not_found_and_invalid_entries(self):
+        """Bulunamayan ve geçersiz numaralar kendi hata kodlarıyla döner"""
+        response = self.client.post(self.url, {
+            'kargo_nos': [self.kargos[0].kargo_no, 'AYK999999999', 'XYZ', self.kargos[0].kargo_no]
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        results = response.data['data']['results']
+        self.assertEqual(len(results), 3)
+        self.assertTrue(results[0]['found'])
+        self.assertEqual(results[1]['code'], 'CARGO_NOT_FOUND')
+        self.assertEqual(results[2]['code'], 'INVALID_CARGO_FORMAT')
+    
+    def test_batch_limits(self):
+        """Boş istek ve limit aşımı reddedilir"""
+        response = self.client.post(self.url, {'kargo_nos': []}, format='json')
+        self.assertEqual(response.data['code'], 'MISSING_CARGO_NUMBERS')
+        
+        with self.settings(CARGO_TRACKING_BATCH_LIMIT=2):
+            response = self.client.post(self.url, {
+                'kargo_nos': [kargo.kargo_no for kargo in self.kargos]
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['code'], 'BATCH_LIMIT_EXCEEDED')
+
+
+class KargoChangeTrackingTest(CargoTestMixin, TestCase):
+    """from_db anlık görüntüsüyle değişiklik takibi testleri"""
+    
+    def setUp(self):
+        self.volunteer = self._create_volunteer()
+        self.kargo = self._create_kargo()
+    
+    def _save_queries(self, kargo):
+        with CaptureQueriesContext(connection) as context:
+            kargo.save()
+        return len(context.captured_queries)
+    
+    def test_update_does_not_reread_row(self):
+        """Yüklenmiş kayıt güncellenirken satır yeniden okunmaz"""
+        kargo = Kargo.objects.get(pk=self.kargo.pk)
+        kargo.durum = 'yolda'
+        with_snapshot = self._save_queries(kargo)
+        
+        kargo = Kargo.objects.get(pk=self.kargo.pk)
+        del kargo._loaded_values
+        kargo.durum = 'teslim_edildi'
+        without_snapshot = self._save_queries(kargo)
+        
+        self.assertEqual(with_snapshot, without_snapshot - 1)
+    
+    def test_status_and_anonymity_transitions_logged(self):
+        """Durum ve anonimlik geçişleri yakalanır ve loglanır"""
+        kargo = Kargo.objects.get(pk=self.kargo.pk)
+        kargo.durum = 'yolda'
+        kargo.anonim_gonderici = False
+        kargo.gonderici_ad = 'Test'
+        
+        with self.assertLogs('apps.cargo.signals', level='INFO') as logs:
+            kargo.save()
+        
+        self.assertEqual(kargo._old_durum, 'hazirlaniyor')
+        self.assertTrue(kargo._old_anonim_gonderici)
+        output = '\n'.join(logs.output)
+        self.assertIn('durumu değişti: hazirlaniyor -> yolda', output)
+        self.assertIn('gönderici durumu değişti: gönderici bilgili', output)
+    
+    def test_snapshot_refreshed_after_save(self):
+        """Aynı örnek ikinci kez kaydedilirken önceki kayıt eski değer kabul edilir"""
+        kargo = Kargo.objects.get(pk=self.kargo.pk)
+        kargo.durum = 'yolda'
+        kargo.save()
+        kargo.durum = 'teslim_edildi'
+        kargo.save()
+        self.assertEqual(kargo._old_durum, 'yolda')
+    
+    def test_deferred_fields_loaded_on_demand(self):
+        """Ertelenmiş takip alanları sadece eksik olanlar için okunur"""
+        kargo = Kargo.objects.only('id', 'kargo_no', 'durum').get(pk=self.kargo.pk)
+        kargo.durum = 'yolda'
+        kargo.save()
+        
+        self.assertEqual(kargo._old_durum, 'hazirlaniyor')
+        self.assertEqual(KargoDailyRollup.objects.get().durum, 'yolda')
+
+
+class KargoDurumGecmisiTest(CargoTestMixin, APITestCase):
+    """Kargo durum geçmişi testleri"""
+    
+    def setUp(self):
+        cache.clear()
+        self.volunteer = self._create_volunteer()
+        self.kargo = self._create_kargo()
+    
+    def tearDown(self):
+        cache.clear()
+    
+    def test_history_written_on_create_and_status_change(self):
+        """Oluşturma ve her durum geçişi geçmişe yazılır"""
+        self.kargo.durum = 'yolda'
+        self.kargo.save()
+        self.kargo.icerik = 'Kuru Gıda Paketi'
+        self.kargo.save()
+        
+        history = list(self.kargo.durum_gecmisi.values_list('eski_durum', 'yeni_durum'))
+        self.assertEqual(history, [(None, 'hazirlaniyor'), ('hazirlaniyor', 'yolda')])
+    
+    def test_history_rolled_back_with_status_change(self):
+        """Kayıt geri alınırsa geçmiş satırı da geri alınır"""
+        try:
+            with transaction.atomic():
+                self.kargo.durum = 'yolda'
+                self.kargo.save()
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(self.kargo.durum_gecmisi.count(), 1)
+    
+    def test_tracking_timeline(self):
+        """Takip yanıtı zaman çizelgesini içerir"""
+        self.kargo.durum = 'yolda'
+        self.kargo.save()
+        
+        response = self.client.get(f'/api/v1/kargo/track/?kargo_no={self.kargo.kargo_no}')
+        timeline = response.data['data']['durum_gecmisi']
+        self.assertEqual([item['yeni_durum'] for item in timeline], ['hazirlaniyor', 'yolda'])
+        self.assertEqual(timeline[1]['yeni_durum_display'], 'Yolda')
+    
+    def test_admin_action_single_bulk_insert(self):
+        """Admin toplu işlemi geçmişi tek INSERT ile yazar, durumu değişmeyenleri atlar"""
+        kargos = [self._create_kargo() for _ in range(4)]
+        kargos[0].durum = 'yolda'
+        kargos[0].save()
+        
+        admin_user = User.objects.create_superuser('superadmin', 'super@example.com', 'testpass123')
+        self.client.force_login(admin_user)
+        with CaptureQueriesContext(connection) as context:
+            self.client.post('/admin/cargo/kargo/', {
+                'action': 'mark_as_yolda',
+                '_selected_action': [kargo.pk for kargo in kargos],
+            })
+        
+        inserts = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('INSERT INTO "kargo_durum_gecmisi"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            KargoDurumGecmisi.objects.filter(eski_durum='hazirlaniyor', yeni_durum='yolda').count(),
+            4
+        )
+
+
+class KargoIndexBenchmarkTest(CargoTestMixin, TestCase):
+    """Index migration'ı ve benchmark komutu testleri"""
+    
+    def test_access_path_indexes_exist(self):
+        """Liste/filtre index'leri veritabanında oluşturulmuş"""
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Kargo._meta.db_table)
+        for name in ['kargo_durum_olusturulma_idx', 'kargo_rota_olusturulma_idx', 'kargo_toplama_olusturulma_idx']:
+            self.assertIn(name, constraints)
+        # Bileşik gönüllü index'leri FK kolonlarının tek başına index'lerini gereksiz kılar
+        single_column = [
+            constraint['columns'] for constraint in constraints.values()
+            if constraint['index'] and not constraint['unique']
+        ]
+        for column in ('toplama_gonullusu_id', 'tasima_gonullusu_id', 'dagitim_gonullusu_id'):
+            self.assertNotIn([column], single_column)
+    
+    def test_benchmark_command_compare(self):
+        """Benchmark komutu veri üretir, index'siz ölçüm sonrası index'ler geri gelir"""
+        self.volunteer = self._create_volunteer()
+        out = StringIO()
+        call_command(
+            'benchmark_cargo_queries', seed=30, batch_size=10, iterations=2,
+            compare=True, force=True, stdout=out
+        )
+        
+        self.assertEqual(Kargo.objects.count(), 30)
+        self.assertEqual(KargoDailyRollup.objects.aggregate(total=Sum('kargo_sayisi'))['total'], 30)
+        self.assertIn('Without indexes', out.getvalue())
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Kargo._meta.db_table)
+        self.assertIn('kargo_durum_olusturulma_idx', constraints)
+    
+    def test_seed_requires_debug_or_force(self):
+        """DEBUG kapalıyken --force olmadan veri üretilmez"""
+        with self.assertRaises(CommandError):
+            call_command('benchmark_cargo_queries', seed=10, stdout=StringIO())
+
+
+class KargoSearchFilterTest(CargoTestMixin, TestCase):
+    """Gönüllü/gönderici arama filtreleri testleri"""
+    
+    def setUp(self):
+        self.volunteer = self._create_volunteer(ad='Gülşen', soyad='Arslan')
+        self.carrier = self._create_volunteer(username='carrier', gonullu_tipi='tasima', ad='Mehmet', soyad='Kaya')
+        self.assigned = self._create_kargo(tasima_gonullusu=self.carrier)
+        self.other = self._create_kargo(
+            anonim_gonderici=False, gonderici_ad='Zeynep', gonderici_soyad='Demir',
+            gonderici_email='zeynep@example.com'
+        )
+    
+    def _filter(self, **params):
+        return set(KargoFilter(params, queryset=Kargo.objects.all()).qs)
+    
+    def test_volunteer_name_search(self):
+        """Ad/soyad araması herhangi bir görevdeki gönüllüyle eşleşir"""
+        self.assertEqual(self._filter(gonullu_search='kaya'), {self.assigned})
+        self.assertEqual(self._filter(gonullu_search='arsla'), {self.assigned, self.other})
+    
+    def test_name_starting_with_g_is_not_number_search(self):
+        """G ile başlayan isimler numara olarak aranmaz"""
+        self.assertEqual(self._filter(gonullu_search='Gülşen'), {self.assigned, self.other})
+    
+    def test_volunteer_number_exact_and_prefix(self):
+        """Gönüllülük numarası tam ve önek aramasıyla bulunur"""
+        self.assertEqual(self._filter(gonullu_search=self.carrier.gonulluluk_no.lower()), {self.assigned})
+        prefix = self.carrier.gonulluluk_no[:3]
+        self.assertEqual(self._filter(gonullu_search=prefix), {self.assigned, self.other})
+    
+    def test_volunteer_search_uses_id_subquery(self):
+        """Gönüllü ID'leri önceden çözülür; kargolar rol başına UNION dallarıyla süzülür"""
+        queryset = KargoFilter({'gonullu_search': 'kaya'}, queryset=Kargo.objects.all()).qs
+        sql = str(queryset.query)
+        self.assertNotIn('JOIN', sql)
+        self.assertIn('IN (SELECT', sql)
+        self.assertEqual(sql.count('UNION'), 2)
+        self.assertIn(f'"tasima_gonullusu_id" IN ({self.carrier.pk})', sql)
+    
+    def test_volunteer_search_without_match(self):
+        """Eşleşen gönüllü yoksa kargo sorgusu çalıştırılmaz"""
+        with self.assertNumQueries(1):
+            self.assertEqual(self._filter(gonullu_search='bulunmayan'), set())
+    
+    def test_list_endpoint_uses_kargo_filter(self):
+        """Liste uç noktası KargoFilter parametrelerini uygular"""
+        self.client.force_login(self._create_admin())
+        response = self.client.get('/api/v1/kargo/', {'gonderici_search': 'zeyn'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['kargo_no'] for item in response.json()['results']], [self.other.kargo_no])
+        response = self.client.get('/api/v1/kargo/', {'gonullu_search': 'kaya'})
+        self.assertEqual([item['kargo_no'] for item in response.json()['results']], [self.assigned.kargo_no])
+    
+    def test_sender_search(self):
+        """Gönderici ad/email araması"""
+        self.assertEqual(self._filter(gonderici_search='zeyn'), {self.other})
+        self.assertEqual(self._filter(gonderici_search='example.com'), {self.other})
+
+
+class KargoCursorPaginationTest(CargoTestMixin, APITestCase):
+    """Kargo listesi keyset (cursor) sayfalama testleri"""
+    
+    def setUp(self):
+        self.volunteer = self._create_volunteer()
+        self.client.force_authenticate(user=self._create_admin())
+        self.kargos = [self._create_kargo(kargo_tipi='ilac' if i % 2 else 'gida') for i in range(7)]
+        # Aynı zaman damgasına sahip kargolar id ile sıralanmalı
+        same_time = timezone.now() - timedelta(hours=1)
+        Kargo.objects.filter(pk__in=[k.pk for k in self.kargos[2:5]]).update(olusturulma_tarihi=same_time)
+    
+    def _expected_order(self, queryset=None):
+        queryset = queryset if queryset is not None else Kargo.objects.all()
+        return list(queryset.order_by('-olusturulma_tarihi', '-id').values_list('kargo_no', flat=True))
+    
+    def _walk(self, url):
+        seen = []
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            seen.extend(item['kargo_no'] for item in response.data['results'])
+            url = response.data['next']
+            pages += 1
+        return seen, pages
+    
+    def test_cursor_walk_covers_all_rows_in_order(self):
+        """Tüm sayfalar gezildiğinde her kargo bir kez, doğru sırada gelir"""
+        seen, pages = self._walk('/api/v1/kargo/?cursor=&page_size=2')
+        self.assertEqual(seen, self._expected_order())
+        self.assertEqual(pages, 4)
+    
+    def test_cursor_mode_has_no_count_query(self):
+        """Cursor modunda COUNT sorgusu çalışmaz"""
+        with CaptureQueriesContext(connection) as context:
+            self.client.get('/api/v1/kargo/?cursor=&page_size=3')
+        self.assertFalse(any('COUNT(' in query['sql'] for query in context.captured_queries))
+    
+    def test_cursor_with_filters_and_search(self):
+        """Cursor modu filtre ve arama ile birlikte çalışır"""
+        seen, _ = self._walk('/api/v1/kargo/?cursor=&page_size=2&kargo_tipi=ilac')
+        self.assertEqual(seen, self._expected_order(Kargo.objects.filter(kargo_tipi='ilac')))
+        
+        kargo_no = self.kargos[3].kargo_no
+        seen, _ = self._walk(f'/api/v1/kargo/?cursor=&search={kargo_no}')
+        self.assertEqual(seen, [kargo_no])
+    
+    def test_previous_link(self):
+        """Önceki sayfa bağlantısı bir önceki sayfayı döndürür"""
+        first = self.client.get('/api/v1/kargo/?cursor=&page_size=3')
+        self.assertIsNone(first.data['previous'])
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [item['kargo_no'] for item in back.data['results']],
+            [item['kargo_no'] for item in first.data['results']]
+        )
+    
+    def test_invalid_cursor(self):
+        """Bozuk cursor 404 döner"""
+        response = self.client.get('/api/v1/kargo/?cursor=bozuk')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_page_number_mode_unchanged(self):
+        """Cursor verilmezse sayfa numaralı yanıt (count ile) döner"""
+        response = self.client.get('/api/v1/kargo/')
+        self.assertEqual(response.data['count'], 7)
+
+
+class KargoExportTest(CargoTestMixin, APITestCase):
+    """Kargo CSV/NDJSON dışa aktarım testleri"""
+    
+    url = '/api/v1/kargo/export/'
+    
+    def setUp(self):
+        self.volunteer = self._create_volunteer()
+        self.client.force_authenticate(user=self._create_admin())
+        self.gida = [self._create_kargo() for _ in range(3)]
+        self.ilac = self._create_kargo(kargo_tipi='ilac', icerik='Termometre')
+    
+    def _content(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+    
+    def test_csv_export_with_filter(self):
+        """CSV dışa aktarımı filtreleri uygular ve görünen adları yazar"""
+        response = self.client.get(self.url, {'kargo_tipi': 'gida'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('attachment', response['Content-Disposition'])
+        
+        rows = list(csv.reader(StringIO(self._content(response).lstrip('\ufeff'))))
+        self.assertEqual(rows[0][0], 'Kargo No')
+        self.assertEqual(len(rows), 4)
+        self.assertEqual({row[0] for row in rows[1:]}, {kargo.kargo_no for kargo in self.gida})
+        self.assertEqual(rows[1][1], 'Hazırlanıyor')
+        self.assertEqual(rows[1][14], self.volunteer.gonulluluk_no)
+    
+    def test_ndjson_export(self):
+        """NDJSON dışa aktarımı her satırda bir JSON nesnesi üretir"""
+        response = self.client.get(self.url, {'file_format': 'ndjson', 'gonullu_search': self.volunteer.ad})
+        lines = self._content(response).splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(json.loads(lines[0])['toplama_gonullusu'], self.volunteer.gonulluluk_no)
+    
+    def test_export_builds_no_model_instances(self):
+        """Dışa aktarım model örneği oluşturmaz"""
+        with patch.object(Kargo, 'from_db', side_effect=AssertionError('model instance built')):
+            response = self.client.get(self.url)
+            self.assertEqual(len(self._content(response).splitlines()), 5)
+    
+    def test_invalid_format_and_filter(self):
+        """Geçersiz format ve filtre 400 döner"""
+        response = self.client.get(self.url, {'file_format': 'xlsx'})
+        self.assertEqual(response.data['code'], 'INVALID_FORMAT')
+        response = self.client.get(self.url, {'agirlik_min': 'abc'})
+        self.assertEqual(response.data['code'], 'INVALID_FILTER')
+    
+    def test_admin_export_action(self):
+        """Admin dışa aktarım işlemi seçili kargoları akış halinde döndürür"""
+        admin_user = User.objects.create_superuser('superadmin', 'super@example.com', 'testpass123')
+        self.client.force_login(admin_user)
+        response = self.client.post('/admin/cargo/kargo/', {
+            'action': 'export_as_csv',
+            '_selected_action': [self.ilac.pk],
+        })
+        content = self._content(response)
+        self.assertIn(self.ilac.kargo_no, content)
+        self.assertEqual(len(content.splitlines()), 2)
+    
+    async def test_export_streams_under_asgi(self):
+        """ASGI altında dışa aktarım tamamı belleğe alınmadan parça parça akar"""
+        from asgiref.sync import sync_to_async
+        admin_user = await sync_to_async(User.objects.get)(username='admin')
+        await self.async_client.aforce_login(admin_user)
+        
+        with patch('apps.cargo.export.EXPORT_CHUNK_SIZE', 2):
+            response = await self.async_client.get(self.url, {'file_format': 'ndjson'})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+        
+        # 4 satır, 2'şerli parçalar halinde
+        self.assertEqual([len(chunk.splitlines()) for chunk in chunks], [2, 2])
+        lines = b''.join(chunks).decode('utf-8').splitlines()
+        self.assertEqual(
+            {json.loads(line)['kargo_no'] for line in lines},
+            {kargo.kargo_no for kargo in (*self.gida, self.ilac)}
+        )
+
+
+class KargoFlatSerializerTest(CargoTestMixin, APITestCase):
+    """`.values()` tabanlı hızlı liste serializer'ı testleri"""
+    
+    def setUp(self):
+        self.volunteer = self._create_volunteer(ad='Işık', soyad='Şahin')
+        self.tasima = self._create_volunteer(username='tasima', gonullu_tipi='tasima', sehir='hatay')
+        self.client.force_authenticate(user=self._create_admin())
+        self._create_kargo()
+        self._create_kargo(
+            anonim_gonderici=False, gonderici_ad='Ali', gonderici_soyad='Veli',
+            gonderici_telefon='5559876543', agirlik=12.345, hacim=2,
+            durum='yolda', kargo_tipi='ilac', tasima_gonullusu=self.tasima
+        )
+    
+    def _expected(self, queryset):
+        return KargoSerializer(queryset.select_related(
+            'toplama_gonullusu', 'tasima_gonullusu', 'dagitim_gonullusu'
+        ), many=True).data
+    
+    def test_output_matches_kargo_serializer(self):
+        """Hızlı serializer aynı anahtarları aynı sırada ve aynı değerlerle üretir"""
+        queryset = Kargo.objects.order_by('id')
+        flat = KargoFlatSerializer(KargoFlatSerializer.values(queryset), many=True).data
+        expected = self._expected(queryset)
+        self.assertEqual(len(flat), 2)
+        for row, item in zip(flat, expected):
+            self.assertEqual(list(row), list(item))
+            self.assertEqual(row, dict(item))
+    
+    def test_list_endpoint_uses_flat_path(self):
+        """Liste yanıtı KargoSerializer çıktısıyla aynı ve tek SELECT ile okunur"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/kargo/?ordering=agirlik')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = self._expected(Kargo.objects.order_by('agirlik'))
+        self.assertEqual(response.data['results'], [dict(item) for item in expected])
+        # Doğrulayıcı sorgusu + COUNT + sayfa
+        self.assertEqual(len(context.captured_queries), 3)
+    
+    def test_by_volunteer_uses_flat_path(self):
+        """Gönüllü bazlı liste aynı çıktıyı döndürür"""
+        response = self.client.get(f'/api/v1/kargo/by_volunteer/?volunteer_id={self.tasima.id}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = self._expected(Kargo.objects.filter(tasima_gonullusu=self.tasima))
+        self.assertEqual(response.data['data'], [dict(item) for item in expected])
+    
+    def test_cursor_mode_with_flat_rows(self):
+        """Keyset sayfalama values() satırlarıyla çalışır"""
+        first = self.client.get('/api/v1/kargo/?cursor=&page_size=1')
+        second = self.client.get(first.data['next'])
+        self.assertEqual(
+            [first.data['results'][0]['id'], second.data['results'][0]['id']],
+            list(Kargo.objects.order_by('-olusturulma_tarihi', '-id').values_list('id', flat=True))
+        )
+    
+    def test_benchmark_command(self):
+        """Benchmark komutu her sayfa boyutu için satır yazar"""
+        out = StringIO()
+        call_command('benchmark_cargo_serializers', sizes='1,2,5', iterations=1, stdout=out)
+        output = out.getvalue()
+        self.assertIn('Kargo rows: 2', output)
+        self.assertIn('5 skipped', output)
+
+
+class KargoByVolunteerTest(CargoTestMixin, APITestCase):
+    """Gönüllü bazlı kargo listesi (UNION + cursor sayfalama + rol sayıları) testleri"""
+    
+    def setUp(self):
+        self.volunteer = self._create_volunteer(gonullu_tipi='karma')
+        self.other = self._create_volunteer(username='other')
+        self.client.force_authenticate(user=self._create_admin())
+        self.toplama = [self._create_kargo() for _ in range(3)]
+        self.tasima = [
+            self._create_kargo(toplama_gonullusu=self.other, tasima_gonullusu=self.volunteer)
+            for _ in range(2)
+        ]
+        # Aynı kargoda iki rol: listede bir kez görünmeli
+        self.both = self._create_kargo(tasima_gonullusu=self.volunteer, dagitim_gonullusu=self.volunteer)
+        self._create_kargo(toplama_gonullusu=self.other)
+        self.url = f'/api/v1/kargo/by_volunteer/?volunteer_id={self.volunteer.id}'
+    
+    def _walk(self, url):
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(item['kargo_no'] for item in response.data['data'])
+            url = response.data['next']
+        return seen
+    
+    def _expected(self, queryset):
+        return list(queryset.order_by('-olusturulma_tarihi', '-id').values_list('kargo_no', flat=True))
+    
+    def test_pages_cover_all_roles_once(self):
+        """Sayfalar gezildiğinde her kargo bir kez, sıralı gelir"""
+        seen = self._walk(self.url + '&page_size=2')
+        expected = self._expected(Kargo.objects.filter(
+            Q(toplama_gonullusu=self.volunteer) | Q(tasima_gonullusu=self.volunteer) |
+            Q(dagitim_gonullusu=self.volunteer)
+        ))
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(seen), 6)
+    
+    def test_role_counts(self):
+        """Rol bazında sayılar döner"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['counts'], {'toplama': 4, 'tasima': 3, 'dagitim': 1})
+    
+    def test_role_filter(self):
+        """?role= tek role daraltır"""
+        seen = self._walk(self.url + '&role=tasima&page_size=1')
+        self.assertEqual(seen, self._expected(Kargo.objects.filter(tasima_gonullusu=self.volunteer)))
+    
+    def test_query_count_is_constant(self):
+        """Sayfa id'leri, satırlar ve sayılar: üç sorgu"""
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url + '&page_size=2')
+        kargo_queries = [q for q in context.captured_queries if '"kargo"' in q['sql']]
+        self.assertEqual(len(kargo_queries), 3)
+    
+    def test_invalid_parameters(self):
+        """Eksik/geçersiz parametreler 400 döner"""
+        cases = [
+            ('/api/v1/kargo/by_volunteer/', 'MISSING_VOLUNTEER_ID'),
+            ('/api/v1/kargo/by_volunteer/?volunteer_id=abc', 'INVALID_VOLUNTEER_ID'),
+            (self.url + '&role=sofor', 'INVALID_ROLE'),
+            (self.url + '&cursor=bozuk', 'INVALID_CURSOR'),
+        ]
+        for url, code in cases:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, url)
+            self.assertEqual(response.data['code'], code)
+
+
+class KargoBulkCreateTest(CargoTestMixin, APITestCase):
+    """POST /kargo/bulk/ toplu oluşturma testleri"""
+    
+    url = '/api/v1/kargo/bulk/'
+    
+    def setUp(self):
+        self.volunteer = self._create_volunteer()
+        self.tasima = self._create_volunteer(username='tasima', gonullu_tipi='tasima')
+        self.client.force_authenticate(user=self._create_admin())
+    
+    def _item(self, **kwargs):
+        data = {
+            'anonim_gonderici': True,
+            'cikis_yeri': 'istanbul',
+            'ulasacagi_yer': 'hatay',
+            'agirlik': '5.00',
+            'hacim': '0.10',
+            'miktar': 1,
+            'kargo_tipi': 'gida',
+            'icerik': 'Su (5L, 10L, 19L)',
+            'toplama_gonullusu': self.volunteer.id,
+        }
+        data.update(kwargs)
+        return data
+    
+    def test_creates_all_valid_items(self):
+        """Geçerli kalemler ardışık numaralarla, geçmiş ve özet kayıtlarıyla oluşturulur"""
+        items = [self._item() for _ in range(5)] + [self._item(tasima_gonullusu=self.tasima.id)]
+        response = self.client.post(self.url, {'items': items}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 6)
+        numbers = [KARGO_NO_SEQUENCE.parse(result['kargo_no']) for result in response.data['results']]
+        self.assertEqual(numbers, list(range(numbers[0], numbers[0] + 6)))
+        self.assertEqual(Kargo.objects.count(), 6)
+        self.assertEqual(KargoDurumGecmisi.objects.filter(eski_durum__isnull=True).count(), 6)
+        self.assertEqual(
+            KargoDailyRollup.objects.aggregate(total=Sum('kargo_sayisi'))['total'], 6
+        )
+    
+    def test_partial_success_reports_item_errors(self):
+        """Hatalı kalemler raporlanır, geçerli olanlar kaydedilir"""
+        items = [
+            self._item(),
+            self._item(ulasacagi_yer='istanbul'),
+            self._item(toplama_gonullusu=999999),
+            self._item(tasima_gonullusu=self.volunteer.id),
+            'kalem değil',
+            self._item(anonim_gonderici=False, gonderici_ad='Ali', gonderici_soyad='Veli',
+                       gonderici_telefon='5551112233'),
+        ]
+        response = self.client.post(self.url, {'items': items}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['created'], response.data['failed']), (2, 4))
+        results = response.data['results']
+        self.assertEqual([result['success'] for result in results], [True, False, False, False, False, True])
+        self.assertIn('ulasacagi_yer', results[1]['errors'])
+        self.assertIn('toplama_gonullusu', results[2]['errors'])
+        self.assertIn('tasima_gonullusu', results[3]['errors'])
+        self.assertEqual(Kargo.objects.get(kargo_no=results[5]['kargo_no']).gonderici_ad, 'Ali')
+    
+    def test_atomic_aborts_on_any_error(self):
+        """atomic=true iken tek hata hiçbir kaydın oluşturulmamasına yol açar"""
+        items = [self._item(), self._item(miktar=0)]
+        response = self.client.post(self.url + '?atomic=true', {'items': items}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['code'], 'VALIDATION_ERROR')
+        self.assertEqual(response.data['results'][0]['code'], 'BATCH_ABORTED')
+        self.assertFalse(Kargo.objects.exists())
+    
+    def test_anonymous_sender_is_cleared(self):
+        """Anonim gönderici bilgileri sinyaldeki gibi temizlenir"""
+        response = self.client.post(self.url, {'items': [self._item(gonderici_ad='Gizli')]}, format='json')
+        kargo = Kargo.objects.get(kargo_no=response.data['results'][0]['kargo_no'])
+        self.assertIsNone(kargo.gonderici_ad)
+    
+    def test_query_count_does_not_grow_with_batch(self):
+        """Gönüllüler tek sorguda okunur; sorgu sayısı kalem sayısından bağımsızdır"""
+        def count_queries(size):
+            items = [self._item(tasima_gonullusu=self.tasima.id) for _ in range(size)]
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(self.url, {'items': items}, format='json')
+            self.assertEqual(response.data['created'], size)
+            return len(context.captured_queries)
+        
+        count_queries(2)  # numara sayacının ilk oluşturulması
+        self.assertEqual(count_queries(2), count_queries(20))
+    
+    def test_request_validation(self):
+        """Boş liste ve limit aşımı 400 döner"""
+        response = self.client.post(self.url, {'items': []}, format='json')
+        self.assertEqual(response.data['code'], 'MISSING_ITEMS')
+        with self.settings(CARGO_BULK_CREATE_LIMIT=2):
+            response = self.client.post(self.url, {'items': [self._item()] * 3}, format='json')
+        self.assertEqual(response.data['code'], 'BATCH_LIMIT_EXCEEDED')
+    
+    def test_requires_admin(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.post(self.url, {'items': [self._item()]}, format='json')
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+
+class KargoUpdateStatusTest(CargoTestMixin, APITestCase):
+    """PATCH /kargo/<pk>/update_status/ testleri"""
+    
+    def setUp(self):
+        cache.clear()
+        self.volunteer = self._create_volunteer()
+        self.client.force_authenticate(user=self._create_admin())
+        self.kargo = self._create_kargo()
+    
+    def _patch(self, durum):
+        return self.client.patch(f'/api/v1/kargo/{self.kargo.pk}/update_status/', {'durum': durum}, format='json')
+    
+    def test_allowed_transition(self):
+        """İzin verilen geçiş uygulanır ve geçmişe yazılır"""
+        response = self._patch('yolda')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['old_status'], 'hazirlaniyor')
+        self.assertEqual(Kargo.objects.get(pk=self.kargo.pk).durum, 'yolda')
+        self.assertTrue(KargoDurumGecmisi.objects.filter(kargo=self.kargo, yeni_durum='yolda').exists())
+    
+    def test_illegal_transition_rejected(self):
+        """Kapanmış kargo tekil uç noktadan da geri açılamaz"""
+        self.assertEqual(self._patch('teslim_edildi').status_code, status.HTTP_200_OK)
+        
+        response = self._patch('hazirlaniyor')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['code'], 'INVALID_TRANSITION')
+        self.assertEqual(Kargo.objects.get(pk=self.kargo.pk).durum, 'teslim_edildi')
+    
+    def test_invalid_status(self):
+        self.assertEqual(self._patch('kayip').status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class KargoBulkStatusTest(CargoTestMixin, APITestCase):
+    """PATCH /kargo/bulk-status/ ve toplu geçiş servisi testleri"""
+    
+    url = '/api/v1/kargo/bulk-status/'
+    
+    def setUp(self):
+        cache.clear()
+        self.volunteer = self._create_volunteer()
+        self.client.force_authenticate(user=self._create_admin())
+        self.kargos = [self._create_kargo() for _ in range(3)]
+        self.delivered = self._create_kargo()
+        self.delivered.durum = 'teslim_edildi'
+        self.delivered.save()
+    
+    def test_transitions_with_side_effects(self):
+        """Geçiş geçmiş yazar, son_degisiklik'i ilerletir, özet tablosunu ve önbelleği tazeler"""
+        kargo = self.kargos[0]
+        track_url = f'/api/v1/kargo/track/?kargo_no={kargo.kargo_no}'
+        self.client.get(track_url)
+        before = Kargo.objects.get(pk=kargo.pk).son_degisiklik
+        
+        response = self.client.patch(self.url, {
+            'durum': 'yolda', 'ids': [k.pk for k in self.kargos[:2]], 'kargo_nos': [self.kargos[2].kargo_no]
+        }, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['updated']), 3)
+        self.assertEqual(Kargo.objects.filter(durum='yolda').count(), 3)
+        self.assertGreater(Kargo.objects.get(pk=kargo.pk).son_degisiklik, before)
+        self.assertEqual(
+            KargoDurumGecmisi.objects.filter(eski_durum='hazirlaniyor', yeni_durum='yolda').count(), 3
+        )
+        self.assertEqual(
+            KargoDailyRollup.objects.filter(durum='yolda').aggregate(total=Sum('kargo_sayisi'))['total'], 3
+        )
+        self.assertEqual(self.client.get(track_url).data['data']['durum'], 'yolda')
+    
+    def test_rejected_unchanged_and_missing(self):
+        """İzin verilmeyen, zaten aynı durumda olan ve bulunamayan kargolar ayrı raporlanır"""
+        self.kargos[1].durum = 'yolda'
+        self.kargos[1].save()
+        response = self.client.patch(self.url, {
+            'durum': 'yolda',
+            'ids': [self.kargos[0].pk, self.kargos[1].pk, self.delivered.pk, 999999],
+            'kargo_nos': ['AYK999999999'],
+        }, format='json')
+        
+        self.assertEqual([row['id'] for row in response.data['updated']], [self.kargos[0].pk])
+        self.assertEqual([row['id'] for row in response.data['unchanged']], [self.kargos[1].pk])
+        self.assertEqual(response.data['rejected'][0]['eski_durum'], 'teslim_edildi')
+        self.assertEqual(response.data['not_found'], {'ids': [999999], 'kargo_nos': ['AYK999999999']})
+        self.assertEqual(Kargo.objects.get(pk=self.delivered.pk).durum, 'teslim_edildi')
+    
+    def test_single_update_statement(self):
+        """Satır başına save yapılmaz: tek UPDATE ve tek geçmiş INSERT'i"""
+        with CaptureQueriesContext(connection) as context:
+            self.client.patch(self.url, {'durum': 'iptal_edildi', 'ids': [k.pk for k in self.kargos]}, format='json')
+        sql = [query['sql'] for query in context.captured_queries]
+        self.assertEqual(len([q for q in sql if q.startswith('UPDATE "kargo"')]), 1)
+        self.assertEqual(len([q for q in sql if q.startswith('INSERT INTO "kargo_durum_gecmisi"')]), 1)
+    
+    def test_invalid_requests(self):
+        cases = [
+            ({'durum': 'kayip', 'ids': [1]}, 'INVALID_STATUS'),
+            ({'durum': 'yolda'}, 'MISSING_SELECTION'),
+            ({'durum': 'yolda', 'ids': ['x']}, 'INVALID_SELECTION'),
+        ]
+        for body, code in cases:
+            response = self.client.patch(self.url, body, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data['code'], code)
+    
+    def test_admin_action_skips_closed_cargo(self):
+        """Admin işlemi servisi kullanır; teslim edilmiş kargo yeniden 'Yolda' yapılmaz"""
+        admin_user = User.objects.create_superuser('superadmin', 'super@example.com', 'testpass123')
+        self.client.force_login(admin_user)
+        self.client.post('/admin/cargo/kargo/', {
+            'action': 'mark_as_yolda',
+            '_selected_action': [self.kargos[0].pk, self.delivered.pk],
+        })
+        self.assertEqual(Kargo.objects.get(pk=self.kargos[0].pk).durum, 'yolda')
+        self.assertEqual(Kargo.objects.get(pk=self.delivered.pk).durum, 'teslim_edildi')
+
+
+class KargoRoutingTest(CargoTestMixin, APITestCase):
+    """İller arası mesafe matrisi testleri"""
+    
+    def setUp(self):
+        self.volunteer = self._create_volunteer()
+        self.client.force_authenticate(user=self._create_admin())
+    
+    def test_matrix_covers_all_provinces(self):
+        """81 il için simetrik matris; köşegen sıfır"""
+        self.assertEqual(routing.SIZE, 81)
+        self.assertEqual(len(routing.MATRIX), 81 * 81)
+        for i in range(routing.SIZE):
+            self.assertEqual(routing.MATRIX[i * 81 + i], 0)
+            for j in range(i):
+                self.assertEqual(routing.MATRIX[i * 81 + j], routing.MATRIX[j * 81 + i])
+    
+    def test_lookup_matches_haversine(self):
+        """Önceden hesaplanmış değer haversine ile aynı; 'sanliurfa' kodu bulunur"""
+        coordinates = {code: (lat, lon) for code, lat, lon in routing.IL_KOORDINATLARI}
+        expected = round(routing.haversine(*coordinates['sanliurfa'], *coordinates['hakkari']), 2)
+        self.assertAlmostEqual(routing.distance('sanliurfa', 'hakkari'), expected, places=2)
+        self.assertEqual(
+            KargoUtils.get_route_distance_estimate('sanliurfa', 'hakkari'),
+            routing.distance('sanliurfa', 'hakkari')
+        )
+        self.assertIsNone(routing.distance('urfa', 'ankara'))
+        self.assertEqual(
+            routing.distances([('istanbul', 'ankara'), ('ankara', 'istanbul'), ('x', 'van')]),
+            [routing.distance('istanbul', 'ankara')] * 2 + [None]
+        )
+    
+    def test_python_fallback_matches_default(self):
+        """NumPy olmadan kurulan matris aynı değerleri verir"""
+        fallback = routing.build_matrix(use_numpy=False)
+        for a, b in zip(fallback, routing.MATRIX):
+            self.assertAlmostEqual(a, b, places=2)
+    
+    def test_list_and_city_stats_expose_distance(self):
+        """Liste yanıtında mesafe_km, şehir istatistiklerinde rota mesafeleri döner"""
+        self._create_kargo(cikis_yeri='istanbul', ulasacagi_yer='ankara')
+        self._create_kargo(cikis_yeri='istanbul', ulasacagi_yer='ankara')
+        self._create_kargo(cikis_yeri='izmir', ulasacagi_yer='hatay')
+        istanbul_ankara = routing.distance('istanbul', 'ankara')
+        izmir_hatay = routing.distance('izmir', 'hatay')
+        
+        response = self.client.get('/api/v1/kargo/')
+        self.assertEqual(len(response.data['results']), 3)
+        for item in response.data['results']:
+            self.assertEqual(item['mesafe_km'], routing.distance(item['cikis_yeri'], item['ulasacagi_yer']))
+        
+        response = self.client.get('/api/v1/kargo/city-stats/')
+        distance = response.data['data']['distance']
+        self.assertAlmostEqual(distance['toplam_mesafe_km'], 2 * istanbul_ankara + izmir_hatay, places=2)
+        self.assertAlmostEqual(
+            distance['ortalama_mesafe_km'], round((2 * istanbul_ankara + izmir_hatay) / 3, 2), places=2
+        )
+        top = distance['top_routes'][0]
+        self.assertEqual((top['cikis_yeri'], top['ulasacagi_yer'], top['count']), ('istanbul', 'ankara', 2))
+        self.assertEqual(top['mesafe_km'], istanbul_ankara)
+        self.assertEqual(top['cikis_yeri_display'], 'İstanbul')
+
+
+class KargoRoadRouteTest(CargoTestMixin, APITestCase):
+    """Karayolu ağı (Floyd–Warshall) ve /kargo/route/ testleri"""
+    
+    url = '/api/v1/kargo/route/'
+    
+    def setUp(self):
+        self.client.force_authenticate(user=self._create_admin())
+    
+    def test_shortest_paths_on_small_graph(self):
+        """Kısa kenar zinciri doğrudan uzun kenara tercih edilir ve yol kurulur"""
+        network = routing.RoadNetwork([
+            ('ankara', 'konya', 100), ('konya', 'adana', 100), ('ankara', 'adana', 500), ('van', 'hakkari', 50),
+        ])
+        self.assertEqual(network.distance('ankara', 'adana'), 200)
+        self.assertEqual(network.path('ankara', 'adana'), ['ankara', 'konya', 'adana'])
+        self.assertEqual(network.path('adana', 'ankara'), ['adana', 'konya', 'ankara'])
+        self.assertEqual(network.path('ankara', 'ankara'), ['ankara'])
+        self.assertIsNone(network.distance('ankara', 'van'))
+        self.assertIsNone(network.path('ankara', 'van'))
+    
+    def test_bundled_graph_connects_all_provinces(self):
+        """Veri dosyasındaki ağ bağlı; yol mesafesi kuş uçuşundan kısa değil"""
+        network = routing.get_road_network()
+        self.assertIs(network, routing.get_road_network())
+        self.assertIsNotNone(network.version)
+        codes = [code for code, _ in SEHIR.choices]
+        for a in codes:
+            for b in codes:
+                self.assertGreaterEqual(network.distance(a, b), routing.distance(a, b))
+        path = network.path('hakkari', 'edirne')
+        self.assertEqual((path[0], path[-1]), ('hakkari', 'edirne'))
+    
+    def test_route_endpoint(self):
+        """Rota yanıtı veritabanına gitmeden döner; hatalı parametreler 400"""
+        routing.get_road_network()
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'from': 'hakkari', 'to': 'edirne'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data['data']
+        self.assertEqual(data['yol_mesafe_km'], routing.road_distance('hakkari', 'edirne'))
+        self.assertGreater(data['yol_mesafe_km'], data['kus_ucusu_km'])
+        self.assertEqual(data['iller'][0], {'kod': 'hakkari', 'ad': 'Hakkâri'})
+        self.assertEqual(data['iller'][-1]['kod'], 'edirne')
+        
+        for params, code in (({'from': 'van'}, 'MISSING_ROUTE_PARAMS'), ({'from': 'van', 'to': 'urfa'}, 'INVALID_CITY')):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data['code'], code)
+
+
+class KargoMatchingTest(CargoTestMixin, TestCase):
+    """Gönüllü - kargo eşleştirme servisi testleri"""
+    
+    def setUp(self):
+        cache.clear()
+        self.volunteer = self._create_volunteer()
+        self.tasima_istanbul = self._create_volunteer('tasima1', 'tasima', 'istanbul')
+        self.tasima_ankara = self._create_volunteer('tasima2', 'tasima', 'ankara')
+        self.dagitim_ankara = self._create_volunteer('dagitim1', 'dagitim', 'ankara')
+        self._create_volunteer('pasif', 'tasima', 'istanbul', is_active=False)
+        self._create_volunteer('toplama2', 'toplama', 'istanbul')
+    
+    def test_min_cost_assignment_matches_brute_force(self):
+        """Hungarian sonucu tüm permütasyonların en ucuzuna eşittir"""
+        import itertools
+        import random
+        rng = random.Random(7)
+        for rows, columns in ((1, 1), (3, 3), (3, 5), (5, 6)):
+            cost = [[rng.randint(0, 50) for _ in range(columns)] for _ in range(rows)]
+            assignment = matching.min_cost_assignment(cost)
+            self.assertEqual(len(set(assignment)), rows)
+            best = min(
+                sum(cost[row][column] for row, column in enumerate(permutation))
+                for permutation in itertools.permutations(range(columns), rows)
+            )
+            self.assertEqual(sum(cost[row][column] for row, column in enumerate(assignment)), best)
+    
+    def test_assigns_nearest_active_volunteers(self):
+        """Taşıma çıkış iline, dağıtım varış iline en yakın aktif gönüllüye gider"""
+        kargo = self._create_kargo(cikis_yeri='istanbul', ulasacagi_yer='ankara')
+        result = matching.assign_backlog()
+        
+        self.assertEqual(result.unassigned, [])
+        kargo.refresh_from_db()
+        self.assertEqual(kargo.tasima_gonullusu, self.tasima_istanbul)
+        self.assertEqual(kargo.dagitim_gonullusu, self.dagitim_ankara)
+        self.assertEqual(KargoDurumGecmisi.objects.filter(kargo=kargo).count(), 1)
+    
+    def test_workload_spreads_batch(self):
+        """Açık iş yükü yüksek gönüllü yerine boştaki tercih edilir; parça gönüllülere dağıtılır"""
+        other = self._create_volunteer('tasima3', 'karma', 'istanbul')
+        for _ in range(2):
+            self._create_kargo(tasima_gonullusu=self.tasima_istanbul, dagitim_gonullusu=self.dagitim_ankara)
+        delivered = self._create_kargo(tasima_gonullusu=self.tasima_istanbul)
+        delivered.durum = 'teslim_edildi'
+        delivered.save()
+        self.assertEqual(
+            open_workloads([self.tasima_istanbul.pk, other.pk]), {self.tasima_istanbul.pk: 2, other.pk: 0}
+        )
+        
+        kargos = [self._create_kargo(dagitim_gonullusu=self.dagitim_ankara) for _ in range(4)]
+        matching.assign_backlog(Kargo.objects.filter(pk__in=[k.pk for k in kargos]), roles=['tasima'])
+        
+        counts = Counter(Kargo.objects.filter(pk__in=[k.pk for k in kargos]).values_list('tasima_gonullusu', flat=True))
+        self.assertEqual(counts, {other.pk: 3, self.tasima_istanbul.pk: 1})
+    
+    def test_far_cargo_and_dry_run(self):
+        """Menzil dışındaki kargo atanmaz; dry_run hiçbir şey yazmaz"""
+        far = self._create_kargo(cikis_yeri='hakkari', ulasacagi_yer='van')
+        near = self._create_kargo()
+        
+        result = matching.assign_backlog(dry_run=True)
+        self.assertIn((far.pk, 'tasima'), result.unassigned)
+        self.assertIn((near.pk, 'tasima', self.tasima_istanbul.pk), result.assigned)
+        self.assertFalse(Kargo.objects.filter(tasima_gonullusu__isnull=False).exists())
+        
+        call_command('assign_cargo_volunteers', '--role', 'tasima', stdout=StringIO())
+        self.assertEqual(Kargo.objects.get(pk=near.pk).tasima_gonullusu, self.tasima_istanbul)
+        self.assertIsNone(Kargo.objects.get(pk=far.pk).tasima_gonullusu)
+        self.assertIsNone(Kargo.objects.get(pk=near.pk).dagitim_gonullusu)
+    
+    def test_role_filled_during_matching_skipped(self):
+        """Eşleştirme sırasında rolü dolan kargonun üzerine yazılmaz"""
+        taken = self._create_kargo()
+        free = self._create_kargo()
+        match_chunk = matching._match_chunk
+        
+        def fill_then_match(*args):
+            matches = match_chunk(*args)
+            Kargo.objects.filter(pk=taken.pk).update(tasima_gonullusu=self.tasima_ankara)
+            return matches
+        
+        with patch.object(matching, '_match_chunk', side_effect=fill_then_match):
+            result = matching.assign_backlog(roles=['tasima'])
+        
+        self.assertEqual(result.assigned, [(free.pk, 'tasima', self.tasima_istanbul.pk)])
+        self.assertEqual(Kargo.objects.get(pk=taken.pk).tasima_gonullusu, self.tasima_ankara)
+        self.assertEqual(Kargo.objects.get(pk=free.pk).tasima_gonullusu, self.tasima_istanbul)
+    
+    def test_admin_action(self):
+        """Admin işlemi seçili kargolara atama yapar"""
+        kargo = self._create_kargo()
+        untouched = self._create_kargo()
+        admin_user = User.objects.create_superuser('superadmin', 'super@example.com', 'testpass123')
+        self.client.force_login(admin_user)
+        self.client.post('/admin/cargo/kargo/', {
+            'action': 'assign_volunteers',
+            '_selected_action': [kargo.pk],
+        })
+        self.assertEqual(Kargo.objects.get(pk=kargo.pk).tasima_gonullusu, self.tasima_istanbul)
+        self.assertIsNone(Kargo.objects.get(pk=untouched.pk).tasima_gonullusu)
+
+
+class KargoStatusStreamTest(CargoTestMixin, TestCase):
+    """Durum olayları ve SSE akışı testleri"""
+    
+    url = '/api/v1/kargo/stream/'
+    
+    def setUp(self):
+        cache.clear()
+        self.volunteer = self._create_volunteer()
+    
+    def tearDown(self):
+        cache.clear()
+    
+    def _published(self, func):
+        """func() içinde commit sonrası yayınlanan olaylar"""
+        with patch('apps.cargo.events.publish_many') as publish_many:
+            with self.captureOnCommitCallbacks(execute=True):
+                func()
+        return [message for call in publish_many.call_args_list for message in call.args[0]]
+    
+    def test_status_change_published_on_commit(self):
+        """Kayıt ve durum değişikliği commit sonrası kargo kanalına yayınlanır"""
+        created = self._published(self._create_kargo)
+        self.assertEqual(len(created), 1)
+        kargo_channel, event = created[0]
+        kargo = Kargo.objects.get()
+        self.assertEqual(kargo_channel, events.channel(kargo.kargo_no))
+        self.assertIsNone(event['eski_durum'])
+        self.assertEqual(event['yeni_durum'], 'hazirlaniyor')
+        
+        def change():
+            kargo.durum = 'yolda'
+            kargo.save()
+        
+        (_, event), = self._published(change)
+        self.assertEqual(event['eski_durum'], 'hazirlaniyor')
+        self.assertEqual(event['yeni_durum'], 'yolda')
+        self.assertEqual(event['yeni_durum_display'], 'Yolda')
+    
+    def test_rolled_back_change_not_published(self):
+        kargo = self._create_kargo()
+        with patch('apps.cargo.events.publish_many') as publish_many:
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        kargo.durum = 'yolda'
+                        kargo.save()
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+        publish_many.assert_not_called()
+    
+    def test_bulk_status_published(self):
+        """Toplu durum geçişinde her güncellenen kargo için bir olay"""
+        from .transitions import transition_status
+        kargos = [self._create_kargo() for _ in range(3)]
+        published = self._published(
+            lambda: transition_status(Kargo.objects.filter(id__in=[k.id for k in kargos[:2]]), 'yolda')
+        )
+        self.assertEqual(
+            sorted(event['kargo_no'] for _, event in published),
+            sorted(kargo.kargo_no for kargo in kargos[:2])
+        )
+        self.assertTrue(all(event['yeni_durum'] == 'yolda' for _, event in published))
+    
+    def test_stream_requires_asgi(self):
+        """WSGI altında akış açılamaz"""
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_501_NOT_IMPLEMENTED)
+    
+    async def test_stream_validation_errors(self):
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(json.loads(response.content)['code'], 'MISSING_CARGO_NUMBER')
+        
+        response = await self.async_client.get(self.url, {'kargo_no': 'XYZ'})
+        self.assertEqual(json.loads(response.content)['code'], 'INVALID_CARGO_FORMAT')
+        
+        with self.settings(CARGO_TRACKING_BATCH_LIMIT=1):
+            response = await self.async_client.get(self.url, {'kargo_no': 'AYK000000001,AYK000000002'})
+        self.assertEqual(json.loads(response.content)['code'], 'BATCH_LIMIT_EXCEEDED')
+    
+    @override_settings(PUBSUB_BACKEND='memory', CARGO_EVENTS_HEARTBEAT_SECONDS=1)
+    async def test_stream_snapshot_then_status_events(self):
+        """Önce mevcut durumlar, sonra yayınlanan geçişler akar"""
+        from asgiref.sync import sync_to_async
+        kargo = await sync_to_async(self._create_kargo)()
+        
+        response = await self.async_client.get(self.url, {'kargo_no': f'{kargo.kargo_no},AYK999999999'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        try:
+            self.assertEqual(await anext(stream), b'retry: 5000\n\n')
+            chunk = (await anext(stream)).decode()
+            self.assertTrue(chunk.startswith('event: snapshot\n'))
+            snapshot = json.loads(chunk.split('data: ', 1)[1])
+            self.assertEqual(snapshot[0]['durum'], 'hazirlaniyor')
+            self.assertTrue(snapshot[0]['found'])
+            self.assertEqual(snapshot[1], {'kargo_no': 'AYK999999999', 'found': False})
+            
+            event = events.status_event(kargo.kargo_no, 'hazirlaniyor', 'yolda', timezone.now())
+            events.publish_many([(events.channel(kargo.kargo_no), event)])
+            chunk = (await anext(stream)).decode()
+            self.assertTrue(chunk.startswith('event: status\n'))
+            self.assertEqual(json.loads(chunk.split('data: ', 1)[1]), event)
+            
+            # Olay gelmezse heartbeat yorumu
+            self.assertEqual(await anext(stream), b': ping\n\n')
+        finally:
+            await stream.aclose()
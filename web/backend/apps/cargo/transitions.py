@@ -0,0 +1,93 @@
+"""
+Toplu kargo durum geçişleri
+
+`queryset.update()` hızlıdır ama sinyalleri atlar: geçmiş yazılmaz,
+`son_degisiklik` (auto_now) ilerlemez, takip önbelleği temizlenmez. Buradaki
+servis satırları tek `SELECT ... FOR UPDATE` ile kilitleyip eski durumlarını
+okur, izin verilen geçişleri tek UPDATE ile uygular ve yan etkileri
+(geçmiş, durum olayları, özet tablosu, önbellek, gönüllü uygunluk indeksi, log)
+toplu olarak yapar.
+"""
+import logging
+from collections import namedtuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.volunteers.availability import volunteers_changed
+from .assignments import OPEN_STATUSES, VOLUNTEER_ROLES
+from .cache import invalidate_tracking
+from .events import publish_status_changes, status_event
+from .history import HISTORY_BATCH_SIZE
+from .models import Kargo, KargoDurumGecmisi
+from .rollups import ROLLUP_DIMENSIONS, refresh_buckets, rollup_key_from_values
+
+logger = logging.getLogger(__name__)
+
+
+# Mevcut durum -> geçilebilecek durumlar (teslim edilen/iptal edilen kargolar kapanmıştır)
+ALLOWED_TRANSITIONS = {
+    'hazirlaniyor': frozenset({'yolda', 'teslim_edildi', 'iptal_edildi'}),
+    'yolda': frozenset({'teslim_edildi', 'iptal_edildi'}),
+    'teslim_edildi': frozenset(),
+    'iptal_edildi': frozenset(),
+}
+
+# Satır listeleri: {'id', 'kargo_no', 'durum' (geçiş öncesi)}
+TransitionResult = namedtuple('TransitionResult', ('updated', 'unchanged', 'rejected'))
+
+_ROW_FIELDS = ('id', 'kargo_no', 'durum', 'olusturulma_tarihi') + tuple(
+    field for field in ROLLUP_DIMENSIONS if field != 'durum'
+) + tuple(VOLUNTEER_ROLES.values())
+
+
+def can_transition(eski_durum, yeni_durum):
+    return yeni_durum in ALLOWED_TRANSITIONS.get(eski_durum, ())
+
+
+def transition_status(queryset, durum):
+    """
+    Queryset'teki kargoları `durum`a geçirir. Zaten bu durumda olanlar
+    `unchanged`, geçişe izin verilmeyenler `rejected` olarak döner.
+    """
+    if durum not in ALLOWED_TRANSITIONS:
+        raise ValueError(f"Geçersiz durum: {durum}")
+
+    with transaction.atomic():
+        rows = list(queryset.order_by().select_for_update().values(*_ROW_FIELDS))
+        updated, unchanged, rejected = [], [], []
+        for row in rows:
+            if row['durum'] == durum:
+                unchanged.append(row)
+            elif can_transition(row['durum'], durum):
+                updated.append(row)
+            else:
+                rejected.append(row)
+
+        if updated:
+            now = timezone.now()
+            ids = [row['id'] for row in updated]
+            for i in range(0, len(ids), HISTORY_BATCH_SIZE):
+                Kargo.objects.filter(id__in=ids[i:i + HISTORY_BATCH_SIZE]).update(
+                    durum=durum, son_degisiklik=now
+                )
+            KargoDurumGecmisi.objects.bulk_create(
+                [
+                    KargoDurumGecmisi(kargo_id=row['id'], eski_durum=row['durum'], yeni_durum=durum, tarih=now)
+                    for row in updated
+                ],
+                batch_size=HISTORY_BATCH_SIZE
+            )
+            publish_status_changes([status_event(row['kargo_no'], row['durum'], durum, now) for row in updated])
+            old_keys = {rollup_key_from_values(row) for row in updated}
+            refresh_buckets(old_keys | {key._replace(durum=durum) for key in old_keys})
+            if durum not in OPEN_STATUSES:
+                # Kapanan kargolar gönüllülerin açık iş yükünden düşer
+                volunteers_changed(row[column] for row in updated for column in VOLUNTEER_ROLES.values())
+
+    if updated:
+        invalidate_tracking(*(row['kargo_no'] for row in updated))
+        logger.info(f"{len(updated)} kargonun durumu toplu olarak '{durum}' yapıldı")
+    if rejected:
+        logger.info(f"{len(rejected)} kargo için '{durum}' geçişine izin verilmedi")
+    return TransitionResult(updated, unchanged, rejected)
@@ -11,6 +11,8 @@ router.register(r'kargo', views.KargoViewSet, basename='kargo')
 router.register(r'cargo', views.CargoLegacyViewSet, basename='cargo-legacy')  # Legacy API
 
 urlpatterns = [
+    # ASGI durum akışı (router'daki kargo/<pk>/ kalıbından önce eşleşmeli)
+    path('kargo/stream/', views.kargo_status_stream, name='kargo-stream'),
     path('', include(router.urls)),  # Root level access only
 ]
 
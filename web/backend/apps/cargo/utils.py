@@ -4,7 +4,10 @@ Cargo app utility functions
 from django.db.models import Count, Q, Avg, Sum
 from django.utils import timezone
 from datetime import timedelta
+from apps.core.choices import SEHIR, KARGO_ICERIK
 from .models import Kargo
+from . import routing
+from . import stats as cargo_stats
 
 
 class KargoStats:
@@ -13,88 +16,34 @@ class KargoStats:
     @staticmethod
     def get_general_stats():
         """Genel kargo istatistikleri"""
-        total_cargo = Kargo.objects.count()
-        
-        stats = {
-            'toplam_kargo': total_cargo,
-            'anonim_gonderici': Kargo.objects.filter(anonim_gonderici=True).count(),
-            'gonderici_bilgili': Kargo.objects.filter(anonim_gonderici=False).count(),
-        }
-        
-        # Durum bazlı istatistikler
-        for status_code, status_name in Kargo.DURUM_CHOICES:
-            count = Kargo.objects.filter(durum=status_code).count()
-            percentage = (count / total_cargo * 100) if total_cargo > 0 else 0
-            stats[f'durum_{status_code}'] = {
-                'count': count,
-                'percentage': round(percentage, 2),
-                'name': status_name
-            }
-        
-        # Kargo tipi bazlı istatistikler
-        for type_code, type_name in Kargo.KARGO_TIPI_CHOICES:
-            count = Kargo.objects.filter(kargo_tipi=type_code).count()
-            percentage = (count / total_cargo * 100) if total_cargo > 0 else 0
-            stats[f'tip_{type_code}'] = {
-                'count': count,
-                'percentage': round(percentage, 2),
-                'name': type_name
-            }
-        
-        return stats
+        return cargo_stats.get_general_stats()
     
     @staticmethod
     def get_weight_volume_stats():
         """Ağırlık ve hacim istatistikleri"""
-        from django.db.models import Avg, Sum, Min, Max
-        
-        stats = Kargo.objects.aggregate(
-            toplam_agirlik=Sum('agirlik'),
-            ortalama_agirlik=Avg('agirlik'),
-            min_agirlik=Min('agirlik'),
-            max_agirlik=Max('agirlik'),
-            toplam_hacim=Sum('hacim'),
-            ortalama_hacim=Avg('hacim'),
-            min_hacim=Min('hacim'),
-            max_hacim=Max('hacim'),
-            toplam_miktar=Sum('miktar'),
-            ortalama_miktar=Avg('miktar')
-        )
-        
-        # None değerleri 0 ile değiştir
-        for key, value in stats.items():
-            if value is None:
-                stats[key] = 0
-            elif isinstance(value, float):
-                stats[key] = round(value, 2)
-        
-        return stats
+        return cargo_stats.get_weight_volume_stats()
     
     @staticmethod
     def get_city_stats():
         """Şehir bazlı istatistikler"""
-        # En çok çıkış yapılan şehirler
-        top_origins = Kargo.objects.values('cikis_yeri').annotate(
-            count=Count('id')
-        ).order_by('-count')[:10]
-        
-        # En çok varış yapılan şehirler
-        top_destinations = Kargo.objects.values('ulasacagi_yer').annotate(
-            count=Count('id')
-        ).order_by('-count')[:10]
+        top_origins, top_destinations = cargo_stats.get_top_cities()
         
         # Şehir display name'lerini ekle
-        city_dict = dict(Kargo.SEHIR_CHOICES)
-        
         for item in top_origins:
-            item['display_name'] = city_dict.get(item['cikis_yeri'], item['cikis_yeri'])
+            item['display_name'] = SEHIR.label(item['cikis_yeri'])
         
         for item in top_destinations:
-            item['display_name'] = city_dict.get(item['ulasacagi_yer'], item['ulasacagi_yer'])
+            item['display_name'] = SEHIR.label(item['ulasacagi_yer'])
+        
+        distance_stats = cargo_stats.get_distance_stats()
+        for item in distance_stats['top_routes']:
+            item['cikis_yeri_display'] = SEHIR.label(item['cikis_yeri'])
+            item['ulasacagi_yer_display'] = SEHIR.label(item['ulasacagi_yer'])
         
         return {
-            'top_origins': list(top_origins),
-            'top_destinations': list(top_destinations)
+            'top_origins': top_origins,
+            'top_destinations': top_destinations,
+            'distance': distance_stats
         }
     
     @staticmethod
@@ -158,32 +107,7 @@ class KargoStats:
     @staticmethod
     def get_time_based_stats(days=30):
         """Zaman bazlı istatistikler"""
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=days)
-        
-        recent_cargo = Kargo.objects.filter(
-            olusturulma_tarihi__gte=start_date
-        )
-        
-        stats = {
-            'period_days': days,
-            'total_in_period': recent_cargo.count(),
-            'daily_average': round(recent_cargo.count() / days, 2)
-        }
-        
-        # Günlük dağılım
-        from django.db.models import Count
-        from django.db.models.functions import TruncDate
-        
-        daily_stats = recent_cargo.annotate(
-            date=TruncDate('olusturulma_tarihi')
-        ).values('date').annotate(
-            count=Count('id')
-        ).order_by('date')
-        
-        stats['daily_distribution'] = list(daily_stats)
-        
-        return stats
+        return cargo_stats.get_time_series(days=days)
 
 
 class KargoUtils:
@@ -214,15 +138,7 @@ class KargoUtils:
     @staticmethod
     def get_content_suggestions(kargo_tipi):
         """Kargo tipine göre içerik önerileri"""
-        content_map = {
-            'gida': Kargo.GIDA_CHOICES,
-            'ilac': Kargo.ILAC_CHOICES,
-            'giyim': Kargo.GIYIM_CHOICES,
-            'karisik': Kargo.KARISIK_CHOICES,
-            'diger': Kargo.DIGER_CHOICES,
-        }
-        
-        return content_map.get(kargo_tipi, [])
+        return list(KARGO_ICERIK.get(kargo_tipi, ()))
     
     @staticmethod
     def validate_cargo_number(kargo_no):
@@ -244,61 +160,21 @@ class KargoUtils:
     
     @staticmethod
     def get_route_distance_estimate(cikis_yeri, ulasacagi_yer):
-        """Rota mesafe tahmini (basit implementasyon)"""
-        # Bu gerçek bir mesafe hesaplama değil, sadece örnek
-        # Gerçek uygulamada Google Maps API veya benzer servis kullanılabilir
-        
-        # Türkiye'nin büyük şehirleri için koordinatlar
-        city_coordinates = {
-            'istanbul': (41.0082, 28.9784),
-            'ankara': (39.9334, 32.8597),
-            'izmir': (38.4192, 27.1287),
-            'bursa': (40.1826, 29.0665),
-            'antalya': (36.8969, 30.7133),
-            'adana': (37.0000, 35.3213),
-            'gaziantep': (37.0662, 37.3833),
-            'konya': (37.8667, 32.4833),
-            'mersin': (36.8000, 34.6333),
-            'diyarbakir': (37.9144, 40.2306),
-            'kayseri': (38.7312, 35.4787),
-            'eskisehir': (39.7767, 30.5206),
-            'urfa': (37.1591, 38.7969),
-            'malatya': (38.3552, 38.3095),
-            'erzurum': (39.9000, 41.2700),
-            'van': (38.4891, 43.4089),
-            'batman': (37.8812, 41.1351),
-            'elazig': (38.6810, 39.2264),
-            'erzincan': (39.7500, 39.5000),
-            'tokat': (40.3167, 36.5500),
-            'sivas': (39.7477, 37.0179),
-            'rize': (41.0201, 40.5234),
-            'ordu': (40.9839, 37.8764),
-            'giresun': (40.9128, 38.3895),
-            'trabzon': (41.0015, 39.7178),
-            'samsun': (41.2928, 36.3313),
-            'sinop': (42.0231, 35.1531),
-            'zonguldak': (41.4564, 31.7987),
-            'karabuk': (41.2061, 32.6204),
-            'kastamonu': (41.3887, 33.7827),
-            'corum': (40.5506, 34.9556),
-            'amasya': (40.6499, 35.8353),
-            # Diğer şehirler için Google Maps API kullanılabilir
+        """Rota mesafe tahmini - iller arası kuş uçuşu mesafe (km), bilinmeyen il için None"""
+        return routing.distance(cikis_yeri, ulasacagi_yer)
+    
+    @staticmethod
+    def get_road_route(cikis_yeri, ulasacagi_yer):
+        """Karayolu rotası - en kısa yol mesafesi ve uğranan iller; bilinmeyen il ya da yol yoksa None"""
+        network = routing.get_road_network()
+        path = network.path(cikis_yeri, ulasacagi_yer)
+        if path is None:
+            return None
+        return {
+            'cikis_yeri': cikis_yeri,
+            'ulasacagi_yer': ulasacagi_yer,
+            'yol_mesafe_km': network.distance(cikis_yeri, ulasacagi_yer),
+            'kus_ucusu_km': routing.distance(cikis_yeri, ulasacagi_yer),
+            'iller': [{'kod': code, 'ad': SEHIR.label(code)} for code in path],
+            'yol_agi_surumu': network.version,
         }
-        
-        if cikis_yeri in city_coordinates and ulasacagi_yer in city_coordinates:
-            # Basit Euclidean mesafe hesaplama
-            import math
-            
-            lat1, lon1 = city_coordinates[cikis_yeri]
-            lat2, lon2 = city_coordinates[ulasacagi_yer]
-            
-            # Haversine formülü (yaklaşık)
-            dlat = math.radians(lat2 - lat1)
-            dlon = math.radians(lon2 - lon1)
-            a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
-            c = 2 * math.asin(math.sqrt(a))
-            distance = 6371 * c  # Dünya yarıçapı km cinsinden
-            
-            return round(distance, 2)
-        
-        return None  # Koordinat bulunamadı
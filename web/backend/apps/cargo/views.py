@@ -1,11 +1,16 @@
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404
 from django.utils import timezone
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, BasePermission
+from rest_framework.utils.urls import replace_query_param
 from django_filters.rest_framework import DjangoFilterBackend
-from django.http import JsonResponse
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.db.models import Q, Count, Sum, Avg, Min, Max
@@ -32,36 +37,82 @@ class IsAdminOrReadOnlyForTracking(BasePermission):
     """
     def has_permission(self, request, view):
         # Allow public access for tracking endpoint
-        if hasattr(view, 'action') and view.action == 'track':
+        if hasattr(view, 'action') and view.action in ('track', 'track_batch'):
             return True
         
         # For all other operations, require admin access
         return request.user and request.user.is_authenticated and (request.user.is_staff or request.user.is_superuser)
 
 
+from apps.core.choices import SEHIR, KARGO_DURUM
+from apps.core.pagination import (
+    InvalidCursor, KeysetPagination, OptionalCursorPaginationMixin, paginate_keyset_union
+)
 from .models import Kargo
-from .serializers import KargoSerializer, KargoCreateSerializer, KargoTrackingSerializer
+from .serializers import (
+    KargoSerializer, KargoCreateSerializer, KargoTrackingSerializer, KargoFlatSerializer
+)
+from .assignments import VOLUNTEER_ROLES, role_counts, role_querysets
+from . import bulk as bulk_service
+from . import cache as tracking_cache
+from . import conditional
+from . import events
+from .export import EXPORT_FORMATS, export_response
+from .filters import KargoFilter
+from .transitions import transition_status
+from .stats import (
+    get_general_stats, get_time_series, get_weight_volume_stats, get_top_cities, get_distance_stats
+)
 
 
-class KargoViewSet(viewsets.ModelViewSet):
+def lookup_tracking(kargo_nos):
+    """
+    Takip verileri önce önbellekten, eksikler tek sorguyla veritabanından okunur.
+    {kargo_no: KargoTrackingSerializer verisi veya tracking_cache.NOT_FOUND}
+    """
+    found = tracking_cache.get_tracking_many(kargo_nos)
+    missing = [kargo_no for kargo_no in kargo_nos if kargo_no not in found]
+    if missing:
+        fetched = {
+            kargo.kargo_no: KargoTrackingSerializer(kargo).data
+            for kargo in Kargo.objects.filter(kargo_no__in=missing).prefetch_related('durum_gecmisi')
+        }
+        not_found = [kargo_no for kargo_no in missing if kargo_no not in fetched]
+        tracking_cache.set_tracking_many(fetched, not_found)
+        found.update(fetched)
+        found.update(dict.fromkeys(not_found, tracking_cache.NOT_FOUND))
+    return found
+
+
+class KargoViewSet(OptionalCursorPaginationMixin, viewsets.ModelViewSet):
     """
     Kargo işlemleri için ViewSet
+    Liste `?cursor=` ile keyset sayfalama moduna geçer (toplam sayı dönmez).
     """
     queryset = Kargo.objects.all()
     serializer_class = KargoSerializer
     permission_classes = [IsAdminOrReadOnlyForTracking]  # Admin access required except for tracking
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['durum', 'kargo_tipi', 'cikis_yeri', 'ulasacagi_yer', 'anonim_gonderici']
+    filterset_class = KargoFilter
     search_fields = ['kargo_no', 'gonderici_ad', 'gonderici_soyad', 'icerik']
     ordering_fields = ['olusturulma_tarihi', 'son_degisiklik', 'agirlik']
     ordering = ['-olusturulma_tarihi']
+    cursor_ordering = ('-olusturulma_tarihi', '-id')
+    # `.values()` tabanlı hızlı serializer'ı kullanan aksiyonlar (çıktı KargoSerializer ile aynı)
+    flat_read_actions = ('list', 'by_volunteer')
+    
+    @property
+    def use_flat_serializer(self):
+        return self.action in self.flat_read_actions
     
     def get_serializer_class(self):
         """Aksiyona göre serializer seç"""
         if self.action == 'create':
             return KargoCreateSerializer
-        elif self.action == 'track':
+        elif self.action in ('track', 'track_batch'):
             return KargoTrackingSerializer
+        elif self.use_flat_serializer:
+            return KargoFlatSerializer
         return KargoSerializer
     
     def create(self, request, *args, **kwargs):
@@ -76,6 +127,8 @@ class KargoViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Optimized queryset with select_related"""
+        if self.use_flat_serializer:
+            return KargoFlatSerializer.values(Kargo.objects.all())
         return Kargo.objects.select_related(
             'toplama_gonullusu', 
             'tasima_gonullusu', 
@@ -106,15 +159,24 @@ class KargoViewSet(viewsets.ModelViewSet):
                 'code': 'INVALID_CARGO_FORMAT'
             }, status=status.HTTP_400_BAD_REQUEST)
         
+        cached = tracking_cache.get_tracking(kargo_no)
+        if cached == tracking_cache.NOT_FOUND:
+            return Response({
+                'success': False,
+                'error': 'Kargo bulunamadı',
+                'code': 'CARGO_NOT_FOUND'
+            }, status=status.HTTP_404_NOT_FOUND)
+        if cached is not None:
+            return self._tracking_response(request, cached)
+        
         try:
-            kargo = Kargo.objects.get(kargo_no=kargo_no)
+            kargo = Kargo.objects.prefetch_related('durum_gecmisi').get(kargo_no=kargo_no)
             serializer = KargoTrackingSerializer(kargo)
+            tracking_cache.set_tracking(kargo_no, serializer.data)
             logger.info(f"Kargo takibi başarılı: {kargo_no}")
-            return Response({
-                'success': True,
-                'data': serializer.data
-            })
+            return self._tracking_response(request, serializer.data)
         except Kargo.DoesNotExist:
+            tracking_cache.set_tracking_not_found(kargo_no)
             logger.warning(f"Kargo takibi: Kargo bulunamadı - {kargo_no}")
             return Response({
                 'success': False,
@@ -129,20 +191,294 @@ class KargoViewSet(viewsets.ModelViewSet):
                 'code': 'SYSTEM_ERROR'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    @action(detail=False, methods=['post'], permission_classes=[], url_path='track/batch')
+    def track_batch(self, request):
+        """
+        Toplu kargo takibi - Public endpoint
+        Body: {"kargo_nos": ["AYK000000001", ...]}; sonuçlar istek sırasıyla döner.
+        """
+        kargo_nos = request.data.get('kargo_nos')
+        if not isinstance(kargo_nos, list) or not kargo_nos:
+            return Response({
+                'success': False,
+                'error': 'Kargo numarası listesi gereklidir',
+                'code': 'MISSING_CARGO_NUMBERS'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        limit = getattr(settings, 'CARGO_TRACKING_BATCH_LIMIT', 50)
+        if len(kargo_nos) > limit:
+            return Response({
+                'success': False,
+                'error': f'Tek istekte en fazla {limit} kargo numarası sorgulanabilir',
+                'code': 'BATCH_LIMIT_EXCEEDED'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        from .utils import KargoUtils
+        # Tekrarlanan numaralar tek sefer sorgulanır, sıra korunur
+        requested = list(dict.fromkeys(str(kargo_no).strip() for kargo_no in kargo_nos))
+        errors = {}
+        valid = []
+        for kargo_no in requested:
+            is_valid, message = KargoUtils.validate_cargo_number(kargo_no)
+            if is_valid:
+                valid.append(kargo_no)
+            else:
+                errors[kargo_no] = {
+                    'error': f'Geçersiz kargo numarası formatı: {message}',
+                    'code': 'INVALID_CARGO_FORMAT'
+                }
+        
+        try:
+            found = lookup_tracking(valid)
+        except Exception as e:
+            logger.error(f"Toplu kargo takibi hatası: {str(e)}")
+            return Response({
+                'success': False,
+                'error': 'Sistem hatası oluştu',
+                'code': 'SYSTEM_ERROR'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        results = []
+        for kargo_no in requested:
+            if kargo_no in errors:
+                results.append({'kargo_no': kargo_no, 'found': False, **errors[kargo_no]})
+            elif found[kargo_no] == tracking_cache.NOT_FOUND:
+                results.append({
+                    'kargo_no': kargo_no,
+                    'found': False,
+                    'error': 'Kargo bulunamadı',
+                    'code': 'CARGO_NOT_FOUND'
+                })
+            else:
+                results.append({'kargo_no': kargo_no, 'found': True, 'data': found[kargo_no]})
+        
+        found_count = sum(1 for result in results if result['found'])
+        logger.info(f"Toplu kargo takibi: {found_count}/{len(results)} bulundu")
+        return Response({
+            'success': True,
+            'data': {
+                'requested': len(results),
+                'found': found_count,
+                'results': results
+            }
+        })
+    
+    def _tracking_response(self, request, data):
+        """Takip verisini ETag/Last-Modified ile döndür; istemcideki sürüm güncelse 304"""
+        etag = conditional.make_etag('track', data['kargo_no'], data['son_degisiklik'])
+        last_modified = conditional.to_timestamp(data['son_degisiklik'])
+        
+        response = conditional.not_modified(request, etag, last_modified)
+        if response is None:
+            response = Response({
+                'success': True,
+                'data': data
+            })
+            conditional.apply_validators(response, etag, last_modified)
+        return response
+    
+    def retrieve(self, request, *args, **kwargs):
+        """Kargo detayı - önce sadece doğrulayıcı alanları okunur, değişmemişse 304"""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            version = Kargo.objects.filter(
+                **{self.lookup_field: kwargs[lookup_url_kwarg]}
+            ).values_list('kargo_no', 'son_degisiklik').first()
+        except (TypeError, ValueError, ValidationError):
+            version = None
+        
+        if version is not None:
+            etag = conditional.make_etag('detail', *version)
+            last_modified = conditional.to_timestamp(version[1])
+            response = conditional.not_modified(request, etag, last_modified)
+            if response is not None:
+                return response
+        
+        response = super().retrieve(request, *args, **kwargs)
+        if version is not None:
+            conditional.apply_validators(response, etag, last_modified, private=True)
+        return response
+    
+    def list(self, request, *args, **kwargs):
+        """
+        Kargo listesi - filtrelenmiş kümenin max(son_degisiklik) + sayısı
+        doğrulayıcı olarak kullanılır (silme de sayıyı değiştirir).
+        Cursor modunda COUNT atılmaması için koşullu GET uygulanmaz.
+        """
+        if self.cursor_mode:
+            return super().list(request, *args, **kwargs)
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        probe = queryset.order_by().aggregate(
+            son_degisiklik=Max('son_degisiklik'),
+            adet=Count('id')
+        )
+        etag = conditional.make_etag(
+            'list', request.get_full_path(), probe['son_degisiklik'], probe['adet']
+        )
+        last_modified = conditional.to_timestamp(probe['son_degisiklik'])
+        
+        response = conditional.not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        
+        response = super().list(request, *args, **kwargs)
+        conditional.apply_validators(response, etag, last_modified, private=True)
+        return response
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Toplu kargo oluşturma
+        Body: {"items": [{...}, ...], "atomic": false}
+        Varsayılan olarak geçerli kalemler kaydedilir, hatalılar kalem bazında
+        raporlanır; `atomic=true` (body veya query) ile tek hata tüm kaydı durdurur.
+        """
+        items = request.data.get('items')
+        if not isinstance(items, list) or not items:
+            return Response({
+                'success': False,
+                'error': 'Kargo listesi (items) gereklidir',
+                'code': 'MISSING_ITEMS'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        limit = getattr(settings, 'CARGO_BULK_CREATE_LIMIT', 500)
+        if len(items) > limit:
+            return Response({
+                'success': False,
+                'error': f'Tek istekte en fazla {limit} kargo oluşturulabilir',
+                'code': 'BATCH_LIMIT_EXCEEDED'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        atomic = request.data.get('atomic', request.query_params.get('atomic'))
+        atomic = str(atomic).lower() in ('true', '1')
+        
+        valid, errors = bulk_service.validate_items(items)
+        results = [None] * len(items)
+        for index, item_errors in errors.items():
+            results[index] = {'index': index, 'success': False, 'errors': item_errors}
+        
+        if atomic and errors:
+            for index, _ in valid:
+                results[index] = {'index': index, 'success': False, 'code': 'BATCH_ABORTED'}
+            return Response({
+                'success': False,
+                'error': 'Hatalı kalemler olduğu için hiçbir kargo oluşturulmadı',
+                'code': 'VALIDATION_ERROR',
+                'created': 0,
+                'failed': len(errors),
+                'results': results
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            kargolar = bulk_service.create_kargolar([data for _, data in valid])
+        except Exception as e:
+            logger.error(f"Toplu kargo oluşturma hatası: {str(e)}")
+            return Response({
+                'success': False,
+                'error': 'Sistem hatası oluştu',
+                'code': 'SYSTEM_ERROR'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        for (index, _), kargo in zip(valid, kargolar):
+            results[index] = {'index': index, 'success': True, 'id': kargo.pk, 'kargo_no': kargo.kargo_no}
+        
+        logger.info(f"Toplu kargo oluşturma: {len(kargolar)} oluşturuldu, {len(errors)} hatalı - {request.user}")
+        return Response({
+            'success': bool(kargolar),
+            'created': len(kargolar),
+            'failed': len(errors),
+            'results': results
+        }, status=status.HTTP_201_CREATED if kargolar else status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=False, methods=['patch'], url_path='bulk-status')
+    def bulk_status(self, request):
+        """
+        Toplu durum güncelleme
+        Body: {"durum": "yolda", "ids": [1, 2], "kargo_nos": ["AYK000000001"]}
+        İzin verilmeyen geçişler (ör. teslim edilmiş kargo) atlanıp raporlanır.
+        """
+        durum = request.data.get('durum')
+        if durum not in KARGO_DURUM:
+            return Response({
+                'success': False,
+                'error': f"Geçersiz durum. Geçerli durumlar: {', '.join(KARGO_DURUM.labels)}",
+                'code': 'INVALID_STATUS'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        ids = request.data.get('ids') or []
+        kargo_nos = request.data.get('kargo_nos') or []
+        if (
+            not isinstance(ids, list) or not isinstance(kargo_nos, list)
+            or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids)
+        ):
+            return Response({
+                'success': False,
+                'error': 'ids tam sayı listesi, kargo_nos metin listesi olmalıdır',
+                'code': 'INVALID_SELECTION'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not ids and not kargo_nos:
+            return Response({
+                'success': False,
+                'error': 'Güncellenecek kargolar (ids veya kargo_nos) gereklidir',
+                'code': 'MISSING_SELECTION'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        limit = getattr(settings, 'CARGO_BULK_STATUS_LIMIT', 1000)
+        if len(ids) + len(kargo_nos) > limit:
+            return Response({
+                'success': False,
+                'error': f'Tek istekte en fazla {limit} kargo güncellenebilir',
+                'code': 'BATCH_LIMIT_EXCEEDED'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        kargo_nos = [str(kargo_no) for kargo_no in kargo_nos]
+        result = transition_status(
+            Kargo.objects.filter(Q(id__in=ids) | Q(kargo_no__in=kargo_nos)), durum
+        )
+        
+        found = result.updated + result.unchanged + result.rejected
+        found_ids = {row['id'] for row in found}
+        found_nos = {row['kargo_no'] for row in found}
+        
+        def summary(rows):
+            return [{'id': row['id'], 'kargo_no': row['kargo_no'], 'eski_durum': row['durum']} for row in rows]
+        
+        logger.info(f"Toplu durum güncelleme ({durum}): {len(result.updated)} kargo - {request.user}")
+        return Response({
+            'success': True,
+            'durum': durum,
+            'updated': summary(result.updated),
+            'unchanged': summary(result.unchanged),
+            'rejected': summary(result.rejected),
+            'not_found': {
+                'ids': [pk for pk in ids if pk not in found_ids],
+                'kargo_nos': [kargo_no for kargo_no in kargo_nos if kargo_no not in found_nos],
+            }
+        })
+    
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
-        """Kargo durumunu güncelle"""
+        """Kargo durumunu güncelle (bulk-status ile aynı geçiş kuralları)"""
         kargo = get_object_or_404(Kargo, pk=pk)
         new_status = request.data.get('durum')
         
-        if new_status not in dict(Kargo.DURUM_CHOICES):
+        if new_status not in KARGO_DURUM:
             return Response({
                 'error': 'Geçersiz durum'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        old_status = kargo.durum
-        kargo.durum = new_status
-        kargo.save()
+        result = transition_status(Kargo.objects.filter(pk=kargo.pk), new_status)
+        row, = result.updated + result.unchanged + result.rejected
+        old_status = row['durum']
+        if result.rejected:
+            return Response({
+                'success': False,
+                'error': f"'{KARGO_DURUM.label(old_status)}' durumundaki kargo "
+                         f"'{KARGO_DURUM.label(new_status)}' durumuna geçirilemez",
+                'code': 'INVALID_TRANSITION'
+            }, status=status.HTTP_400_BAD_REQUEST)
         
         return Response({
             'success': True,
@@ -158,57 +494,9 @@ class KargoViewSet(viewsets.ModelViewSet):
     def statistics(self, request):
         """Detaylı kargo istatistikleri"""
         try:
-            total_cargo = Kargo.objects.count()
-            
-            if total_cargo == 0:
-                return Response({
-                    'success': True,
-                    'data': {
-                        'toplam_kargo': 0,
-                        'anonim_gonderici': 0,
-                        'gonderici_bilgili': 0,
-                        'durum_hazirlaniyor': {'count': 0, 'percentage': 0, 'name': 'Hazırlanıyor'},
-                        'durum_yolda': {'count': 0, 'percentage': 0, 'name': 'Yolda'},
-                        'durum_teslim_edildi': {'count': 0, 'percentage': 0, 'name': 'Teslim Edildi'},
-                        'durum_iptal_edildi': {'count': 0, 'percentage': 0, 'name': 'İptal Edildi'},
-                        'tip_gida': {'count': 0, 'percentage': 0, 'name': 'Gıda'},
-                        'tip_ilac': {'count': 0, 'percentage': 0, 'name': 'İlaç'},
-                        'tip_giyim': {'count': 0, 'percentage': 0, 'name': 'Giyim'},
-                        'tip_karisik': {'count': 0, 'percentage': 0, 'name': 'Karışık'},
-                        'tip_diger': {'count': 0, 'percentage': 0, 'name': 'Diğer'}
-                    }
-                })
-            
-            stats = {}
-            
-            # Genel istatistikler
-            stats['toplam_kargo'] = total_cargo
-            stats['anonim_gonderici'] = Kargo.objects.filter(anonim_gonderici=True).count()
-            stats['gonderici_bilgili'] = total_cargo - stats['anonim_gonderici']
-            
-            # Durum bazlı istatistikler
-            for status_code, status_name in Kargo.DURUM_CHOICES:
-                count = Kargo.objects.filter(durum=status_code).count()
-                percentage = (count / total_cargo * 100) if total_cargo > 0 else 0
-                stats[f'durum_{status_code}'] = {
-                    'count': count,
-                    'percentage': round(percentage, 2),
-                    'name': status_name
-                }
-            
-            # Kargo tipi bazlı istatistikler
-            for type_code, type_name in Kargo.KARGO_TIPI_CHOICES:
-                count = Kargo.objects.filter(kargo_tipi=type_code).count()
-                percentage = (count / total_cargo * 100) if total_cargo > 0 else 0
-                stats[f'tip_{type_code}'] = {
-                    'count': count,
-                    'percentage': round(percentage, 2),
-                    'name': type_name
-                }
-            
             return Response({
                 'success': True,
-                'data': stats
+                'data': get_general_stats()
             })
         except Exception as e:
             logger.error(f"Statistics error: {str(e)}")
@@ -221,25 +509,7 @@ class KargoViewSet(viewsets.ModelViewSet):
     def weight_volume_stats(self, request):
         """Ağırlık ve hacim istatistikleri"""
         try:
-            stats = Kargo.objects.aggregate(
-                toplam_agirlik=Sum('agirlik'),
-                ortalama_agirlik=Avg('agirlik'),
-                min_agirlik=Min('agirlik'),
-                max_agirlik=Max('agirlik'),
-                toplam_hacim=Sum('hacim'),
-                ortalama_hacim=Avg('hacim'),
-                min_hacim=Min('hacim'),
-                max_hacim=Max('hacim'),
-                toplam_miktar=Sum('miktar'),
-                ortalama_miktar=Avg('miktar')
-            )
-            
-            # None değerleri 0 ile değiştir
-            for key, value in stats.items():
-                if value is None:
-                    stats[key] = 0
-                elif isinstance(value, float):
-                    stats[key] = round(value, 2)
+            stats = get_weight_volume_stats()
             
             return Response({
                 'success': True,
@@ -256,53 +526,28 @@ class KargoViewSet(viewsets.ModelViewSet):
     def city_stats(self, request):
         """Şehir bazlı istatistikler"""
         try:
-            # Türk şehir isimleri mapping
-            CITY_NAMES = {
-                'adana': 'Adana', 'adiyaman': 'Adıyaman', 'afyonkarahisar': 'Afyonkarahisar',
-                'agri': 'Ağrı', 'amasya': 'Amasya', 'ankara': 'Ankara', 'antalya': 'Antalya',
-                'artvin': 'Artvin', 'aydin': 'Aydın', 'balikesir': 'Balıkesir', 'bilecik': 'Bilecik',
-                'bingol': 'Bingöl', 'bitlis': 'Bitlis', 'bolu': 'Bolu', 'burdur': 'Burdur',
-                'bursa': 'Bursa', 'canakkale': 'Çanakkale', 'cankiri': 'Çankırı', 'corum': 'Çorum',
-                'denizli': 'Denizli', 'diyarbakir': 'Diyarbakır', 'edirne': 'Edirne', 'elazig': 'Elazığ',
-                'erzincan': 'Erzincan', 'erzurum': 'Erzurum', 'eskisehir': 'Eskişehir', 'gaziantep': 'Gaziantep',
-                'giresun': 'Giresun', 'gumushane': 'Gümüşhane', 'hakkari': 'Hakkari', 'hatay': 'Hatay',
-                'isparta': 'Isparta', 'mersin': 'Mersin', 'istanbul': 'İstanbul', 'izmir': 'İzmir',
-                'kars': 'Kars', 'kastamonu': 'Kastamonu', 'kayseri': 'Kayseri', 'kirklareli': 'Kırklareli',
-                'kirsehir': 'Kırşehir', 'kocaeli': 'Kocaeli', 'konya': 'Konya', 'kutahya': 'Kütahya',
-                'malatya': 'Malatya', 'manisa': 'Manisa', 'kahramanmaras': 'Kahramanmaraş', 'mardin': 'Mardin',
-                'mugla': 'Muğla', 'mus': 'Muş', 'nevsehir': 'Nevşehir', 'nigde': 'Niğde',
-                'ordu': 'Ordu', 'rize': 'Rize', 'sakarya': 'Sakarya', 'samsun': 'Samsun',
-                'siirt': 'Siirt', 'sinop': 'Sinop', 'sivas': 'Sivas', 'tekirdag': 'Tekirdağ',
-                'tokat': 'Tokat', 'trabzon': 'Trabzon', 'tunceli': 'Tunceli', 'sanliurfa': 'Şanlıurfa',
-                'usak': 'Uşak', 'van': 'Van', 'yozgat': 'Yozgat', 'zonguldak': 'Zonguldak',
-                'aksaray': 'Aksaray', 'bayburt': 'Bayburt', 'karaman': 'Karaman', 'kirikkale': 'Kırıkkale',
-                'batman': 'Batman', 'sirnak': 'Şırnak', 'bartin': 'Bartın', 'ardahan': 'Ardahan',
-                'igdir': 'Iğdır', 'yalova': 'Yalova', 'karabuk': 'Karabük', 'kilis': 'Kilis',
-                'osmaniye': 'Osmaniye', 'duzce': 'Düzce'
-            }
-            
-            # En çok çıkış yapılan şehirler
-            top_origins = Kargo.objects.values('cikis_yeri').annotate(
-                count=Count('id')
-            ).order_by('-count')[:10]
-            
-            # En çok varış yapılan şehirler
-            top_destinations = Kargo.objects.values('ulasacagi_yer').annotate(
-                count=Count('id')
-            ).order_by('-count')[:10]
+            # En çok çıkış / varış yapılan şehirler
+            top_origins, top_destinations = get_top_cities()
             
             # Display name'leri ekle
             for item in top_origins:
-                item['display_name'] = CITY_NAMES.get(item['cikis_yeri'], item['cikis_yeri'].title())
+                item['display_name'] = SEHIR.label(item['cikis_yeri'])
             
             for item in top_destinations:
-                item['display_name'] = CITY_NAMES.get(item['ulasacagi_yer'], item['ulasacagi_yer'].title())
+                item['display_name'] = SEHIR.label(item['ulasacagi_yer'])
+            
+            # Rota mesafeleri
+            distance_stats = get_distance_stats()
+            for item in distance_stats['top_routes']:
+                item['cikis_yeri_display'] = SEHIR.label(item['cikis_yeri'])
+                item['ulasacagi_yer_display'] = SEHIR.label(item['ulasacagi_yer'])
             
             return Response({
                 'success': True,
                 'data': {
-                    'top_origins': list(top_origins),
-                    'top_destinations': list(top_destinations)
+                    'top_origins': top_origins,
+                    'top_destinations': top_destinations,
+                    'distance': distance_stats
                 }
             })
         except Exception as e:
@@ -312,6 +557,41 @@ class KargoViewSet(viewsets.ModelViewSet):
                 'error': 'Şehir istatistikleri yüklenirken hata oluştu'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    @action(detail=False, methods=['get'])
+    def route(self, request):
+        """İki il arası karayolu rotası - ?from=<il>&to=<il> (veritabanına gitmez)"""
+        cikis_yeri = request.query_params.get('from')
+        ulasacagi_yer = request.query_params.get('to')
+        
+        if not cikis_yeri or not ulasacagi_yer:
+            return Response({
+                'success': False,
+                'error': 'from ve to parametreleri gereklidir',
+                'code': 'MISSING_ROUTE_PARAMS'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        unknown = [code for code in (cikis_yeri, ulasacagi_yer) if code not in SEHIR]
+        if unknown:
+            return Response({
+                'success': False,
+                'error': f"Geçersiz il kodu: {', '.join(unknown)}",
+                'code': 'INVALID_CITY'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        from .utils import KargoUtils
+        route = KargoUtils.get_road_route(cikis_yeri, ulasacagi_yer)
+        if route is None:
+            return Response({
+                'success': False,
+                'error': 'Bu iller arasında yol bulunamadı',
+                'code': 'ROUTE_NOT_FOUND'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response({
+            'success': True,
+            'data': route
+        })
+    
     @action(detail=False, methods=['get'], url_path='volunteer-stats')
     def volunteer_stats(self, request):
         """Gönüllü atama istatistikleri"""
@@ -374,67 +654,124 @@ class KargoViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'], url_path='time-based-stats')
     def time_based_stats(self, request):
-        """Zaman bazlı istatistikler"""
+        """Zaman bazlı istatistikler (?days=30&granularity=day|week|month|hour)"""
         try:
             days = int(request.query_params.get('days', 30))
-            end_date = timezone.now().date()
-            start_date = end_date - timedelta(days=days)
-            
-            # Belirtilen dönemdeki kargolar
-            period_cargo = Kargo.objects.filter(
-                olusturulma_tarihi__date__gte=start_date,
-                olusturulma_tarihi__date__lte=end_date
-            )
-            
-            total_in_period = period_cargo.count()
-            daily_average = total_in_period / days if days > 0 else 0
-            
-            # Günlük dağılım
-            daily_distribution = []
-            current_date = start_date
-            while current_date <= end_date:
-                count = period_cargo.filter(olusturulma_tarihi__date=current_date).count()
-                daily_distribution.append({
-                    'date': current_date.strftime('%Y-%m-%d'),
-                    'count': count
-                })
-                current_date += timedelta(days=1)
-            
+        except (TypeError, ValueError):
             return Response({
-                'success': True,
-                'data': {
-                    'period_days': days,
-                    'total_in_period': total_in_period,
-                    'daily_average': round(daily_average, 2),
-                    'daily_distribution': daily_distribution
-                }
-            })
+                'success': False,
+                'error': 'Gün sayısı tam sayı olmalıdır',
+                'code': 'INVALID_DAYS'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        granularity = request.query_params.get('granularity', 'day')
+        
+        try:
+            data = get_time_series(days=days, granularity=granularity)
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': str(e),
+                'code': 'INVALID_PERIOD'
+            }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f"Time-based stats error: {str(e)}")
             return Response({
                 'success': False,
                 'error': 'Zaman bazlı istatistikler yüklenirken hata oluştu'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        return Response({
+            'success': True,
+            'data': data
+        })
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Kargo dışa aktarımı (?file_format=csv|ndjson + tüm KargoFilter parametreleri).
+        Yanıt akış halinde üretilir; büyük listelerde bellek kullanımı sabit kalır.
+        """
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in EXPORT_FORMATS:
+            return Response({
+                'success': False,
+                'error': f"Geçersiz dosya formatı. Desteklenenler: {', '.join(EXPORT_FORMATS)}",
+                'code': 'INVALID_FORMAT'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        filterset = KargoFilter(request.query_params, queryset=Kargo.objects.all())
+        if not filterset.is_valid():
+            return Response({
+                'success': False,
+                'error': filterset.errors,
+                'code': 'INVALID_FILTER'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        logger.info(f"Kargo dışa aktarımı başlatıldı ({file_format}) - {request.user}")
+        return export_response(filterset.qs, file_format, request=request)
     
     @action(detail=False, methods=['get'])
     def by_volunteer(self, request):
-        """Gönüllü bazlı kargo listesi"""
+        """
+        Gönüllü bazlı kargo listesi - cursor sayfalı (`?cursor=`, `?page_size=`),
+        `?role=toplama|tasima|dagitim` ile tek role daraltılabilir.
+        Rol bazında kargo sayıları `counts` alanında döner.
+        """
         volunteer_id = request.query_params.get('volunteer_id')
         
         if not volunteer_id:
             return Response({
-                'error': 'Gönüllü ID gereklidir'
+                'success': False,
+                'error': 'Gönüllü ID gereklidir',
+                'code': 'MISSING_VOLUNTEER_ID'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        kargolar = Kargo.objects.filter(
-            Q(toplama_gonullusu_id=volunteer_id) |
-            Q(tasima_gonullusu_id=volunteer_id) |
-            Q(dagitim_gonullusu_id=volunteer_id)
-        ).select_related('toplama_gonullusu', 'tasima_gonullusu', 'dagitim_gonullusu')
+        if not volunteer_id.isdigit():
+            return Response({
+                'success': False,
+                'error': 'Geçersiz gönüllü ID',
+                'code': 'INVALID_VOLUNTEER_ID'
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        serializer = KargoSerializer(kargolar, many=True)
+        role = request.query_params.get('role')
+        if role and role not in VOLUNTEER_ROLES:
+            return Response({
+                'success': False,
+                'error': f"Geçersiz rol. Geçerli roller: {', '.join(VOLUNTEER_ROLES)}",
+                'code': 'INVALID_ROLE'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Sayfa: rol dallarının UNION'ından keyset ile id'ler, ardından satırlar
+        try:
+            page, next_cursor, previous_cursor = paginate_keyset_union(
+                role_querysets(volunteer_id, [role] if role else None),
+                self.cursor_ordering,
+                cursor=request.query_params.get('cursor'),
+                page_size=KeysetPagination().get_page_size(request),
+            )
+        except InvalidCursor:
+            return Response({
+                'success': False,
+                'error': 'Geçersiz cursor',
+                'code': 'INVALID_CURSOR'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        kargolar = self.get_queryset().filter(
+            id__in=[row['id'] for row in page]
+        ).order_by(*self.cursor_ordering)
+        
+        def cursor_url(cursor):
+            if cursor is None:
+                return None
+            return replace_query_param(request.build_absolute_uri(), 'cursor', cursor)
+        
+        serializer = self.get_serializer(kargolar, many=True)
         return Response({
             'success': True,
+            'counts': role_counts(volunteer_id),
+            'next': cursor_url(next_cursor),
+            'previous': cursor_url(previous_cursor),
             'data': serializer.data
         })
     
@@ -537,3 +874,69 @@ class CargoLegacyViewSet(viewsets.ViewSet):
             return Response({
                 'message': 'Kargo bulunamadı'
             }, status=status.HTTP_404_NOT_FOUND)
+
+
+def _stream_error(error, code, status_code=status.HTTP_400_BAD_REQUEST):
+    return JsonResponse({'success': False, 'error': error, 'code': code}, status=status_code)
+
+
+@require_GET
+async def kargo_status_stream(request):
+    """
+    Kargo durum akışı (Server-Sent Events) - Public endpoint, ASGI gerektirir.
+    ?kargo_no=AYK000000001&kargo_no=AYK000000002 (ya da virgülle ayrılmış)
+    Önce `snapshot` olayı (mevcut durumlar), ardından her geçişte `status` olayı gelir.
+    """
+    if not isinstance(request, ASGIRequest):
+        return _stream_error(
+            'Durum akışı sadece ASGI sunucusu altında kullanılabilir',
+            'STREAMING_REQUIRES_ASGI',
+            status.HTTP_501_NOT_IMPLEMENTED
+        )
+    
+    kargo_nos = list(dict.fromkeys(
+        kargo_no.strip()
+        for value in request.GET.getlist('kargo_no')
+        for kargo_no in value.split(',')
+        if kargo_no.strip()
+    ))
+    if not kargo_nos:
+        return _stream_error('Kargo numarası gereklidir', 'MISSING_CARGO_NUMBER')
+    
+    limit = getattr(settings, 'CARGO_TRACKING_BATCH_LIMIT', 50)
+    if len(kargo_nos) > limit:
+        return _stream_error(
+            f'Tek akışta en fazla {limit} kargo numarası izlenebilir', 'BATCH_LIMIT_EXCEEDED'
+        )
+    
+    from .utils import KargoUtils
+    for kargo_no in kargo_nos:
+        is_valid, message = KargoUtils.validate_cargo_number(kargo_no)
+        if not is_valid:
+            return _stream_error(f'Geçersiz kargo numarası formatı: {message}', 'INVALID_CARGO_FORMAT')
+    
+    def snapshot():
+        found = lookup_tracking(kargo_nos)
+        results = []
+        for kargo_no in kargo_nos:
+            data = found[kargo_no]
+            if data == tracking_cache.NOT_FOUND:
+                results.append({'kargo_no': kargo_no, 'found': False})
+            else:
+                results.append({
+                    'kargo_no': kargo_no,
+                    'found': True,
+                    'durum': data['durum'],
+                    'durum_display': data['durum_display'],
+                    'son_degisiklik': data['son_degisiklik'],
+                })
+        return results
+    
+    response = StreamingHttpResponse(
+        events.status_stream(kargo_nos, sync_to_async(snapshot)),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Nginx gibi ters vekillerin olayları tamponlamaması için
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,159 @@
+"""
+Ortak seçenek (choices) kayıt defteri
+
+Şehir, kargo durumu/tipi, içerik önerileri ve gönüllü tipi listeleri tek yerde,
+import sırasında bir kez kurulur. Her `ChoiceSet` değiştirilemez kod -> etiket,
+etiket -> kod ve kod -> sıra eşlemeleri taşır; modeller `choices=` olarak,
+serializer/filtre/istatistik kodu ise etiket araması için bunları kullanır.
+İstek başına sözlük kurulmaz, aramalar O(1)'dir.
+"""
+from types import MappingProxyType
+
+
+# Kayıtlı seçenek kümeleri (ad -> ChoiceSet)
+_registry = {}
+
+
+def get_choices(name):
+    """Ada göre kayıtlı seçenek kümesini döndürür"""
+    return _registry[name]
+
+
+class ChoiceSet:
+    """Sıralı (kod, etiket) listesi ve ondan türetilmiş salt okunur eşlemeler"""
+
+    __slots__ = ('name', 'choices', 'sorted_choices', 'labels', 'codes', 'index')
+
+    def __init__(self, name, choices):
+        self.name = name
+        self.choices = tuple((code, label) for code, label in choices)
+        # Koda göre alfabetik sıra (form/admin açılır listeleri için)
+        self.sorted_choices = tuple(sorted(self.choices))
+        self.labels = MappingProxyType(dict(self.choices))
+        self.codes = MappingProxyType({label: code for code, label in self.choices})
+        self.index = MappingProxyType({code: i for i, (code, _) in enumerate(self.choices)})
+        if len(self.labels) != len(self.choices):
+            raise ValueError(f"'{name}' seçeneklerinde tekrarlanan kod var")
+        _registry[name] = self
+
+    def label(self, code):
+        """Kodun etiketi; bilinmeyen kodlar olduğu gibi döner (Django get_FOO_display ile aynı)"""
+        return self.labels.get(code, code)
+
+    def code(self, label, default=None):
+        return self.codes.get(label, default)
+
+    def __contains__(self, code):
+        return code in self.labels
+
+    def __iter__(self):
+        return iter(self.choices)
+
+    def __len__(self):
+        return len(self.choices)
+
+    def __repr__(self):
+        return f'<ChoiceSet {self.name}: {len(self)}>'
+
+
+# 81 il - plaka sırasıyla (index + 1 = plaka kodu)
+SEHIR = ChoiceSet('sehir', [
+    ('adana', 'Adana'), ('adiyaman', 'Adıyaman'), ('afyonkarahisar', 'Afyonkarahisar'),
+    ('agri', 'Ağrı'), ('amasya', 'Amasya'), ('ankara', 'Ankara'), ('antalya', 'Antalya'),
+    ('artvin', 'Artvin'), ('aydin', 'Aydın'), ('balikesir', 'Balıkesir'), ('bilecik', 'Bilecik'),
+    ('bingol', 'Bingöl'), ('bitlis', 'Bitlis'), ('bolu', 'Bolu'), ('burdur', 'Burdur'),
+    ('bursa', 'Bursa'), ('canakkale', 'Çanakkale'), ('cankiri', 'Çankırı'), ('corum', 'Çorum'),
+    ('denizli', 'Denizli'), ('diyarbakir', 'Diyarbakır'), ('edirne', 'Edirne'), ('elazig', 'Elazığ'),
+    ('erzincan', 'Erzincan'), ('erzurum', 'Erzurum'), ('eskisehir', 'Eskişehir'),
+    ('gaziantep', 'Gaziantep'), ('giresun', 'Giresun'), ('gumushane', 'Gümüşhane'),
+    ('hakkari', 'Hakkâri'), ('hatay', 'Hatay'), ('isparta', 'Isparta'), ('mersin', 'Mersin'),
+    ('istanbul', 'İstanbul'), ('izmir', 'İzmir'), ('kars', 'Kars'), ('kastamonu', 'Kastamonu'),
+    ('kayseri', 'Kayseri'), ('kirklareli', 'Kırklareli'), ('kirsehir', 'Kırşehir'),
+    ('kocaeli', 'Kocaeli'), ('konya', 'Konya'), ('kutahya', 'Kütahya'), ('malatya', 'Malatya'),
+    ('manisa', 'Manisa'), ('kahramanmaras', 'Kahramanmaraş'), ('mardin', 'Mardin'),
+    ('mugla', 'Muğla'), ('mus', 'Muş'), ('nevsehir', 'Nevşehir'), ('nigde', 'Niğde'),
+    ('ordu', 'Ordu'), ('rize', 'Rize'), ('sakarya', 'Sakarya'), ('samsun', 'Samsun'),
+    ('siirt', 'Siirt'), ('sinop', 'Sinop'), ('sivas', 'Sivas'), ('tekirdag', 'Tekirdağ'),
+    ('tokat', 'Tokat'), ('trabzon', 'Trabzon'), ('tunceli', 'Tunceli'), ('sanliurfa', 'Şanlıurfa'),
+    ('usak', 'Uşak'), ('van', 'Van'), ('yozgat', 'Yozgat'), ('zonguldak', 'Zonguldak'),
+    ('aksaray', 'Aksaray'), ('bayburt', 'Bayburt'), ('karaman', 'Karaman'),
+    ('kirikkale', 'Kırıkkale'), ('batman', 'Batman'), ('sirnak', 'Şırnak'), ('bartin', 'Bartın'),
+    ('ardahan', 'Ardahan'), ('igdir', 'Iğdır'), ('yalova', 'Yalova'), ('karabuk', 'Karabük'),
+    ('kilis', 'Kilis'), ('osmaniye', 'Osmaniye'), ('duzce', 'Düzce'),
+])
+
+KARGO_DURUM = ChoiceSet('kargo_durum', [
+    ('hazirlaniyor', 'Hazırlanıyor'),
+    ('yolda', 'Yolda'),
+    ('teslim_edildi', 'Teslim Edildi'),
+    ('iptal_edildi', 'İptal Edildi'),
+])
+
+KARGO_TIPI = ChoiceSet('kargo_tipi', [
+    ('gida', 'Gıda'),
+    ('ilac', 'İlaç'),
+    ('giyim', 'Giyim'),
+    ('karisik', 'Karışık'),
+    ('diger', 'Diğer'),
+])
+
+GONULLU_TIPI = ChoiceSet('gonullu_tipi', [
+    ('toplama', 'Toplama Gönüllüsü'),
+    ('tasima', 'Taşıma Gönüllüsü'),
+    ('dagitim', 'Dağıtım Gönüllüsü'),
+    ('karma', 'Karma Gönüllü (Tüm Görevler)'),
+])
+
+# Kargo tipine göre içerik önerileri (kargo tipi kodu -> öneri listesi)
+KARGO_ICERIK = MappingProxyType({
+    'gida': (
+        "Su (5L, 10L, 19L)", "Konserve Gıda (Et, Sebze, Meyve)", "Kuru Gıda Paketi",
+        "Bebek Maması ve Besini", "Taze Meyve ve Sebze", "Ekmek ve Unlu Mamuller",
+        "Pirinç (1kg, 5kg, 25kg)", "Makarna ve Bulgur", "Bakliyat (Mercimek, Fasulye, Nohut)",
+        "Yağ ve Tereyağı", "Süt ve Süt Ürünleri", "Hazır Yemek Paketi",
+        "Çay ve Kahve", "Şeker ve Bal", "Tuz ve Baharat",
+        "Bisküvi ve Kraker", "Kuruyemiş ve Çekirdek", "Reçel ve Pekmez",
+        "Çikolata ve Şeker", "Mama Biberon ve Emzik",
+    ),
+    'ilac': (
+        "Reçeteli İlaç Paketi", "Ağrı Kesici (Parol, Aspirin)", "Ateş Düşürücü",
+        "Soğuk Algınlığı İlacı", "Vitamin ve Mineral Takviyesi", "İlk Yardım Çantası",
+        "Bandaj ve Sargı Malzemesi", "Antiseptik ve Dezenfektan", "Termometre",
+        "Kan Basıncı Aleti", "Diyabet Test Kiti", "Maske ve Eldiven",
+        "Serum Fizyolojik", "Pamuk ve Gazlı Bez", "Yara Bandı ve Flaster",
+        "Öksürük Şurubu", "Mide İlacı", "Göz Damlası",
+        "Kulak Damlası", "Merhem ve Krem", "Enjektör ve İğne",
+        "Tansiyon İlacı", "Kalp İlacı", "Nefes Açıcı (Astım)",
+        "İnsülin ve Diyabet Malzemeleri",
+    ),
+    'giyim': (
+        "Yetişkin Kış Kıyafeti", "Yetişkin Yaz Kıyafeti", "Çocuk Kıyafeti (0-2 Yaş)",
+        "Çocuk Kıyafeti (3-12 Yaş)", "Genç Kıyafeti (13-18 Yaş)", "Ayakkabı (Erkek/Kadın/Çocuk)",
+        "İç Çamaşırı Seti", "Battaniye ve Yorgan", "Uyku Tulumu",
+        "Yastık ve Kılıf", "Çadır ve Kamp Malzemesi", "Mont ve Kaban",
+        "Çorap ve Külotlu Çorap", "Eldiven ve Bere", "Atkı ve Şal",
+        "Pijama ve Gecelik", "Hamile Kıyafeti", "Bebek Kıyafeti ve Zıbın",
+        "İş Kıyafeti ve Önlük", "Spor Kıyafeti", "Terlik ve Sandalet",
+        "Çizme ve Bot", "Kemer ve Aksesuar",
+    ),
+    'karisik': (
+        "Aile Yardım Paketi", "Acil Durum Paketi", "Bebek Bakım Paketi",
+        "Okul Malzemeleri Paketi", "Hijyen Paketi", "Temizlik Malzemeleri Paketi",
+        "Kışlık Hazırlık Paketi", "Yenidoğan Paketi", "Yaşlı Bakım Paketi",
+        "Engelli Bakım Paketi", "Kadın Hijyen Paketi", "Erkek Bakım Paketi",
+        "Çocuk Oyun Paketi", "Eğitim Destek Paketi", "Mutfak Eşyası Paketi",
+        "Banyo Malzemeleri Paketi", "Kamp ve Barınma Paketi", "İletişim Paketi",
+    ),
+    'diger': (
+        "Elektronik Eşya (Telefon, Tablet)", "Ev Eşyası (Tencere, Tabak)", "Eğitim Malzemeleri",
+        "Kitap ve Dergi", "Çocuk Oyuncakları", "Spor Malzemeleri",
+        "Müzik Aletleri", "Bahçe ve Tarım Malzemeleri", "İnşaat Malzemeleri",
+        "Araç Yedek Parça", "Yakıt ve Enerji", "Haberleşme Cihazları",
+        "Temizlik Malzemeleri", "Kırtasiye Malzemeleri", "Mobilya ve Dekorasyon",
+        "Mutfak Gereçleri", "Banyo Malzemeleri", "Aydınlatma Malzemeleri",
+        "Güvenlik Malzemeleri", "Yangın Söndürme Malzemeleri", "Jeneratör ve Güç Kaynağı",
+        "Su Arıtma Cihazları", "Isıtma ve Soğutma Cihazları", "Çanta ve Bavul",
+        "Saatler ve Takılar", "Optik Malzemeler (Gözlük)", "Pet Malzemeleri",
+        "Hobi Malzemeleri", "Sanat Malzemeleri", "Fotoğraf ve Video Ekipmanları",
+    ),
+})
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.sequences import all_sequences, get_sequence
+
+
+class Command(BaseCommand):
+    help = 'Reseed number sequences (kargo_no, ...) from the highest number in existing data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names',
+            nargs='*',
+            help='Sequence names to reseed (default: all registered sequences)'
+        )
+
+    def handle(self, *args, **options):
+        names = options['names']
+        
+        try:
+            sequences = [get_sequence(name) for name in names] if names else all_sequences()
+        except KeyError as e:
+            raise CommandError(f'Bilinmeyen seri: {e.args[0]}')
+        
+        for sequence in sequences:
+            current_max = sequence.reseed()
+            if current_max < 0:
+                self.stdout.write(
+                    self.style.WARNING(f'{sequence.name}: kayıt yok, seri {sequence.format(0)} ile başlayacak.')
+                )
+            else:
+                self.stdout.write(
+                    self.style.SUCCESS(f'{sequence.name}: son numara {sequence.format(current_max)} olarak ayarlandı.')
+                )
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="NumberSequence",
+            fields=[
+                (
+                    "name",
+                    models.CharField(
+                        max_length=50,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Seri Adı",
+                    ),
+                ),
+                (
+                    "last_value",
+                    models.BigIntegerField(
+                        default=-1,
+                        help_text="Bu seriden en son dağıtılan sayı (-1: henüz numara verilmedi)",
+                        verbose_name="Son Verilen Değer",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Son Güncelleme"),
+                ),
+            ],
+            options={
+                "verbose_name": "Numara Serisi",
+                "verbose_name_plural": "Numara Serileri",
+                "db_table": "number_sequence",
+            },
+        ),
+    ]
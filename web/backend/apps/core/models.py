@@ -1,3 +1,27 @@
 from django.db import models
 
-# Create your models here.
+
+class NumberSequence(models.Model):
+    """Numara serileri için sayaç tablosu (AYK..., G... gibi)"""
+    name = models.CharField(
+        max_length=50,
+        primary_key=True,
+        verbose_name="Seri Adı"
+    )
+    last_value = models.BigIntegerField(
+        default=-1,
+        verbose_name="Son Verilen Değer",
+        help_text="Bu seriden en son dağıtılan sayı (-1: henüz numara verilmedi)"
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Son Güncelleme"
+    )
+
+    def __str__(self):
+        return f"{self.name}: {self.last_value}"
+
+    class Meta:
+        verbose_name = "Numara Serisi"
+        verbose_name_plural = "Numara Serileri"
+        db_table = 'number_sequence'
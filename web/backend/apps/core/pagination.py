@@ -0,0 +1,256 @@
+"""
+Keyset (cursor) sayfalama ve tahmini sayım
+
+OFFSET ve COUNT(*) yerine son görülen satırın sıralama değerleri cursor olarak
+istemciye verilir; sonraki sayfa `(tarih, id) < (t, i)` koşuluyla index
+üzerinden okunur. Maliyet sayfa derinliğinden bağımsızdır, toplam sayı dönmez.
+Sayfa numaralı listelerde büyük tablolar için planlayıcı tahmini kullanılabilir.
+"""
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class InvalidCursor(ValueError):
+    """Çözümlenemeyen veya sıralamayla uyuşmayan cursor"""
+
+
+def _field_name(ordering_field):
+    return ordering_field.lstrip('-')
+
+
+def encode_cursor(values, reverse=False):
+    payload = {'p': values}
+    if reverse:
+        payload['r'] = 1
+    raw = json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, queryset, ordering):
+    """Cursor'ı (pozisyon değerleri, geri yön mü) olarak çözer"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        values = payload['p']
+        reverse = bool(payload.get('r'))
+    except (TypeError, ValueError, KeyError, binascii.Error, UnicodeError):
+        raise InvalidCursor(cursor)
+
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise InvalidCursor(cursor)
+
+    opts = queryset.model._meta
+    try:
+        position = [
+            opts.get_field(_field_name(field)).to_python(value)
+            for field, value in zip(ordering, values)
+        ]
+    except Exception:
+        raise InvalidCursor(cursor)
+    return position, reverse
+
+
+def _position(obj, ordering):
+    """Satırın sıralama değerleri (model örneği veya values() sözlüğü)"""
+    if isinstance(obj, dict):
+        return [obj[_field_name(field)] for field in ordering]
+    return [getattr(obj, _field_name(field)) for field in ordering]
+
+
+def _after(position, ordering, reverse=False):
+    """Sıralamada `position`dan sonra gelen satırlar (lexicographic keyset koşulu)"""
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, position):
+        name = _field_name(field)
+        descending = field.startswith('-') != reverse
+        condition |= Q(**equal, **{f'{name}__{"lt" if descending else "gt"}': value})
+        equal[name] = value
+    return condition
+
+
+def _reversed(ordering):
+    return [_field_name(field) if field.startswith('-') else f'-{field}' for field in ordering]
+
+
+def paginate_keyset(queryset, ordering, cursor=None, page_size=20):
+    """
+    Queryset'in bir sayfasını keyset yöntemiyle okur.
+    `(items, next_cursor, previous_cursor)` döndürür; sayfa yoksa cursor None.
+    """
+    def fetch(order, condition, limit):
+        return list(queryset.filter(condition).order_by(*order)[:limit])
+
+    return _keyset_page(fetch, queryset, ordering, cursor, page_size)
+
+
+def paginate_keyset_union(querysets, ordering, cursor=None, page_size=20):
+    """
+    Birden çok queryset'in UNION'ını keyset yöntemiyle sayfalar (ör. aynı
+    tablonun farklı index'li kolonlarla filtrelenmiş dalları). Keyset koşulu
+    her dala ayrı uygulanır; destekleyen veritabanlarında (PostgreSQL) her dal
+    ayrıca sıralanıp sınırlanır, böylece her biri kendi index'inden okunur.
+    Dallar yalnızca sıralama alanlarını (ve isteğe bağlı olarak ek kolonları)
+    seçmelidir; satırlar sözlük olarak döner.
+    """
+    querysets = [queryset.values(*map(_field_name, ordering)) for queryset in querysets]
+    first = querysets[0]
+    limit_branches = connections[first.db].features.supports_slicing_ordering_in_compound
+
+    def fetch(order, condition, limit):
+        branches = []
+        for queryset in querysets:
+            queryset = queryset.filter(condition)
+            branches.append(queryset.order_by(*order)[:limit] if limit_branches else queryset.order_by())
+        if len(branches) == 1:
+            combined = branches[0]
+        else:
+            combined = branches[0].union(*branches[1:])
+        return list(combined.order_by(*order)[:limit])
+
+    return _keyset_page(fetch, first, ordering, cursor, page_size)
+
+
+def _keyset_page(fetch, queryset, ordering, cursor, page_size):
+    position, reverse = (None, False)
+    if cursor:
+        position, reverse = decode_cursor(cursor, queryset, ordering)
+
+    order = _reversed(ordering) if reverse else list(ordering)
+    condition = _after(position, ordering, reverse) if position is not None else Q()
+    items = fetch(order, condition, page_size + 1)
+    has_more = len(items) > page_size
+    items = items[:page_size]
+
+    if reverse:
+        items.reverse()
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, position is not None
+
+    next_cursor = previous_cursor = None
+    if items:
+        if has_next:
+            next_cursor = encode_cursor(_position(items[-1], ordering))
+        if has_previous:
+            previous_cursor = encode_cursor(_position(items[0], ordering), reverse=True)
+    elif position is not None:
+        # Boş sayfa: geldiği yöne geri dönülebilsin
+        if reverse:
+            next_cursor = encode_cursor(position)
+        else:
+            previous_cursor = encode_cursor(position, reverse=True)
+    return items, next_cursor, previous_cursor
+
+
+class KeysetPagination(BasePagination):
+    """
+    DRF sayfalama sınıfı: `?cursor=` (ilk sayfa için boş) ile açılır.
+    Sıralama `ordering` ile sabitlenir; `?ordering=` parametresi bu modda yok sayılır.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-id',)
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+        self.page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 20
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        try:
+            items, self.next_cursor, self.previous_cursor = paginate_keyset(
+                queryset,
+                self.ordering,
+                cursor=request.query_params.get(self.cursor_query_param),
+                page_size=self.get_page_size(request),
+            )
+        except InvalidCursor:
+            raise NotFound('Geçersiz cursor')
+        return items
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, cursor
+        )
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self._link(self.next_cursor)),
+            ('previous', self._link(self.previous_cursor)),
+            ('results', data),
+        ]))
+
+
+class OptionalCursorPaginationMixin:
+    """
+    İstekte `cursor` parametresi varsa keyset sayfalama, yoksa varsayılan
+    (sayfa numaralı) sayfalama kullanılır.
+    """
+    cursor_pagination_class = KeysetPagination
+    cursor_ordering = ('-id',)
+
+    @property
+    def cursor_mode(self):
+        request = getattr(self, 'request', None)
+        return (
+            request is not None
+            and self.cursor_pagination_class.cursor_query_param in request.query_params
+        )
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and self.cursor_mode:
+            self._paginator = self.cursor_pagination_class(ordering=self.cursor_ordering)
+        return super().paginator
+
+
+def estimated_count(queryset, exact_limit=None):
+    """
+    `(sayı, tahmini_mi)` döndürür. PostgreSQL'de planlayıcının satır tahmini
+    `exact_limit`i aşıyorsa COUNT(*) atılmadan tahmin kullanılır; diğer
+    veritabanlarında ve küçük kümelerde kesin sayı döner.
+    """
+    if exact_limit and connections[queryset.db].vendor == 'postgresql':
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        estimate = int(plan[0]['Plan']['Plan Rows'])
+        if estimate > exact_limit:
+            return estimate, True
+    return queryset.count(), False
+
+
+class EstimatedCountPaginator(Paginator):
+    """Büyük tablolarda tahmini sayı kullanan Django Paginator"""
+
+    def __init__(self, object_list, per_page, exact_count_limit=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.exact_count_limit = exact_count_limit
+        self.count_estimated = False
+
+    @cached_property
+    def count(self):
+        count, self.count_estimated = estimated_count(self.object_list, self.exact_count_limit)
+        return count
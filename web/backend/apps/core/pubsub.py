@@ -0,0 +1,187 @@
+"""
+Yayın/abonelik (pub/sub) katmanı
+
+Senkron koddan (sinyaller, servisler) kanallara olay yayınlanır; ASGI
+tarafındaki akış (stream) görünümleri asenkron olarak abone olur.
+
+- `InProcessBroker`: tek process içinde, asyncio kuyruklarıyla dağıtım
+  (testler ve Redis'siz kurulumlar için).
+- `RedisBroker`: process'ler arası dağıtım için Redis PUBLISH/SUBSCRIBE.
+
+Kullanılacak arka uç `PUBSUB_BACKEND` ayarıyla seçilir ('memory' | 'redis').
+"""
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Yavaş bir abonenin kuyruğunda bekleyebilecek en fazla olay; taşanlar atılır
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class InProcessSubscription:
+    def __init__(self, broker, channels):
+        self._broker = broker
+        self.channels = tuple(channels)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def _deliver(self, channel, message):
+        try:
+            self.queue.put_nowait((channel, message))
+        except asyncio.QueueFull:
+            logger.warning(f"Abone kuyruğu dolu, '{channel}' olayı atıldı")
+
+    async def get(self, timeout):
+        """Sıradaki (kanal, mesaj); `timeout` saniye içinde gelmezse None"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self):
+        self._broker._unsubscribe(self)
+
+
+class InProcessBroker:
+    """Aynı process'teki abonelere olay iletir; yayın herhangi bir thread'den yapılabilir"""
+
+    def __init__(self):
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+    def publish_many(self, messages):
+        """[(kanal, mesaj)] - mesajlar JSON'a çevrilebilir olmalıdır"""
+        with self._lock:
+            targets = [
+                (subscription, channel, message)
+                for channel, message in messages
+                for subscription in self._subscriptions.get(channel, ())
+            ]
+        for subscription, channel, message in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, channel, message)
+            except RuntimeError:
+                # Abonenin event loop'u kapanmış
+                subscription._broker._unsubscribe(subscription)
+
+    def publish(self, channel, message):
+        self.publish_many([(channel, message)])
+
+    async def subscribe(self, channels):
+        subscription = InProcessSubscription(self, channels)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscriptions.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscriptions[channel]
+
+
+class RedisSubscription:
+    def __init__(self, pubsub, channels):
+        self._pubsub = pubsub
+        self.channels = tuple(channels)
+
+    async def get(self, timeout):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+            if message is not None and message['type'] == 'message':
+                return message['channel'], json.loads(message['data'])
+
+    async def close(self):
+        # Paylaşılan istemci açık kalır; PubSub bağlantısı havuza döner
+        try:
+            await self._pubsub.unsubscribe()
+        finally:
+            await self._pubsub.aclose()
+
+
+class RedisBroker:
+    """Redis PUBLISH/SUBSCRIBE üzerinden process'ler arası dağıtım"""
+
+    def __init__(self, url):
+        import redis
+        import redis.asyncio
+
+        self.url = url
+        self._client = redis.Redis.from_url(url)
+        self._async_redis = redis.asyncio.Redis
+        self._async_client = None
+        self._async_loop = None
+
+    def publish_many(self, messages):
+        pipeline = self._client.pipeline(transaction=False)
+        for channel, message in messages:
+            pipeline.publish(channel, json.dumps(message, ensure_ascii=False))
+        pipeline.execute()
+
+    def publish(self, channel, message):
+        self.publish_many([(channel, message)])
+
+    def _get_async_client(self):
+        """
+        Aboneler için event loop başına tek asenkron istemci (tek bağlantı
+        havuzu); her abone bundan kendi PubSub'ını alır. Bağlantılar loop'a
+        bağlı olduğundan loop değişirse istemci yeniden oluşturulur.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = self._async_redis.from_url(self.url, decode_responses=True)
+            self._async_loop = loop
+        return self._async_client
+
+    async def subscribe(self, channels):
+        pubsub = self._get_async_client().pubsub()
+        await pubsub.subscribe(*channels)
+        return RedisSubscription(pubsub, channels)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Ayarlara göre process başına tek broker"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                backend = getattr(settings, 'PUBSUB_BACKEND', 'memory')
+                if backend == 'redis':
+                    _broker = RedisBroker(settings.PUBSUB_REDIS_URL)
+                elif backend == 'memory':
+                    _broker = InProcessBroker()
+                else:
+                    raise ValueError(f"Bilinmeyen PUBSUB_BACKEND: {backend}")
+    return _broker
+
+
+def publish_many(messages):
+    """
+    Olayları yayınlar. Yayın hatası çağıran işlemi bozmaz (abonelerin olayı
+    kaçırması, kaydın başarısız olmasından iyidir); sadece loglanır.
+    """
+    if not messages:
+        return
+    try:
+        get_broker().publish_many(messages)
+    except Exception as e:
+        logger.warning(f"Olay yayınlanamadı: {str(e)}")
@@ -0,0 +1,74 @@
+"""
+Metin arama yardımcıları
+
+PostgreSQL'de `icontains` sorgusu `UPPER("kolon"::text) LIKE UPPER('%x%')`
+üretir. pg_trgm GIN expression index'leri tam bu ifade üzerine kurulduğunda
+aynı ORM sorgusu sıralı tarama yerine index kullanır. Diğer veritabanlarında
+index oluşturulmaz; sorgular önceki gibi çalışır.
+"""
+from django.db import migrations
+from django.db.models import Q
+
+
+def contains_any(fields, value):
+    """Alanlardan herhangi biri `value` içeriyorsa eşleşen Q (icontains OR)"""
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__icontains': value})
+    return condition
+
+
+# Türkçe büyük/küçük harf katlaması: Python'un lower()'ı 'I' -> 'i', 'İ' -> 'i̇' üretir
+TURKISH_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+# Aksan sadeleştirme: Türkçe klavyesi olmayan kullanıcılar 'sahin' ile 'Şahin'i bulabilsin
+TURKISH_ASCII = str.maketrans({
+    'ı': 'i', 'ş': 's', 'ğ': 'g', 'ü': 'u', 'ö': 'o', 'ç': 'c',
+    'â': 'a', 'î': 'i', 'û': 'u',
+})
+
+
+def normalize_search_text(*values):
+    """
+    Arama kolonu ve arama terimi için ortak normalizasyon:
+    Türkçe küçük harfe çevirme (İ/ı doğru), aksanları sadeleştirme, boşlukları tekleme.
+    """
+    text = ' '.join(str(value) for value in values if value)
+    text = text.translate(TURKISH_LOWER).lower().translate(TURKISH_ASCII)
+    return ' '.join(text.split())
+
+
+def trigram_index_name(table, column):
+    return f'{table}_{column}_trgm'
+
+
+def trigram_indexes(table, columns, case_insensitive=True):
+    """
+    Migration operasyonu: PostgreSQL'de pg_trgm eklentisini ve
+    `UPPER(kolon::text) gin_trgm_ops` index'lerini oluşturur, diğer
+    veritabanlarında hiçbir şey yapmaz. (PostgreSQL 13+ sürümlerinde pg_trgm
+    "trusted" eklentidir; veritabanı sahibi oluşturabilir.)
+    Önceden normalize edilmiş kolonlar `contains` ile arandığından
+    `case_insensitive=False` ile `kolon::text` üzerine kurulur.
+    """
+    def forward(apps, schema_editor):
+        connection = schema_editor.connection
+        if connection.vendor != 'postgresql':
+            return
+        quote = connection.ops.quote_name
+        expression = 'UPPER(%s::text)' if case_insensitive else '%s::text'
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for column in columns:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {quote(trigram_index_name(table, column))} '
+                f'ON {quote(table)} USING gin (({expression % quote(column)}) gin_trgm_ops)'
+            )
+
+    def backward(apps, schema_editor):
+        connection = schema_editor.connection
+        if connection.vendor != 'postgresql':
+            return
+        quote = connection.ops.quote_name
+        for column in columns:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {quote(trigram_index_name(table, column))}')
+
+    return migrations.RunPython(forward, backward)
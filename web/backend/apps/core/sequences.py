@@ -0,0 +1,249 @@
+"""
+Numara serisi dağıtıcısı (AYK000000000, G000000000 ...)
+
+PostgreSQL'de native SEQUENCE, diğer veritabanlarında `NumberSequence` sayaç
+tablosu kullanılır. Her process numaraları blok halinde rezerve edip bellekten
+dağıtır; böylece kayıt başına tablo taraması ya da kilit beklemesi olmaz.
+
+PostgreSQL SEQUENCE'ları migration'da oluşturulup mevcut veriden beslenir
+(bkz. `sequence_migration`); çalışma anında DDL çalıştırılmaz. Sayaç tablosu
+transaction'a bağlı olduğundan dış bir transaction içinde havuza blok alınmaz:
+dış transaction geri alınırsa sayaç da geri döner, havuzdaki blok başka
+process'lere yeniden verilirdi.
+"""
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.db import IntegrityError, connections, migrations, router, transaction
+from django.db.models import F
+
+from .models import NumberSequence
+
+
+# Kayıtlı seriler (ad -> SequenceAllocator)
+_registry = {}
+
+
+def get_sequence(name):
+    """Ada göre kayıtlı seriyi döndürür"""
+    return _registry[name]
+
+
+def all_sequences():
+    """Tüm kayıtlı serileri döndürür"""
+    return list(_registry.values())
+
+
+class SequenceAllocator:
+    """Prefix + sabit uzunlukta sayıdan oluşan numaraları blok halinde dağıtır"""
+
+    def __init__(self, name, model, field, prefix, width=9, block_size=None):
+        self.name = name
+        self.model_label = model
+        self.field = field
+        self.prefix = prefix
+        self.width = width
+        self._block_size = block_size
+        self._lock = threading.Lock()
+        self._pool = deque()
+        _registry[name] = self
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def block_size(self):
+        return self._block_size or getattr(settings, 'NUMBER_SEQUENCE_BLOCK_SIZE', 20)
+
+    @property
+    def db_sequence_name(self):
+        return db_sequence_name(self.name)
+
+    def format(self, value):
+        """Sayıyı seri formatına çevirir (ör. 5 -> AYK000000005)"""
+        return f"{self.prefix}{value:0{self.width}d}"
+
+    def parse(self, number):
+        """Seri numarasının sayı kısmını döndürür, format dışıysa None"""
+        if not number or not number.startswith(self.prefix):
+            return None
+        digits = number[len(self.prefix):]
+        return int(digits) if digits.isdigit() else None
+
+    def next_number(self):
+        """Process havuzundan sıradaki numarayı verir, havuz boşsa yeni blok rezerve eder"""
+        with self._lock:
+            if not self._pool:
+                if not self._can_pool():
+                    return self.format(self._reserve(1)[0])
+                self._pool.extend(self._reserve(self.block_size))
+            return self.format(self._pool.popleft())
+
+    def allocate(self, count):
+        """Toplu işlemler için `count` adet numarayı tek seferde rezerve eder"""
+        if count < 1:
+            raise ValueError("En az bir numara istenmelidir")
+        if count == 1:
+            return [self.next_number()]
+        return [self.format(value) for value in self._reserve(count)]
+
+    def _can_pool(self):
+        """
+        Rezerve edilen blok havuzda tutulabilir mi? SEQUENCE geri alınmaz; sayaç
+        tablosu ise dış transaction (ATOMIC_REQUESTS, toplu işlem ...) geri
+        alınırsa eski değerine döner, havuzda kalan blok çift dağıtılırdı.
+        """
+        connection = connections[router.db_for_write(self.model)]
+        return connection.vendor == 'postgresql' or not connection.in_atomic_block
+
+    def save_with_number(self, instance, save, using=None, retries=3):
+        """
+        Örneğe seriden numara atayıp `save()` çağırır. Numara başka bir kayıtta
+        kullanılıyorsa (eski blok, elle girilmiş numara) seriyi hizalayıp yeniden dener.
+        """
+        for attempt in range(retries):
+            number = self.next_number()
+            setattr(instance, self.field, number)
+            try:
+                with transaction.atomic(using=using):
+                    save()
+                return number
+            except IntegrityError:
+                collided = self.model._default_manager.filter(**{self.field: number}).exists()
+                setattr(instance, self.field, '')
+                if not collided or attempt == retries - 1:
+                    raise
+                self.reseed()
+
+    def reset(self):
+        """Process havuzunu boşaltır (rezerve edilmiş ama kullanılmamış numaralar atlanır)"""
+        with self._lock:
+            self._pool.clear()
+
+    def scan_max(self, using=None):
+        """Tablodaki en büyük numarayı bulur (sadece seed/reseed sırasında kullanılır)"""
+        using = using or router.db_for_write(self.model)
+        last = self.model._default_manager.using(using).filter(
+            **{f'{self.field}__startswith': self.prefix}
+        ).order_by(self.field).values_list(self.field, flat=True).last()
+        value = self.parse(last)
+        return value if value is not None else -1
+
+    def reseed(self):
+        """
+        Sayacı mevcut verideki en büyük numaraya çeker ve process havuzunu boşaltır.
+        Sayaç hiçbir zaman geri alınmaz; başka process'lerin bloklarıyla çakışma olmaz.
+        """
+        using = router.db_for_write(self.model)
+        connection = connections[using]
+        current_max = self.scan_max(using)
+        self.reset()
+
+        if connection.vendor == 'postgresql':
+            if current_max >= 0:
+                # Rezervasyonlarla aynı kilit: blok ortasında geri alınmaz
+                with self._advisory_lock(connection) as cursor:
+                    seq = connection.ops.quote_name(self.db_sequence_name)
+                    cursor.execute(
+                        f"SELECT setval(%s, GREATEST(%s, (SELECT last_value FROM {seq})))",
+                        [self.db_sequence_name, current_max]
+                    )
+        else:
+            with transaction.atomic(using=using):
+                NumberSequence.objects.using(using).get_or_create(
+                    name=self.name, defaults={'last_value': current_max}
+                )
+                NumberSequence.objects.using(using).filter(
+                    name=self.name, last_value__lt=current_max
+                ).update(last_value=current_max)
+
+        return current_max
+
+    def _reserve(self, count):
+        """Veritabanından `count` adet ardışık sayı rezerve eder"""
+        using = router.db_for_write(self.model)
+        connection = connections[using]
+        if connection.vendor == 'postgresql':
+            return self._reserve_postgresql(connection, count)
+        return self._reserve_counter(using, count)
+
+    def _reserve_counter(self, using, count):
+        queryset = NumberSequence.objects.using(using).filter(name=self.name)
+        with transaction.atomic(using=using):
+            # Önce UPDATE: satır kilidi hemen alınır (SQLite'ta SELECT ... FOR UPDATE yok)
+            if not queryset.update(last_value=F('last_value') + count):
+                NumberSequence.objects.using(using).get_or_create(
+                    name=self.name, defaults={'last_value': self.scan_max(using)}
+                )
+                queryset.update(last_value=F('last_value') + count)
+            last_value = queryset.select_for_update().values_list('last_value', flat=True).get()
+        return range(last_value - count + 1, last_value + 1)
+
+    @contextmanager
+    def _advisory_lock(self, connection):
+        """
+        Seri başına oturum seviyesinde advisory lock. `pg_advisory_xact_lock`
+        dış transaction içinde (savepoint) commit'e kadar tutulurdu; bu kilit
+        SEQUENCE işlemi biter bitmez bırakılır.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_lock(hashtext(%s))", [self.db_sequence_name])
+            try:
+                # nextval/setval geri alınmaz; savepoint hata sonrası kilidin bırakılabilmesi için
+                with transaction.atomic(using=connection.alias):
+                    yield cursor
+            finally:
+                cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", [self.db_sequence_name])
+
+    def _reserve_postgresql(self, connection, count):
+        """
+        Ardışık `count` sayıyı rezerve eder. Eşzamanlı `nextval` çağrıları
+        iç içe geçebildiğinden (generate_series ile ardışıklık garanti değildir)
+        seri başına advisory lock altında başlangıç alınıp SEQUENCE blok
+        sonuna ilerletilir.
+        """
+        with self._advisory_lock(connection) as cursor:
+            cursor.execute("SELECT nextval(%s)", [self.db_sequence_name])
+            start = cursor.fetchone()[0]
+            if count > 1:
+                cursor.execute("SELECT setval(%s, %s)", [self.db_sequence_name, start + count - 1])
+        return range(start, start + count)
+
+def db_sequence_name(name):
+    return f"{name}_seq"
+
+
+def sequence_migration(name, table, column, prefix):
+    """
+    Migration operasyonu: PostgreSQL'de seriye ait SEQUENCE'ı oluşturur ve
+    tablodaki en büyük numaradan sonrasına ayarlar (önceden oluşturulmuşsa
+    geri alınmaz). Diğer veritabanlarında `NumberSequence` sayacı ilk
+    rezervasyonda oluştuğundan hiçbir şey yapmaz.
+    """
+    def forward(apps, schema_editor):
+        connection = schema_editor.connection
+        if connection.vendor != 'postgresql':
+            return
+        quote = connection.ops.quote_name
+        seq = quote(db_sequence_name(name))
+        schema_editor.execute(f"CREATE SEQUENCE IF NOT EXISTS {seq} MINVALUE 0 START WITH 0")
+        schema_editor.execute(
+            f"SELECT setval(%s, GREATEST("
+            f"COALESCE((SELECT MAX(CAST(SUBSTRING({quote(column)} FROM %s) AS bigint)) "
+            f"FROM {quote(table)} WHERE {quote(column)} ~ %s), -1) + 1, "
+            f"(SELECT CASE WHEN is_called THEN last_value + 1 ELSE last_value END FROM {seq})"
+            f"), false)",
+            [db_sequence_name(name), len(prefix) + 1, f'^{prefix}[0-9]+$']
+        )
+
+    def backward(apps, schema_editor):
+        connection = schema_editor.connection
+        if connection.vendor != 'postgresql':
+            return
+        schema_editor.execute(f"DROP SEQUENCE IF EXISTS {connection.ops.quote_name(db_sequence_name(name))}")
+
+    return migrations.RunPython(forward, backward)
@@ -1,3 +1,214 @@
+import asyncio
+import sys
+import types
+from unittest.mock import patch
+
+from django.conf import settings
 from django.test import TestCase
+from apps.cargo.models import Kargo
+from apps.volunteers.models import Volunteer
+from .choices import ChoiceSet, SEHIR, KARGO_DURUM, GONULLU_TIPI, KARGO_ICERIK, get_choices
+from .pubsub import InProcessBroker, RedisBroker, SUBSCRIBER_QUEUE_SIZE
+
+
+class ChoiceRegistryTest(TestCase):
+    """Ortak seçenek kayıt defteri testleri"""
+
+    def test_city_list(self):
+        """81 il plaka sırasıyla tutulur, iki model aynı listeyi kullanır"""
+        self.assertEqual(len(SEHIR), 81)
+        self.assertEqual(SEHIR.index['istanbul'] + 1, 34)
+        self.assertEqual(SEHIR.index['duzce'] + 1, 81)
+        self.assertEqual(set(Kargo.SEHIR_CHOICES), set(Volunteer.SEHIR_CHOICES))
+        self.assertEqual(list(Kargo.SEHIR_CHOICES), sorted(SEHIR.choices))
+
+    def test_lookups(self):
+        """Kod -> etiket, etiket -> kod ve üyelik aramaları"""
+        self.assertEqual(SEHIR.label('sanliurfa'), 'Şanlıurfa')
+        self.assertEqual(SEHIR.code('Şanlıurfa'), 'sanliurfa')
+        self.assertEqual(SEHIR.label('bilinmeyen'), 'bilinmeyen')
+        self.assertIsNone(SEHIR.label(None))
+        self.assertIn('yolda', KARGO_DURUM)
+        self.assertNotIn('kayip', KARGO_DURUM)
+        self.assertIs(get_choices('gonullu_tipi'), GONULLU_TIPI)
+
+    def test_mappings_are_immutable(self):
+        """Eşlemeler salt okunurdur"""
+        with self.assertRaises(TypeError):
+            SEHIR.labels['yeni'] = 'Yeni'
+        with self.assertRaises(TypeError):
+            KARGO_ICERIK['yeni'] = ()
+
+    def test_duplicate_codes_rejected(self):
+        with self.assertRaises(ValueError):
+            ChoiceSet('tekrar', [('a', 'A'), ('a', 'B')])
+
+    def test_model_display_methods(self):
+        """Model get_FOO_display metotları kayıt defterini kullanır"""
+        kargo = Kargo(durum='teslim_edildi', kargo_tipi='ilac', cikis_yeri='igdir', ulasacagi_yer='hakkari')
+        self.assertEqual(kargo.get_durum_display(), 'Teslim Edildi')
+        self.assertEqual(kargo.get_kargo_tipi_display(), 'İlaç')
+        self.assertEqual(kargo.get_cikis_yeri_display(), 'Iğdır')
+        self.assertEqual(kargo.get_ulasacagi_yer_display(), 'Hakkâri')
+        volunteer = Volunteer(sehir='izmir', gonullu_tipi='karma')
+        self.assertEqual(volunteer.get_sehir_display(), 'İzmir')
+        self.assertEqual(volunteer.get_gonullu_tipi_display(), 'Karma Gönüllü (Tüm Görevler)')
+
+
+class InProcessBrokerTest(TestCase):
+    """Process içi pub/sub testleri"""
+
+    async def test_publish_reaches_subscribed_channels_only(self):
+        broker = InProcessBroker()
+        subscription = await broker.subscribe(['a', 'b'])
+        broker.publish_many([('a', {'n': 1}), ('c', {'n': 2}), ('b', {'n': 3})])
+        
+        self.assertEqual(await subscription.get(1), ('a', {'n': 1}))
+        self.assertEqual(await subscription.get(1), ('b', {'n': 3}))
+        self.assertIsNone(await subscription.get(0.01))
+
+    async def test_publish_from_another_thread(self):
+        """Senkron koddan (başka thread) yayın abonenin event loop'una aktarılır"""
+        broker = InProcessBroker()
+        subscription = await broker.subscribe(['a'])
+        await asyncio.to_thread(broker.publish, 'a', {'n': 1})
+        self.assertEqual(await subscription.get(1), ('a', {'n': 1}))
+
+    async def test_close_unsubscribes(self):
+        broker = InProcessBroker()
+        subscription = await broker.subscribe(['a'])
+        await subscription.close()
+        self.assertEqual(broker._subscriptions, {})
+        broker.publish('a', {'n': 1})
+        self.assertIsNone(await subscription.get(0.01))
+
+    async def test_full_queue_drops_events(self):
+        """Yavaş abone yayıncıyı bekletmez; taşan olaylar atılır"""
+        broker = InProcessBroker()
+        subscription = await broker.subscribe(['a'])
+        with self.assertLogs('apps.core.pubsub', 'WARNING'):
+            broker.publish_many([('a', {'n': n}) for n in range(SUBSCRIBER_QUEUE_SIZE + 1)])
+            await asyncio.sleep(0)
+        self.assertEqual(subscription.queue.qsize(), SUBSCRIBER_QUEUE_SIZE)
+
+
+class FakeRedis:
+    """redis istemcisi yerine geçen sahte modüller: senkron yayınlar aynı process'teki PubSub'lara düşer"""
+
+    def __init__(self):
+        self.pubsubs = []
+        self.async_clients = []
+        fake = self
+
+        class Pipeline:
+            def __init__(self):
+                self.commands = []
+
+            def publish(self, channel, data):
+                self.commands.append((channel, data))
+
+            def execute(self):
+                for channel, data in self.commands:
+                    for pubsub in fake.pubsubs:
+                        if channel in pubsub.channels:
+                            pubsub.queue.put_nowait({'type': 'message', 'channel': channel, 'data': data})
+
+        class PubSub:
+            def __init__(self):
+                self.channels = set()
+                self.queue = asyncio.Queue()
+                self.closed = False
+                fake.pubsubs.append(self)
+
+            async def subscribe(self, *channels):
+                self.channels.update(channels)
+
+            async def unsubscribe(self):
+                self.channels.clear()
+
+            async def get_message(self, ignore_subscribe_messages=False, timeout=None):
+                try:
+                    return await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    return None
+
+            async def aclose(self):
+                self.closed = True
+
+        class Redis:
+            @classmethod
+            def from_url(cls, url, **kwargs):
+                return cls()
+
+            def pipeline(self, transaction=True):
+                return Pipeline()
+
+        class AsyncRedis:
+            @classmethod
+            def from_url(cls, url, **kwargs):
+                client = cls()
+                fake.async_clients.append(client)
+                return client
+
+            def __init__(self):
+                self.closed = False
+
+            def pubsub(self):
+                return PubSub()
+
+            async def aclose(self):
+                self.closed = True
+
+        self.module = types.ModuleType('redis')
+        self.module.Redis = Redis
+        self.module.asyncio = types.ModuleType('redis.asyncio')
+        self.module.asyncio.Redis = AsyncRedis
+
+    def patch_modules(self):
+        return patch.dict(sys.modules, {'redis': self.module, 'redis.asyncio': self.module.asyncio})
+
+
+class RedisBrokerTest(TestCase):
+    """Redis pub/sub testleri (sahte redis modülüyle)"""
+
+    def setUp(self):
+        self.redis = FakeRedis()
+        with self.redis.patch_modules():
+            self.broker = RedisBroker('redis://localhost:6379/0')
+
+    async def test_publish_fans_out_over_shared_client(self):
+        """Aboneler tek asenkron istemciyi paylaşır, her biri sadece kendi kanallarını alır"""
+        first = await self.broker.subscribe(['a', 'b'])
+        second = await self.broker.subscribe(['a'])
+        self.assertEqual(len(self.redis.async_clients), 1)
+        
+        self.broker.publish_many([('a', {'il': 'Muş'}), ('c', {'n': 2}), ('b', {'n': 3})])
+        self.assertEqual(await first.get(1), ('a', {'il': 'Muş'}))
+        self.assertEqual(await first.get(1), ('b', {'n': 3}))
+        self.assertIsNone(await first.get(0.01))
+        self.assertEqual(await second.get(1), ('a', {'il': 'Muş'}))
+        self.assertIsNone(await second.get(0.01))
+
+    async def test_close_releases_only_the_subscription(self):
+        """Kapanan abonenin PubSub'ı kapanır; paylaşılan istemci ve diğer aboneler etkilenmez"""
+        first = await self.broker.subscribe(['a'])
+        second = await self.broker.subscribe(['a'])
+        await first.close()
+        
+        closed, open_ = self.redis.pubsubs
+        self.assertTrue(closed.closed)
+        self.assertEqual(closed.channels, set())
+        self.assertFalse(open_.closed)
+        self.assertFalse(self.redis.async_clients[0].closed)
+        
+        self.broker.publish('a', {'n': 1})
+        self.assertEqual(await second.get(1), ('a', {'n': 1}))
+        self.assertIsNone(await first.get(0.01))
+
+
+class TestIsolationTest(TestCase):
+    """Testler REDIS_URL tanımlı olsa bile paylaşılan Redis'e bağlanmaz"""
 
-# Create your tests here.
+    def test_cache_and_pubsub_are_process_local(self):
+        self.assertEqual(settings.CACHES['default']['BACKEND'], 'django.core.cache.backends.locmem.LocMemCache')
+        self.assertEqual(settings.PUBSUB_BACKEND, 'memory')
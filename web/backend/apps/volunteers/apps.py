@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class VolunteersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.volunteers'
+    
+    def ready(self):
+        import apps.volunteers.signals  # Signals'ları import et
@@ -0,0 +1,160 @@
+"""
+Gönüllü uygunluk indeksi (process içi)
+
+"Y ilindeki aktif X tipli gönüllüler, iş yüküne göre sıralı" sorusu her atama
+ve öneri ekranında sorulur. Cevap veritabanına gitmeden bu indeksten okunur:
+il -> gönüllü tipi -> (açık kargo sayısı, id) sıralı listesi.
+
+İndeks il bazında tutulur ve her il ilk okunduğunda (2 sorgu) kurulur; process
+başlangıcında veritabanına gidilmez. Her ilin paylaşılan önbellekte ayrı bir
+sürüm anahtarı vardır: Volunteer/Kargo kayıt sinyalleri transaction commit
+edildikten sonra sadece etkilenen gönüllülerin illerinin sürümünü artırır.
+Process'ler bir ili okurken sürüm farkını görürse yalnızca o ili yeniden kurar;
+diğer illerdeki yazmalar indeksi soğutmaz.
+
+Redis yokken sürüm anahtarları her worker'ın kendi belleğindedir ve diğer
+worker'ların yazmaları görülmez; bu yüzden her il indeksi en fazla
+VOLUNTEER_AVAILABILITY_MAX_AGE_SECONDS saniye kullanılıp yeniden kurulur.
+"""
+import heapq
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.core.choices import GONULLU_TIPI
+from .models import Volunteer
+
+logger = logging.getLogger(__name__)
+
+
+VERSION_KEY_PREFIX = 'volunteers:availability:version:'
+
+# Tüm görevleri üstlenebilen tip; diğer tiplerin sorgularına da dahil edilir
+KARMA = 'karma'
+
+ENTRY_FIELDS = ('id', 'gonulluluk_no', 'ad', 'soyad', 'telefon', 'sehir', 'gonullu_tipi')
+
+
+def _version_key(sehir):
+    return f'{VERSION_KEY_PREFIX}{sehir}'
+
+
+def _current_version(sehir):
+    return cache.get(_version_key(sehir), 0)
+
+
+def get_max_age():
+    return getattr(settings, 'VOLUNTEER_AVAILABILITY_MAX_AGE_SECONDS', 30)
+
+
+def _bump_version(sehir):
+    """İlin paylaşılan sürümünü artırır; yeni sürümü döndürür"""
+    key = _version_key(sehir)
+    cache.add(key, 0, None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Anahtar add ile incr arasında silindiyse
+        cache.set(key, 1, None)
+        return 1
+
+
+class CityIndex:
+    """Bir ilin gönüllü tipi -> [(açık kargo, id)] sıralı listeleri ve id -> kayıt eşlemesi"""
+
+    def __init__(self, version, entries):
+        self.version = version
+        self.entries = entries
+        self.loaded_at = time.monotonic()
+        self.buckets = {}
+        for entry in entries.values():
+            self.buckets.setdefault(entry['gonullu_tipi'], []).append((entry['acik_kargo'], entry['id']))
+        for bucket in self.buckets.values():
+            bucket.sort()
+
+    def expired(self, max_age):
+        return time.monotonic() - self.loaded_at >= max_age
+
+    @classmethod
+    def load(cls, sehir, version):
+        from apps.cargo.assignments import open_workloads
+
+        rows = list(Volunteer.objects.filter(is_active=True, sehir=sehir).order_by().values(*ENTRY_FIELDS))
+        workloads = open_workloads(row['id'] for row in rows)
+        entries = {}
+        for row in rows:
+            row['full_name'] = f"{row.pop('ad')} {row.pop('soyad')}"
+            row['acik_kargo'] = workloads[row['id']]
+            entries[row['id']] = row
+        return cls(version, entries)
+
+
+class AvailabilityIndex:
+    """il -> CityIndex; iller ilk okunduklarında ya da sürümleri değiştiğinde kurulur"""
+
+    def __init__(self):
+        self._cities = {}
+        self._lock = threading.Lock()
+
+    def city(self, sehir):
+        """İlin güncel indeksi; sürüm değiştiyse ya da süresi dolduysa yalnızca bu il yeniden kurulur"""
+        version = _current_version(sehir)
+        city = self._cities.get(sehir)
+        if city is None or city.version != version or city.expired(get_max_age()):
+            # Sürüm okunduktan sonra yüklenir: arada gelen değişiklik yeni sürümle yakalanır
+            city = CityIndex.load(sehir, version)
+            with self._lock:
+                self._cities[sehir] = city
+            logger.debug(f"Gönüllü uygunluk indeksi kuruldu: {sehir}, {len(city.entries)} aktif gönüllü (sürüm {version})")
+        return city
+
+    def available(self, sehir, gonullu_tipi, include_karma=True, limit=None):
+        """İldeki aktif gönüllüler, açık kargo sayısına göre artan sırada"""
+        city = self.city(sehir)
+        buckets = [city.buckets.get(gonullu_tipi, [])]
+        if include_karma and gonullu_tipi != KARMA:
+            buckets.append(city.buckets.get(KARMA, []))
+        keys = heapq.merge(*buckets) if len(buckets) > 1 else buckets[0]
+        result = []
+        for _, volunteer_id in keys:
+            if limit is not None and len(result) >= limit:
+                break
+            result.append(dict(city.entries[volunteer_id]))
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._cities = {}
+
+
+availability_index = AvailabilityIndex()
+
+
+def get_available(sehir, gonullu_tipi, include_karma=True, limit=None):
+    if gonullu_tipi not in GONULLU_TIPI:
+        raise ValueError(f"Geçersiz gönüllü tipi: {gonullu_tipi}")
+    return availability_index.available(sehir, gonullu_tipi, include_karma=include_karma, limit=limit)
+
+
+def _apply_change(volunteer_ids, cities):
+    if volunteer_ids:
+        cities |= set(Volunteer.objects.filter(id__in=volunteer_ids).values_list('sehir', flat=True))
+    for sehir in cities:
+        _bump_version(sehir)
+
+
+def volunteers_changed(volunteer_ids=(), cities=()):
+    """
+    Gönüllü kaydı ya da iş yükü değişti. Commit sonrası gönüllülerin bulunduğu
+    illerin (ve `cities` ile verilen illerin, ör. eski il ya da silinen kayıt)
+    sürümü artırılır; diğer illerin indeksleri geçerli kalır.
+    """
+    volunteer_ids = {volunteer_id for volunteer_id in volunteer_ids if volunteer_id}
+    cities = {sehir for sehir in cities if sehir}
+    if not volunteer_ids and not cities:
+        return
+    transaction.on_commit(lambda: _apply_change(volunteer_ids, cities))
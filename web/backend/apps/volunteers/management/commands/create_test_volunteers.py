@@ -5,7 +5,7 @@ Usage: python manage.py create_test_volunteers
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
 from django.db import transaction
-from apps.volunteers.models import Volunteer
+from apps.volunteers.models import Volunteer, VOLUNTEER_NO_SEQUENCE
 import random
 import uuid
 
@@ -78,6 +78,9 @@ class Command(BaseCommand):
         skipped_count = 0
         error_count = 0
 
+        # Reserve all volunteer numbers up front (one counter update instead of one per volunteer)
+        volunteer_numbers = VOLUNTEER_NO_SEQUENCE.allocate(count) if count > 0 else []
+
         for i in range(count):
             try:
                 # Generate unique username
@@ -106,6 +109,7 @@ class Command(BaseCommand):
                     # Create Volunteer
                     volunteer = Volunteer.objects.create(
                         user=user,
+                        gonulluluk_no=volunteer_numbers[i],
                         ad=first_name,
                         soyad=last_name,
                         telefon=f'{random.randint(5000000000, 5999999999)}',  # 5XXXXXXXXX format
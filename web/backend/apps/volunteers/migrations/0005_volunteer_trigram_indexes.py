@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from apps.core.search import trigram_indexes
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("volunteers", "0004_alter_volunteer_gonulluluk_no"),
+    ]
+
+    # PostgreSQL: gönüllü ad/soyad/numara icontains aramaları için pg_trgm index'leri
+    operations = [
+        trigram_indexes("volunteers", ["ad", "soyad", "gonulluluk_no"]),
+    ]
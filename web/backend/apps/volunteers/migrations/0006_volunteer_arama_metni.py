@@ -0,0 +1,49 @@
+# Generated by Django 5.1.1 on 2026-10-18 11:27
+
+from django.db import migrations, models
+
+from apps.core.search import normalize_search_text, trigram_indexes
+
+
+SEARCH_SOURCE_FIELDS = ("ad", "soyad", "gonulluluk_no", "telefon")
+
+
+def fill_search_text(apps, schema_editor):
+    """Mevcut gönüllülerin arama metnini doldur"""
+    Volunteer = apps.get_model("volunteers", "Volunteer")
+    batch = []
+    for volunteer in Volunteer.objects.only("id", *SEARCH_SOURCE_FIELDS).iterator(
+        chunk_size=1000
+    ):
+        volunteer.arama_metni = normalize_search_text(
+            *(getattr(volunteer, field) for field in SEARCH_SOURCE_FIELDS)
+        )
+        batch.append(volunteer)
+        if len(batch) >= 1000:
+            Volunteer.objects.bulk_update(batch, ["arama_metni"])
+            batch = []
+    if batch:
+        Volunteer.objects.bulk_update(batch, ["arama_metni"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("volunteers", "0005_volunteer_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="volunteer",
+            name="arama_metni",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                max_length=255,
+                verbose_name="Arama Metni",
+            ),
+        ),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+        # PostgreSQL: normalize kolon `contains` ile arandığından UPPER'sız trigram index
+        trigram_indexes("volunteers", ["arama_metni"], case_insensitive=False),
+    ]
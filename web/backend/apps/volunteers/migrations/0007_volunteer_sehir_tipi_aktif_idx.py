@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-18 12:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("volunteers", "0006_volunteer_arama_metni"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="volunteer",
+            index=models.Index(
+                fields=["sehir", "gonullu_tipi", "is_active"],
+                name="volunteer_sehir_tipi_aktif_idx",
+            ),
+        ),
+    ]
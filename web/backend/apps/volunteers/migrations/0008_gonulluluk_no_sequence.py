@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from apps.core.sequences import sequence_migration
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("volunteers", "0007_volunteer_sehir_tipi_aktif_idx"),
+    ]
+
+    # PostgreSQL: VOLUNTEER_NO_SEQUENCE için native SEQUENCE (mevcut en büyük numaradan devam eder)
+    operations = [
+        sequence_migration("gonulluluk_no", "volunteers", "gonulluluk_no", "G"),
+    ]
@@ -1,7 +1,18 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import RegexValidator
-from django.db import transaction
+from apps.core.choices import SEHIR, GONULLU_TIPI
+from apps.core.search import normalize_search_text
+from apps.core.sequences import SequenceAllocator
+
+
+# Gönüllülük numarası serisi (G000000000) - process başına blok rezervasyonu
+VOLUNTEER_NO_SEQUENCE = SequenceAllocator(
+    name='gonulluluk_no',
+    model='volunteers.Volunteer',
+    field='gonulluluk_no',
+    prefix='G',
+)
 
 
 class Volunteer(models.Model):
@@ -41,89 +52,7 @@ class Volunteer(models.Model):
     )
     
     # Konum Bilgileri
-    SEHIR_CHOICES = [
-        ('adana', 'Adana'),
-        ('adiyaman', 'Adıyaman'),
-        ('afyonkarahisar', 'Afyonkarahisar'),
-        ('agri', 'Ağrı'),
-        ('amasya', 'Amasya'),
-        ('ankara', 'Ankara'),
-        ('antalya', 'Antalya'),
-        ('artvin', 'Artvin'),
-        ('aydin', 'Aydın'),
-        ('balikesir', 'Balıkesir'),
-        ('bilecik', 'Bilecik'),
-        ('bingol', 'Bingöl'),
-        ('bitlis', 'Bitlis'),
-        ('bolu', 'Bolu'),
-        ('burdur', 'Burdur'),
-        ('bursa', 'Bursa'),
-        ('canakkale', 'Çanakkale'),
-        ('cankiri', 'Çankırı'),
-        ('corum', 'Çorum'),
-        ('denizli', 'Denizli'),
-        ('diyarbakir', 'Diyarbakır'),
-        ('edirne', 'Edirne'),
-        ('elazig', 'Elazığ'),
-        ('erzincan', 'Erzincan'),
-        ('erzurum', 'Erzurum'),
-        ('eskisehir', 'Eskişehir'),
-        ('gaziantep', 'Gaziantep'),
-        ('giresun', 'Giresun'),
-        ('gumushane', 'Gümüşhane'),
-        ('hakkari', 'Hakkâri'),
-        ('hatay', 'Hatay'),
-        ('isparta', 'Isparta'),
-        ('mersin', 'Mersin'),
-        ('istanbul', 'İstanbul'),
-        ('izmir', 'İzmir'),
-        ('kars', 'Kars'),
-        ('kastamonu', 'Kastamonu'),
-        ('kayseri', 'Kayseri'),
-        ('kirklareli', 'Kırklareli'),
-        ('kirsehir', 'Kırşehir'),
-        ('kocaeli', 'Kocaeli'),
-        ('konya', 'Konya'),
-        ('kutahya', 'Kütahya'),
-        ('malatya', 'Malatya'),
-        ('manisa', 'Manisa'),
-        ('kahramanmaras', 'Kahramanmaraş'),
-        ('mardin', 'Mardin'),
-        ('mugla', 'Muğla'),
-        ('mus', 'Muş'),
-        ('nevsehir', 'Nevşehir'),
-        ('nigde', 'Niğde'),
-        ('ordu', 'Ordu'),
-        ('rize', 'Rize'),
-        ('sakarya', 'Sakarya'),
-        ('samsun', 'Samsun'),
-        ('siirt', 'Siirt'),
-        ('sinop', 'Sinop'),
-        ('sivas', 'Sivas'),
-        ('tekirdag', 'Tekirdağ'),
-        ('tokat', 'Tokat'),
-        ('trabzon', 'Trabzon'),
-        ('tunceli', 'Tunceli'),
-        ('sanliurfa', 'Şanlıurfa'),
-        ('usak', 'Uşak'),
-        ('van', 'Van'),
-        ('yozgat', 'Yozgat'),
-        ('zonguldak', 'Zonguldak'),
-        ('aksaray', 'Aksaray'),
-        ('bayburt', 'Bayburt'),
-        ('karaman', 'Karaman'),
-        ('kirikkale', 'Kırıkkale'),
-        ('batman', 'Batman'),
-        ('sirnak', 'Şırnak'),
-        ('bartin', 'Bartın'),
-        ('ardahan', 'Ardahan'),
-        ('igdir', 'Iğdır'),
-        ('yalova', 'Yalova'),
-        ('karabuk', 'Karabük'),
-        ('kilis', 'Kilis'),
-        ('osmaniye', 'Osmaniye'),
-        ('duzce', 'Düzce'),
-    ]
+    SEHIR_CHOICES = SEHIR.choices
     
     sehir = models.CharField(
         max_length=50,
@@ -132,12 +61,7 @@ class Volunteer(models.Model):
     )
     
     # Gönüllülük Bilgileri
-    GONULLU_TIPI_CHOICES = [
-        ('toplama', 'Toplama Gönüllüsü'),
-        ('tasima', 'Taşıma Gönüllüsü'),
-        ('dagitim', 'Dağıtım Gönüllüsü'),
-        ('karma', 'Karma Gönüllü (Tüm Görevler)'),
-    ]
+    GONULLU_TIPI_CHOICES = GONULLU_TIPI.choices
     
     gonullu_tipi = models.CharField(
         max_length=20,
@@ -162,35 +86,83 @@ class Volunteer(models.Model):
         verbose_name='Son Güncelleme'
     )
     
+    # Arama kolonu - ad/soyad/numara/telefonun normalize edilmiş hali (bkz. apps.core.search)
+    arama_metni = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name='Arama Metni'
+    )
+    
+    # arama_metni'ni oluşturan alanlar
+    SEARCH_SOURCE_FIELDS = ('ad', 'soyad', 'gonulluluk_no', 'telefon')
+    
     class Meta:
         verbose_name = 'Gönüllü'
         verbose_name_plural = 'Gönüllüler'
         ordering = ['-created_at']
         db_table = 'volunteers'
+        indexes = [
+            # İl + tip bazlı aktif gönüllü aramaları (uygunluk indeksi, eşleştirme adayları)
+            models.Index(fields=['sehir', 'gonullu_tipi', 'is_active'], name='volunteer_sehir_tipi_aktif_idx'),
+        ]
     
     def __str__(self):
         return f"{self.gonulluluk_no} - {self.ad} {self.soyad}"
     
+    # Etiketler ortak kayıt defterinden (apps.core.choices) O(1) okunur
+    def get_sehir_display(self):
+        return SEHIR.label(self.sehir)
+    
+    def get_gonullu_tipi_display(self):
+        return GONULLU_TIPI.label(self.gonullu_tipi)
+    
+    def build_search_text(self):
+        return normalize_search_text(*(getattr(self, field) for field in self.SEARCH_SOURCE_FIELDS))
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Uygunluk indeksi için yüklenme anındaki il (bkz. signals.store_old_city)
+        if 'sehir' in field_names:
+            instance._loaded_sehir = values[list(field_names).index('sehir')]
+        return instance
+    
+    def get_loaded_sehir(self):
+        """Veritabanındaki (son okunan/kaydedilen) il; yeni kayıtta None, yüklenmediyse okunur"""
+        if self._state.adding or self.pk is None:
+            return None
+        if hasattr(self, '_loaded_sehir'):
+            return self._loaded_sehir
+        return type(self)._default_manager.filter(pk=self.pk).values_list('sehir', flat=True).first()
+    
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if fields is None or 'sehir' in fields:
+            self._loaded_sehir = self.sehir
+    
     def save(self, *args, **kwargs):
-        if not self.gonulluluk_no:
-            # Sequential gönüllülük numarası üretimi (G000000000 formatında)
-            with transaction.atomic():
-                # Son gönüllü numarasını bul
-                last_volunteer = Volunteer.objects.filter(
-                    gonulluluk_no__startswith='G'
-                ).order_by('gonulluluk_no').last()
-                
-                if last_volunteer and last_volunteer.gonulluluk_no:
-                    # Son numaradan sonraki numarayı al
-                    last_number = int(last_volunteer.gonulluluk_no[1:])  # G'yi çıkar
-                    next_number = last_number + 1
-                else:
-                    # İlk gönüllü
-                    next_number = 0
-                
-                # G000000000 formatında oluştur (9 haneli, sıfırlarla doldur)
-                self.gonulluluk_no = f"G{next_number:09d}"
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & set(self.SEARCH_SOURCE_FIELDS):
+            kwargs['update_fields'] = set(update_fields) | {'arama_metni'}
+        
+        def _save():
+            # Numara save_with_number içinde atandığı için arama metni en son hesaplanır
+            self.arama_metni = self.build_search_text()
+            super(Volunteer, self).save(*args, **kwargs)
+        
+        if self.gonulluluk_no:
+            _save()
+        else:
+            # Sequential gönüllülük numarası (G000000000) seriden alınır, çakışmada yeniden denenir
+            VOLUNTEER_NO_SEQUENCE.save_with_number(
+                self,
+                _save,
+                using=kwargs.get('using')
+            )
+        if update_fields is None or 'sehir' in update_fields:
+            self._loaded_sehir = self.sehir
     
     @property
     def full_name(self):
@@ -0,0 +1,22 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import Volunteer
+from .availability import volunteers_changed
+
+
+@receiver(pre_save, sender=Volunteer)
+def store_old_city(sender, instance, **kwargs):
+    """Eski ili sakla (yüklenme anındaki görüntüden): il değişirse iki ilin uygunluk indeksi de tazelenir"""
+    instance._old_sehir = instance.get_loaded_sehir()
+
+
+@receiver(post_save, sender=Volunteer)
+def refresh_availability(sender, instance, **kwargs):
+    """Gönüllü kaydı değişti - bulunduğu (ve önceki) ilin uygunluk indeksini güncelle"""
+    volunteers_changed(cities={instance.sehir, getattr(instance, '_old_sehir', None)})
+
+
+@receiver(post_delete, sender=Volunteer)
+def refresh_availability_on_delete(sender, instance, **kwargs):
+    """Silinen gönüllünün ilinin uygunluk indeksini güncelle"""
+    volunteers_changed(cities={instance.sehir})
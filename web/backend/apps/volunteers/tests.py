@@ -1,3 +1,307 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from rest_framework import status
+from apps.core.models import NumberSequence
+from apps.cargo.models import Kargo
+from apps.cargo.transitions import transition_status
+from . import availability
+from .availability import availability_index
+from .models import Volunteer, VOLUNTEER_NO_SEQUENCE
 
-# Create your tests here.
+
+class VolunteerNumberSequenceTest(TransactionTestCase):
+    """Gönüllülük numarası serisi testleri (havuz sadece transaction dışında dolar)"""
+    
+    def setUp(self):
+        VOLUNTEER_NO_SEQUENCE.reset()
+    
+    def tearDown(self):
+        VOLUNTEER_NO_SEQUENCE.reset()
+    
+    def _create_volunteer(self, index, **kwargs):
+        user = User.objects.create_user(
+            username=f'gonullu{index}',
+            email=f'gonullu{index}@example.com',
+            password='testpass123'
+        )
+        data = {
+            'user': user,
+            'ad': 'Test',
+            'soyad': f'Gönüllü{index}',
+            'telefon': '5551234567',
+            'sehir': 'istanbul',
+            'gonullu_tipi': 'toplama',
+        }
+        data.update(kwargs)
+        return Volunteer.objects.create(**data)
+    
+    def test_sequential_numbers(self):
+        """Numaralar G000000000 formatında sıralı verilir"""
+        numbers = [self._create_volunteer(i).gonulluluk_no for i in range(3)]
+        self.assertEqual(numbers, ['G000000000', 'G000000001', 'G000000002'])
+    
+    def test_block_reservation(self):
+        """Aynı blok içindeki kayıtlar sayaç tablosuna dokunmaz"""
+        self._create_volunteer(0)
+        self._create_volunteer(1)
+        counter = NumberSequence.objects.get(name='gonulluluk_no')
+        self.assertEqual(counter.last_value, VOLUNTEER_NO_SEQUENCE.block_size - 1)
+    
+    def test_collision_retry(self):
+        """Elle verilmiş numarayla çakışmada seri hizalanır"""
+        self._create_volunteer(0)
+        self._create_volunteer(1, gonulluluk_no='G000000050')
+        self._create_volunteer(2, gonulluluk_no='G000000001')
+        
+        volunteer = self._create_volunteer(3)
+        self.assertEqual(volunteer.gonulluluk_no, 'G000000051')
+    
+    def test_bulk_allocate(self):
+        """Toplu içe aktarım için ardışık aralık rezerve edilir"""
+        numbers = VOLUNTEER_NO_SEQUENCE.allocate(3)
+        self.assertEqual(numbers, ['G000000000', 'G000000001', 'G000000002'])
+        
+        more = VOLUNTEER_NO_SEQUENCE.allocate(2)
+        self.assertEqual(more, ['G000000003', 'G000000004'])
+        
+        with self.assertRaises(ValueError):
+            VOLUNTEER_NO_SEQUENCE.allocate(0)
+
+
+class VolunteerRegisterTest(APITestCase):
+    """Gönüllü kayıt endpoint testleri"""
+    
+    def setUp(self):
+        VOLUNTEER_NO_SEQUENCE.reset()
+    
+    def tearDown(self):
+        VOLUNTEER_NO_SEQUENCE.reset()
+    
+    def test_register_assigns_number(self):
+        """Kayıt sırasında gönüllülük numarası atanır"""
+        data = {
+            'ad': 'Ayşe',
+            'soyad': 'Yılmaz',
+            'email': 'ayse@example.com',
+            'password': 'Guclu!Sifre1',
+            'password_confirm': 'Guclu!Sifre1',
+            'telefon': '5551234567',
+            'sehir': 'ankara',
+            'gonullu_tipi': 'dagitim',
+        }
+        response = self.client.post('/api/v1/volunteers/register/', data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['volunteer']['gonulluluk_no'], 'G000000000')
+
+
+class VolunteerListTest(APITestCase):
+    """Gönüllü listesi arama, sıralama ve sayfalama testleri"""
+    
+    url = '/api/v1/volunteers/'
+    
+    def setUp(self):
+        admin = User.objects.create_user('admin', 'admin@example.com', 'testpass123', is_staff=True)
+        self.client.force_authenticate(user=admin)
+        names = [('İsmail', 'Işık'), ('Şule', 'Çağlar'), ('Irmak', 'Öztürk'), ('Ali', 'Yılmaz'), ('Ayşe', 'Kaya')]
+        self.volunteers = []
+        for index, (ad, soyad) in enumerate(names):
+            user = User.objects.create_user(f'gonullu{index}', f'gonullu{index}@example.com', 'testpass123')
+            self.volunteers.append(Volunteer.objects.create(
+                user=user, ad=ad, soyad=soyad, telefon=f'555000000{index}',
+                sehir='ankara', gonullu_tipi='toplama'
+            ))
+    
+    def _names(self, response):
+        return [item['ad'] for item in response.data['results']]
+    
+    def test_search_text_kept_in_sync(self):
+        """Arama metni kayıt ve güncellemede normalize edilir"""
+        volunteer = self.volunteers[0]
+        self.assertEqual(volunteer.arama_metni, f'ismail isik {volunteer.gonulluluk_no.lower()} 5550000000')
+        
+        volunteer.soyad = 'Güneş'
+        volunteer.save(update_fields=['soyad'])
+        volunteer.refresh_from_db()
+        self.assertIn('gunes', volunteer.arama_metni)
+    
+    def test_turkish_case_folding_search(self):
+        """İ/ı ve aksanlı harfler katlanarak aranır"""
+        self.assertEqual(self._names(self.client.get(self.url, {'search': 'ISIK'})), ['İsmail'])
+        self.assertEqual(self._names(self.client.get(self.url, {'search': 'işık'})), ['İsmail'])
+        self.assertEqual(self._names(self.client.get(self.url, {'search': 'caglar'})), ['Şule'])
+        self.assertEqual(self._names(self.client.get(self.url, {'search': 'IRMAK'})), ['Irmak'])
+        response = self.client.get(self.url, {'search': self.volunteers[3].gonulluluk_no.lower()})
+        self.assertEqual(self._names(response), ['Ali'])
+    
+    def test_ordering_whitelist(self):
+        """İzin verilmeyen sıralama alanı varsayılana döner"""
+        response = self.client.get(self.url, {'ordering': 'ad'})
+        self.assertEqual(self._names(response), sorted(self._names(response)))
+        
+        response = self.client.get(self.url, {'ordering': 'user__password'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._names(response)[0], 'Ayşe')
+    
+    def test_page_size_capped(self):
+        """page_size üst sınırla kırpılır, geçersiz değer varsayılana döner"""
+        with self.settings(VOLUNTEER_LIST_MAX_PAGE_SIZE=2):
+            response = self.client.get(self.url, {'page_size': 1000})
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response.data['count'], 5)
+        self.assertFalse(response.data['count_estimated'])
+        
+        response = self.client.get(self.url, {'page_size': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_cursor_mode(self):
+        """Cursor modu tüm gönüllüleri sırayla, sayı olmadan döndürür"""
+        url = f'{self.url}?cursor=&page_size=2&ordering=ad'
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertNotIn('count', response.data)
+            seen.extend(self._names(response))
+            url = response.data['next']
+        self.assertEqual(seen, list(Volunteer.objects.order_by('ad', 'id').values_list('ad', flat=True)))
+        
+        response = self.client.get(self.url, {'cursor': 'bozuk'})
+        self.assertEqual(response.data['code'], 'INVALID_CURSOR')
+
+
+class VolunteerAvailabilityTest(APITestCase):
+    """Gönüllü uygunluk indeksi ve /volunteers/available/ testleri"""
+    
+    url = '/api/v1/volunteers/available/'
+    
+    def setUp(self):
+        cache.clear()
+        availability_index.clear()
+        admin = User.objects.create_user('admin', 'admin@example.com', 'testpass123', is_staff=True)
+        self.client.force_authenticate(user=admin)
+        self.toplama = self._volunteer('toplama', 'istanbul', 'toplama')
+        self.tasima = self._volunteer('tasima', 'istanbul', 'tasima')
+        self.karma = self._volunteer('karma', 'istanbul', 'karma')
+        self.tasima_ankara = self._volunteer('ankara', 'ankara', 'tasima')
+    
+    def _volunteer(self, username, sehir, gonullu_tipi, **kwargs):
+        user = User.objects.create_user(username, f'{username}@example.com', 'testpass123')
+        return Volunteer.objects.create(
+            user=user, ad=username.title(), soyad='Test', telefon='5551234567',
+            sehir=sehir, gonullu_tipi=gonullu_tipi, **kwargs
+        )
+    
+    def _kargo(self, **kwargs):
+        data = {
+            'anonim_gonderici': True, 'cikis_yeri': 'istanbul', 'ulasacagi_yer': 'ankara',
+            'agirlik': 5.0, 'hacim': 0.1, 'miktar': 1, 'kargo_tipi': 'gida', 'icerik': 'Su',
+            'toplama_gonullusu': self.toplama,
+        }
+        data.update(kwargs)
+        return Kargo.objects.create(**data)
+    
+    def _ids(self, sehir='istanbul', tip='tasima', **params):
+        response = self.client.get(self.url, {'sehir': sehir, 'tip': tip, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in response.data['results']]
+    
+    def test_served_from_index_ordered_by_workload(self):
+        """Aynı ildeki tip + karma gönüllüler iş yüküne göre sıralı, veritabanına gitmeden döner"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self._kargo(tasima_gonullusu=self.tasima)
+        self._ids()
+        
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'sehir': 'istanbul', 'tip': 'tasima'})
+        self.assertEqual([item['id'] for item in response.data['results']], [self.karma.pk, self.tasima.pk])
+        self.assertEqual(response.data['results'][1]['acik_kargo'], 1)
+        self.assertEqual(response.data['results'][1]['sehir_display'], 'İstanbul')
+        self.assertEqual(self._ids(karma='false'), [self.tasima.pk])
+        self.assertEqual(self._ids(sehir='ankara'), [self.tasima_ankara.pk])
+    
+    def _workloads(self):
+        response = self.client.get(self.url, {'sehir': 'istanbul', 'tip': 'tasima'})
+        return {item['id']: item['acik_kargo'] for item in response.data['results']}
+    
+    def test_kept_consistent_by_signals(self):
+        """Kargo durum/atama ve gönüllü değişiklikleri indekse yansır"""
+        self.assertEqual(self._ids(), [self.tasima.pk, self.karma.pk])
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            kargo = self._kargo(tasima_gonullusu=self.tasima)
+            self._kargo(tasima_gonullusu=self.tasima)
+        self.assertEqual(self._ids(), [self.karma.pk, self.tasima.pk])
+        self.assertEqual(self._workloads(), {self.karma.pk: 0, self.tasima.pk: 2})
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            kargo.tasima_gonullusu = self.karma
+            kargo.save()
+        self.assertEqual(self._workloads(), {self.karma.pk: 1, self.tasima.pk: 1})
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            transition_status(Kargo.objects.filter(pk=kargo.pk), 'teslim_edildi')
+        self.assertEqual(self._workloads(), {self.karma.pk: 0, self.tasima.pk: 1})
+        self.assertEqual(self._ids(), [self.karma.pk, self.tasima.pk])
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.karma.is_active = False
+            self.karma.save()
+        self.assertEqual(self._ids(), [self.tasima.pk])
+    
+    def test_version_change_rebuilds(self):
+        """Başka bir process'in artırdığı il sürümü sadece o ili yeniden kurdurur"""
+        self.assertEqual(self._ids(sehir='ankara'), [self.tasima_ankara.pk])
+        Volunteer.objects.filter(pk=self.tasima_ankara.pk).update(is_active=False)
+        self.assertEqual(self._ids(sehir='ankara'), [self.tasima_ankara.pk])
+        availability._bump_version('ankara')
+        self.assertEqual(self._ids(sehir='ankara'), [])
+    
+    def test_expired_index_rebuilds(self):
+        """Sürüm artmasa da (ör. paylaşılan cache yok) süresi dolan il indeksi yeniden kurulur"""
+        self.assertEqual(self._ids(sehir='ankara'), [self.tasima_ankara.pk])
+        Volunteer.objects.filter(pk=self.tasima_ankara.pk).update(is_active=False)
+        self.assertEqual(self._ids(sehir='ankara'), [self.tasima_ankara.pk])
+        with override_settings(VOLUNTEER_AVAILABILITY_MAX_AGE_SECONDS=0):
+            self.assertEqual(self._ids(sehir='ankara'), [])
+    
+    def test_writes_only_invalidate_affected_cities(self):
+        """Bir ildeki iş yükü değişikliği diğer illerin indeksini soğutmaz"""
+        self._ids(sehir='ankara')
+        self._ids()
+        with self.captureOnCommitCallbacks(execute=True):
+            self._kargo(tasima_gonullusu=self.tasima)
+        
+        with self.assertNumQueries(0):
+            self.assertEqual(availability.get_available('ankara', 'tasima')[0]['id'], self.tasima_ankara.pk)
+        with self.assertNumQueries(2):
+            self.assertEqual(self._workloads(), {self.karma.pk: 0, self.tasima.pk: 1})
+    
+    def test_city_change_refreshes_both_cities(self):
+        """Gönüllünün ili değişince eski ve yeni ilin indeksi tazelenir"""
+        self.assertEqual(self._ids(sehir='ankara'), [self.tasima_ankara.pk])
+        self.assertEqual(self._ids(), [self.tasima.pk, self.karma.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tasima.sehir = 'ankara'
+            self.tasima.save()
+        self.assertEqual(self._ids(), [self.karma.pk])
+        self.assertEqual(sorted(self._ids(sehir='ankara')), sorted([self.tasima_ankara.pk, self.tasima.pk]))
+    
+    def test_old_city_from_loaded_snapshot(self):
+        """Güncellemede eski il yüklenme anındaki görüntüden alınır, ek sorgu atılmaz"""
+        volunteer = Volunteer.objects.get(pk=self.tasima.pk)
+        volunteer.sehir = 'ankara'
+        with self.assertNumQueries(1):
+            volunteer.save()
+        self.assertEqual(volunteer._old_sehir, 'istanbul')
+        self.assertEqual(volunteer.get_loaded_sehir(), 'ankara')
+        
+        deferred = Volunteer.objects.only('id', 'gonulluluk_no').get(pk=self.tasima.pk)
+        self.assertEqual(deferred.get_loaded_sehir(), 'ankara')
+    
+    def test_invalid_params(self):
+        for params, code in (({'tip': 'tasima'}, 'INVALID_CITY'), ({'sehir': 'van', 'tip': 'x'}, 'INVALID_VOLUNTEER_TYPE')):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data['code'], code)
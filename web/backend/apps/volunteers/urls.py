@@ -11,6 +11,7 @@ urlpatterns = [
     path('', views.volunteer_list, name='volunteer-list'),
     path('register/', views.volunteer_register, name='volunteer-register'),  # Public registration
     path('stats/', views.volunteer_stats, name='volunteer-stats'),
+    path('available/', views.volunteer_available, name='volunteer-available'),
     path('<int:pk>/', views.volunteer_detail, name='volunteer-detail'),
     
     # Authentication endpoints
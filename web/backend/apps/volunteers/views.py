@@ -42,10 +42,13 @@ class IsStaffOrSuperuser(BasePermission):
 
 
 from rest_framework.pagination import PageNumberPagination
-from django.core.paginator import Paginator
 from django.db.models import Q, Count
 from rest_framework import serializers
 import re
+from apps.core.pagination import EstimatedCountPaginator, InvalidCursor, paginate_keyset
+from apps.core.search import normalize_search_text
+from apps.core.choices import SEHIR, GONULLU_TIPI
+from .availability import get_available
 from .models import Volunteer
 from .serializers import (
     VolunteerSerializer, 
@@ -57,6 +60,13 @@ from .serializers import (
 
 # Create your views here.
 
+VOLUNTEER_LIST_DEFAULT_PAGE_SIZE = 25
+
+# volunteer_list ?ordering= ile sıralanabilecek alanlar
+VOLUNTEER_ORDERING_FIELDS = {
+    'created_at', 'updated_at', 'ad', 'soyad', 'gonulluluk_no', 'sehir', 'gonullu_tipi', 'is_active'
+}
+
 @api_view(['GET', 'POST'])
 @permission_classes([IsStaffOrSuperuser])  # Only admin users can access volunteer list
 def volunteer_list(request):
@@ -69,8 +79,8 @@ def volunteer_list(request):
     
     # GET method - existing list logic
     # Get query parameters
-    page = int(request.GET.get('page', 1))
-    page_size = int(request.GET.get('page_size', 25))
+    page = request.GET.get('page', 1)
+    page_size = _parse_page_size(request.GET.get('page_size'))
     search = request.GET.get('search', '')
     gonullu_tipi = request.GET.get('gonullu_tipi', '')
     sehir = request.GET.get('sehir', '')
@@ -85,14 +95,10 @@ def volunteer_list(request):
         is_active = is_active_param.lower() == 'true'
         queryset = queryset.filter(is_active=is_active)
     
-    # Apply search filter
+    # Apply search filter (normalize arama kolonu, PostgreSQL'de trigram index'li)
+    search = normalize_search_text(search)
     if search:
-        queryset = queryset.filter(
-            Q(ad__icontains=search) |
-            Q(soyad__icontains=search) |
-            Q(gonulluluk_no__icontains=search) |
-            Q(telefon__icontains=search)
-        )
+        queryset = queryset.filter(arama_metni__contains=search)
     
     # Apply filters
     if gonullu_tipi:
@@ -101,19 +107,24 @@ def volunteer_list(request):
     if sehir:
         queryset = queryset.filter(sehir=sehir)
     
-    # Apply ordering
-    if ordering:
-        # Handle negative ordering (descending)
-        if ordering.startswith('-'):
-            field = ordering[1:]
-            if hasattr(Volunteer, field):
-                queryset = queryset.order_by(ordering)
-        else:
-            if hasattr(Volunteer, ordering):
-                queryset = queryset.order_by(ordering)
+    # Apply ordering (sadece izin verilen alanlar; eşitlikte id ile kararlı sıra)
+    field = ordering.lstrip('-')
+    if field not in VOLUNTEER_ORDERING_FIELDS:
+        ordering = '-created_at'
+    order_by = (ordering, '-id' if ordering.startswith('-') else 'id')
+    
+    # Cursor modu: COUNT ve OFFSET yok
+    if 'cursor' in request.GET:
+        return _volunteer_cursor_page(request, queryset, order_by, page_size)
+    
+    queryset = queryset.order_by(*order_by)
     
-    # Pagination
-    paginator = Paginator(queryset, page_size)
+    # Pagination (büyük tablolarda tahmini sayı)
+    paginator = EstimatedCountPaginator(
+        queryset,
+        page_size,
+        exact_count_limit=getattr(settings, 'VOLUNTEER_LIST_EXACT_COUNT_LIMIT', 10000)
+    )
     page_obj = paginator.get_page(page)
     
     # Serialize data
@@ -136,12 +147,53 @@ def volunteer_list(request):
     
     return Response({
         'count': paginator.count,
+        'count_estimated': paginator.count_estimated,
         'next': next_url,
         'previous': previous_url,
         'results': serializer.data
     })
 
 
+def _parse_page_size(value):
+    """page_size parametresini 1..VOLUNTEER_LIST_MAX_PAGE_SIZE aralığına sıkıştır"""
+    max_page_size = getattr(settings, 'VOLUNTEER_LIST_MAX_PAGE_SIZE', 100)
+    try:
+        page_size = int(value) if value else VOLUNTEER_LIST_DEFAULT_PAGE_SIZE
+    except (TypeError, ValueError):
+        page_size = VOLUNTEER_LIST_DEFAULT_PAGE_SIZE
+    return max(1, min(page_size, max_page_size))
+
+
+def _volunteer_cursor_page(request, queryset, order_by, page_size):
+    """volunteer_list'in keyset sayfalı yanıtı (toplam sayı dönmez)"""
+    try:
+        volunteers, next_cursor, previous_cursor = paginate_keyset(
+            queryset, order_by, cursor=request.GET.get('cursor'), page_size=page_size
+        )
+    except InvalidCursor:
+        return Response({
+            'success': False,
+            'error': 'Geçersiz cursor',
+            'code': 'INVALID_CURSOR'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    request_url = request.build_absolute_uri().split('?')[0]
+    
+    def cursor_url(cursor):
+        if cursor is None:
+            return None
+        params = request.GET.copy()
+        params['cursor'] = cursor
+        return f"{request_url}?{params.urlencode()}"
+    
+    serializer = VolunteerSerializer(volunteers, many=True)
+    return Response({
+        'next': cursor_url(next_cursor),
+        'previous': cursor_url(previous_cursor),
+        'results': serializer.data
+    })
+
+
 @csrf_exempt
 @api_view(['POST'])
 @permission_classes([AllowAny])  # Allow anyone to register as volunteer
@@ -347,6 +399,44 @@ def volunteer_stats(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+@permission_classes([IsStaffOrSuperuser])
+def volunteer_available(request):
+    """
+    İldeki aktif gönüllüler, açık kargo sayısına göre artan sırada.
+    Process içi uygunluk indeksinden döner (veritabanı sorgusu yok).
+    ?sehir=<il>&tip=<gönüllü tipi>[&karma=false][&limit=N]
+    """
+    sehir = request.GET.get('sehir', '')
+    tip = request.GET.get('tip', '')
+    
+    if sehir not in SEHIR:
+        return Response({
+            'success': False,
+            'error': 'Geçerli bir şehir seçilmelidir',
+            'code': 'INVALID_CITY'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    if tip not in GONULLU_TIPI:
+        return Response({
+            'success': False,
+            'error': 'Geçerli bir gönüllü tipi seçilmelidir',
+            'code': 'INVALID_VOLUNTEER_TYPE'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    include_karma = request.GET.get('karma', 'true').lower() != 'false'
+    volunteers = get_available(sehir, tip, include_karma=include_karma, limit=_parse_page_size(request.GET.get('limit')))
+    for volunteer in volunteers:
+        volunteer['sehir_display'] = SEHIR.label(volunteer['sehir'])
+        volunteer['gonullu_tipi_display'] = GONULLU_TIPI.label(volunteer['gonullu_tipi'])
+    
+    return Response({
+        'success': True,
+        'count': len(volunteers),
+        'results': volunteers
+    })
+
+
 # Authentication Views
 
 @api_view(['POST'])
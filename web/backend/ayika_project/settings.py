@@ -63,6 +63,9 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'ayika_project.urls'
 
+# Applies the isolated cache/pub-sub settings of ayika_project.test_settings to `manage.py test`
+TEST_RUNNER = 'ayika_project.test_runner.TestRunner'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -94,6 +97,35 @@ DATABASES = {
 }
 
 
+# Cache
+# Redis in docker-compose / production, local memory for tests and setups without Redis
+
+REDIS_URL = config('REDIS_URL', default='')
+
+# Tests never use Redis: ayika_project.test_settings (pytest) and
+# ayika_project.test_runner.TestRunner (manage.py test) force locmem + in-process pub/sub
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'ayika',
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                # A Redis outage must not take tracking down; fall back to the database
+                'IGNORE_EXCEPTIONS': True,
+            },
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'ayika-default',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -195,3 +227,58 @@ DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@ayika.org')
 
 # Frontend URL for password reset links
 FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:5173')
+
+# Number sequences (AYK000000000, G000000000)
+# Each worker process reserves this many numbers at once and hands them out from memory
+NUMBER_SEQUENCE_BLOCK_SIZE = config('NUMBER_SEQUENCE_BLOCK_SIZE', default=20, cast=int)
+
+# Cargo statistics
+# Longest window (in days) accepted by the time-based cargo statistics endpoint
+CARGO_STATS_MAX_DAYS = config('CARGO_STATS_MAX_DAYS', default=366, cast=int)
+
+# Public cargo tracking cache (seconds)
+CARGO_TRACKING_CACHE_TIMEOUT = config('CARGO_TRACKING_CACHE_TIMEOUT', default=300, cast=int)
+# Unknown cargo numbers are cached briefly so repeated misses do not hit the database
+CARGO_TRACKING_NEGATIVE_CACHE_TIMEOUT = config('CARGO_TRACKING_NEGATIVE_CACHE_TIMEOUT', default=30, cast=int)
+# Maximum number of cargo numbers accepted by one batch tracking request
+CARGO_TRACKING_BATCH_LIMIT = config('CARGO_TRACKING_BATCH_LIMIT', default=50, cast=int)
+
+# Bulk cargo creation
+# Maximum number of items accepted by one POST /api/v1/kargo/bulk/ request
+CARGO_BULK_CREATE_LIMIT = config('CARGO_BULK_CREATE_LIMIT', default=500, cast=int)
+# Maximum number of cargo accepted by one PATCH /api/v1/kargo/bulk-status/ request
+CARGO_BULK_STATUS_LIMIT = config('CARGO_BULK_STATUS_LIMIT', default=1000, cast=int)
+
+# Pub/sub (apps.core.pubsub)
+# 'redis' fans events out across worker processes; 'memory' only reaches subscribers in the same process
+PUBSUB_BACKEND = config('PUBSUB_BACKEND', default='redis' if REDIS_URL else 'memory')
+PUBSUB_REDIS_URL = config('PUBSUB_REDIS_URL', default=REDIS_URL)
+
+# Cargo status stream (GET /api/v1/kargo/stream/, ASGI only)
+# Seconds between keep-alive comments on an idle stream
+CARGO_EVENTS_HEARTBEAT_SECONDS = config('CARGO_EVENTS_HEARTBEAT_SECONDS', default=15, cast=int)
+# Streams are closed after this many seconds; EventSource clients reconnect automatically
+CARGO_EVENTS_STREAM_MAX_SECONDS = config('CARGO_EVENTS_STREAM_MAX_SECONDS', default=600, cast=int)
+
+# Volunteer matching (apps.cargo.matching)
+# Volunteers farther than this road distance from the cargo's province are not considered
+CARGO_MATCHING_MAX_DISTANCE_KM = config('CARGO_MATCHING_MAX_DISTANCE_KM', default=400, cast=int)
+# Cost of one open cargo in a volunteer's workload, expressed in kilometres
+CARGO_MATCHING_WORKLOAD_KM = config('CARGO_MATCHING_WORKLOAD_KM', default=50, cast=int)
+# Number of cargo matched together in one assignment problem
+CARGO_MATCHING_BATCH_SIZE = config('CARGO_MATCHING_BATCH_SIZE', default=50, cast=int)
+# Maximum number of new cargo given to one volunteer in a single matching run
+CARGO_MATCHING_MAX_PER_VOLUNTEER = config('CARGO_MATCHING_MAX_PER_VOLUNTEER', default=10, cast=int)
+
+# Volunteer availability index (apps.volunteers.availability)
+# Per-process province indexes are rebuilt after this many seconds even without a version bump.
+# Without Redis the version keys live in each worker's local memory, so other workers' writes
+# are only picked up through this age limit
+VOLUNTEER_AVAILABILITY_MAX_AGE_SECONDS = config(
+    'VOLUNTEER_AVAILABILITY_MAX_AGE_SECONDS', default=300 if REDIS_URL else 30, cast=int
+)
+
+# Volunteer list
+VOLUNTEER_LIST_MAX_PAGE_SIZE = config('VOLUNTEER_LIST_MAX_PAGE_SIZE', default=100, cast=int)
+# Above this planner row estimate (PostgreSQL) the list returns an estimated count instead of COUNT(*)
+VOLUNTEER_LIST_EXACT_COUNT_LIMIT = config('VOLUNTEER_LIST_EXACT_COUNT_LIMIT', default=10000, cast=int)
@@ -0,0 +1,17 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """`manage.py test` için test_settings'teki izole cache/pub-sub ayarlarını uygular"""
+
+    def setup_test_environment(self, **kwargs):
+        from .test_settings import ISOLATED_SETTINGS
+
+        super().setup_test_environment(**kwargs)
+        self._isolated_settings = override_settings(**ISOLATED_SETTINGS)
+        self._isolated_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._isolated_settings.disable()
+        super().teardown_test_environment(**kwargs)
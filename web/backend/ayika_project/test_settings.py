@@ -0,0 +1,26 @@
+"""
+Test settings (pytest: DJANGO_SETTINGS_MODULE=ayika_project.test_settings, see pytest.ini).
+
+Tests must not share Redis with a running instance even when REDIS_URL is set
+(e.g. inside the compose container): cache keys would be flushed/poisoned and
+pub/sub events would leak between runs. `manage.py test` applies the same
+overrides through ayika_project.test_runner.TestRunner.
+"""
+from .settings import *  # noqa: F401,F403
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ayika-test',
+    }
+}
+
+PUBSUB_BACKEND = 'memory'
+PUBSUB_REDIS_URL = ''
+
+# Settings overridden for `manage.py test` (which loads ayika_project.settings)
+ISOLATED_SETTINGS = {
+    'CACHES': CACHES,
+    'PUBSUB_BACKEND': PUBSUB_BACKEND,
+    'PUBSUB_REDIS_URL': PUBSUB_REDIS_URL,
+}